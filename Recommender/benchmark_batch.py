@@ -0,0 +1,82 @@
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# --- ROBUST IMPORT SETUP ---
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR))
+
+from Recommender.inference import get_all_faculty_records
+from Recommender.retrieval import get_index
+
+
+def synthetic_statements(n, seed=0):
+    """Student-style research-interest statements stitched from real profile sentences."""
+    sentences = [
+        s.strip()
+        for p in get_all_faculty_records()
+        for s in re.split(r"(?<=\.)\s+", p["research"])
+        if 30 < len(s) < 300
+    ]
+    rng = random.Random(seed)
+    return [f"I am interested in {rng.choice(sentences)}" for _ in range(n)]
+
+
+def per_query(index, statements, k):
+    return [index.search(q, k) for q in statements]
+
+
+def batched(index, statements, k):
+    return index.search_batch(statements, k)
+
+
+def measure(fn, index, statements, k, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(index, statements, k)
+        best = min(best, time.perf_counter() - start)
+    return {"seconds": round(best, 4), "records_per_sec": round(len(statements) / best, 1)}
+
+
+def measure_http(url, statements, k):
+    import httpx
+
+    start = time.perf_counter()
+    response = httpx.post(f"{url}/recommend/batch", json={"queries": statements, "k": k}, timeout=120)
+    response.raise_for_status()
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": round(seconds, 4),
+        "records_per_sec": round(len(statements) / seconds, 1),
+        "server_stats": response.json()["stats"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of batch advisor matching.")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--url", help="also POST the batch to a running server, e.g. http://127.0.0.1:8000")
+    args = parser.parse_args()
+
+    statements = synthetic_statements(args.queries)
+    index = get_index()
+    print(f"{len(statements)} statements against {len(index.records)} faculty (k={args.k})")
+
+    loop = measure(per_query, index, statements, args.k, args.repeat)
+    batch = measure(batched, index, statements, args.k, args.repeat)
+    print(f"One search per statement: {loop}")
+    print(f"Single vectorized pass:   {batch}")
+    print(f"Speed-up: {loop['seconds'] / max(batch['seconds'], 1e-9):.1f}x")
+
+    if args.url:
+        print(f"POST /recommend/batch:    {measure_http(args.url, statements, args.k)}")
+
+
+if __name__ == "__main__":
+    main()
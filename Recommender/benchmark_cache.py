@@ -0,0 +1,79 @@
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# --- ROBUST IMPORT SETUP ---
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR))
+
+from Recommender.cache import ResponseCache, SemanticCache, normalize_query
+from Recommender.vector_index import embed_queries, hashing_embed
+
+# Each topic is asked several ways; a good cache answers the variants for free
+TOPICS = [
+    ["graph neural networks", "Graph Neural Network research", "who works on graph neural nets"],
+    ["machine learning", "Machine-Learning faculty", "professors in machine learning"],
+    ["VLSI", "vlsi design", "who teaches VLSI design?"],
+    ["wireless communication", "Wireless Communications", "wireless communication systems"],
+    ["computer vision", "Computer Vision research", "image processing and computer vision"],
+    ["cryptography", "Cryptography and security", "who does cryptography"],
+]
+
+
+def stub_llm(query, latency):
+    """Pretends to be Gemini: fixed latency, deterministic answer."""
+    time.sleep(latency)
+    return f"Answer for {query}"
+
+
+def run(stream, llm_latency, exact, semantic):
+    version = "bench"
+    start = time.perf_counter()
+    llm_calls = 0
+    for query in stream:
+        key = (normalize_query(query), version)
+        if exact and exact.get(key) is not None:
+            continue
+        if semantic:
+            vector = semantic.embed(query)
+            if semantic.get(vector, version) is not None:
+                continue
+        answer = stub_llm(query, llm_latency)
+        llm_calls += 1
+        if exact:
+            exact.put(key, answer)
+        if semantic:
+            semantic.put(vector, version, answer)
+    elapsed = time.perf_counter() - start
+    return {"llm_calls": llm_calls, "seconds": round(elapsed, 3),
+            "ms_per_query": round(elapsed / len(stream) * 1000, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the /recommend caches.")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--llm-latency", type=float, default=0.02, help="stub LLM seconds per call")
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--model", action="store_true", help="use the real MiniLM embedder")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    stream = [rng.choice(rng.choice(TOPICS)) for _ in range(args.queries)]
+    embed_fn = embed_queries if args.model else hashing_embed
+
+    print(f"{args.queries} queries over {len(TOPICS)} topics, stub LLM {args.llm_latency * 1000:.0f} ms")
+    for label, exact, semantic in [
+        ("no cache", None, None),
+        ("exact", ResponseCache(), None),
+        ("exact+semantic", ResponseCache(), SemanticCache(embed_fn, threshold=args.threshold)),
+    ]:
+        result = run(stream, args.llm_latency, exact, semantic)
+        if semantic:
+            result["semantic"] = semantic.stats()
+        print(f"{label:<16} {result}")
+
+
+if __name__ == "__main__":
+    main()
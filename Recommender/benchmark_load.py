@@ -0,0 +1,62 @@
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+
+import httpx
+
+# A small topic pool so some requests overlap (exercises coalescing + caching)
+TOPICS = [
+    "machine learning", "VLSI", "graph neural networks", "wireless communication",
+    "computer vision", "cryptography", "natural language processing", "robotics",
+    "signal processing", "distributed systems", "quantum computing", "optimization",
+]
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))] if values else 0.0
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load-test /recommend (pair with Recommender/stub_llm.py).")
+    parser.add_argument("--url", default="http://127.0.0.1:8000/recommend")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--unique", action="store_true", help="make every query distinct (no cache/coalescing)")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    queries = [
+        f"{rng.choice(TOPICS)} {i}" if args.unique else rng.choice(TOPICS)
+        for i in range(args.requests)
+    ]
+    statuses = Counter()
+    latencies = []
+    slots = asyncio.Semaphore(args.concurrency)
+
+    async def one(client, query):
+        async with slots:
+            start = time.perf_counter()
+            try:
+                response = await client.get(args.url, params={"q": query})
+                statuses[response.status_code] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    async with httpx.AsyncClient(timeout=120) as client:
+        await asyncio.gather(*(one(client, q) for q in queries))
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}: {elapsed:.2f} s "
+          f"({args.requests / elapsed:.1f} req/s)")
+    print(f"status codes: {dict(statuses)}")
+    print(f"latency p50 {percentile(latencies, 50) * 1000:.0f} ms, "
+          f"p95 {percentile(latencies, 95) * 1000:.0f} ms, p99 {percentile(latencies, 99) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,363 @@
+import argparse
+import gc
+import json
+import platform
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+# --- ROBUST IMPORT SETUP ---
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR))
+sys.path.append(str(BASE_DIR / "Scraper"))
+
+from Recommender.inference import split_profile_fields
+from Recommender.retrieval import BM25Index, FieldBM25Index, HybridRetriever
+from Recommender.vector_index import FacultyIndex, hashing_embed
+
+SAMPLE_DATA = BASE_DIR / "faculty_data.json"
+RESULTS_DIR = BASE_DIR / "Recommender" / "benchmark_results"
+
+# Labelled topics: every synthetic profile gets one as its main area, so the
+# profiles relevant to a topic's queries are known exactly.
+TOPICS = {
+    "gnn": {
+        "specialization": "Graph Neural Networks, Graph Representation Learning",
+        "sentences": ["My group designs graph neural networks for heterogeneous and dynamic graphs.",
+                      "We study message passing and node embeddings on large networks."],
+        "queries": ["graph neural networks", "representation learning on graphs"],
+    },
+    "vlsi": {
+        "specialization": "VLSI Design, Low Power Circuits",
+        "sentences": ["I work on low power VLSI circuit design and physical design automation.",
+                      "Current projects include analog mixed-signal chips and FPGA prototyping."],
+        "queries": ["VLSI design", "low power chip design"],
+    },
+    "wireless": {
+        "specialization": "Wireless Communication, 5G Networks",
+        "sentences": ["My research covers wireless communication, MIMO and 5G physical layer design.",
+                      "We analyse channel estimation and resource allocation in cellular networks."],
+        "queries": ["wireless communication", "5G MIMO physical layer"],
+    },
+    "crypto": {
+        "specialization": "Cryptography, Information Security",
+        "sentences": ["I work on applied cryptography and secure protocol design.",
+                      "Recent work studies post-quantum signatures and authentication."],
+        "queries": ["cryptography", "secure authentication protocols"],
+    },
+    "vision": {
+        "specialization": "Computer Vision, Image Processing",
+        "sentences": ["We build computer vision models for object detection and image segmentation.",
+                      "My lab studies medical image processing and video analysis."],
+        "queries": ["computer vision", "image segmentation and object detection"],
+    },
+    "nlp": {
+        "specialization": "Natural Language Processing, Computational Linguistics",
+        "sentences": ["My research is in natural language processing for low resource Indian languages.",
+                      "We work on machine translation, speech and language models."],
+        "queries": ["natural language processing", "machine translation for Indian languages"],
+    },
+    "quantum": {
+        "specialization": "Quantum Computing, Quantum Information",
+        "sentences": ["I study quantum algorithms and quantum error correction.",
+                      "Our group simulates quantum circuits and quantum information protocols."],
+        "queries": ["quantum computing", "quantum error correction"],
+    },
+    "optimization": {
+        "specialization": "Optimization, Operations Research",
+        "sentences": ["My work is on convex optimization and stochastic approximation algorithms.",
+                      "We apply operations research to scheduling and supply chain problems."],
+        "queries": ["convex optimization", "operations research scheduling"],
+    },
+    "finance": {
+        "specialization": "Mathematical Finance, Stochastic Processes",
+        "sentences": ["I work on stochastic portfolio theory and arbitrage in financial markets.",
+                      "Research includes option pricing and stochastic differential equations."],
+        "queries": ["mathematical finance", "stochastic portfolio theory"],
+    },
+    "robotics": {
+        "specialization": "Robotics, Control Systems",
+        "sentences": ["My lab works on robot motion planning and nonlinear control systems.",
+                      "We study multi-robot coordination and autonomous navigation."],
+        "queries": ["robotics and control", "autonomous robot navigation"],
+    },
+}
+
+BACKENDS = ["bm25", "field_bm25", "dense", "hybrid", "fts5"]
+RECALL_KS = (1, 5, 10)
+# The stub embedder sees what a sentence model would after truncation
+DENSE_TEXT_CHARS = 512
+
+
+def background_sentences():
+    """Real profile sentences, used as topic-neutral filler text."""
+    with open(SAMPLE_DATA, "r") as f:
+        records = json.load(f)
+    return [
+        s.strip()
+        for p in records
+        for s in re.split(r"(?<=\.)\s+", split_profile_fields(p["research"])["Bio"])
+        if 30 < len(s) < 250
+    ]
+
+
+def synthetic_corpus(n, seed=0):
+    """
+    `n` records shaped like faculty_data.json, plus the topic label of each.
+    The research blob follows the same "Name: .. Designation: .." layout.
+    """
+    rng = random.Random(seed)
+    filler = background_sentences()
+    labels = list(TOPICS)
+    records, truth = [], []
+    for i in range(n):
+        label = labels[i % len(labels)] if i < len(labels) else rng.choice(labels)
+        topic = TOPICS[label]
+        name = f"Faculty {i}"
+        research = " ".join(rng.sample(topic["sentences"], 2) + rng.sample(filler, 2))
+        bio = " ".join(rng.sample(filler, 3))
+        blob = (f"Name: {name}. Designation: PhD. Specialization: {topic['specialization']}. "
+                f"Research Interests: {research}. Bio: {bio}. Teaching: Course {i % 40}.")
+        records.append({
+            "name": name,
+            "email": f"faculty{i}@example.edu",
+            "profile_url": f"https://example.edu/faculty/{i}",
+            "research": blob,
+        })
+        truth.append(label)
+    return records, truth
+
+
+def labelled_queries(truth):
+    """[(query, set of relevant doc ids)] for every topic query."""
+    members = {}
+    for doc_id, label in enumerate(truth):
+        members.setdefault(label, set()).add(doc_id)
+    return [(q, members.get(label, set())) for label, topic in TOPICS.items() for q in topic["queries"]]
+
+
+# --- BACKENDS ---
+# Each returns an object with search(query, k) -> [doc_id] and search_batch(queries, k) -> [[doc_id]]
+
+class BM25Backend:
+    def __init__(self, records):
+        self.index = BM25Index(records)
+
+    def search(self, query, k):
+        return [d for d, _ in self.index.search(query, k)]
+
+    def search_batch(self, queries, k):
+        return [[d for d, _ in hits] for hits in self.index.search_batch(queries, k)]
+
+
+class FieldBM25Backend(BM25Backend):
+    def __init__(self, records):
+        self.index = FieldBM25Index(records)
+
+
+def dense_index(records):
+    texts = [f"{r['name']} {r['research']}"[:DENSE_TEXT_CHARS] for r in records]
+    metadata = [{"id": i, "profile_url": r["profile_url"]} for i, r in enumerate(records)]
+    return FacultyIndex.build(hashing_embed(texts), metadata, model_name="hashing-stub")
+
+
+class DenseBackend:
+    def __init__(self, records):
+        self.index = dense_index(records)
+
+    def search(self, query, k):
+        return [m["id"] for m, _ in self.index.search(hashing_embed([query])[0], k)]
+
+    def search_batch(self, queries, k):
+        return [[m["id"] for m, _ in hits] for hits in self.index.search_batch(hashing_embed(queries), k)]
+
+
+class FTS5Backend:
+    """The SQLite FTS5 search from Scraper/faculty_db.py, on a throwaway DB."""
+
+    def __init__(self, records):
+        import faculty_db as storage
+
+        self.storage = storage
+        storage.DB_PATH = Path(tempfile.mkdtemp(prefix="faculty_bench_")) / "bench.db"
+        storage.init_db()
+        rows = []
+        for r in records:
+            fields = split_profile_fields(r["research"])
+            rows.append({
+                "name": r["name"], "designation": fields["Designation"], "email": r["email"],
+                "bio": fields["Bio"], "research": fields["Research Interests"], "publications": "",
+                "teaching": fields["Teaching"], "specialization": fields["Specialization"],
+                "url": r["profile_url"],
+            })
+        storage.save_profiles_bulk(rows)
+        self.doc_ids = {r["profile_url"]: i for i, r in enumerate(records)}
+
+    def search(self, query, k):
+        return [self.doc_ids[row["profile_url"]] for row in self.storage.search_faculty(query, limit=k)]
+
+    def search_batch(self, queries, k):
+        return [self.search(q, k) for q in queries]
+
+
+class HybridBackend:
+    """Field-weighted BM25 + hashing-stub vectors, fused by reciprocal rank."""
+
+    def __init__(self, records):
+        self.index = HybridRetriever(FieldBM25Index(records), dense_index(records), hashing_embed)
+
+    def search(self, query, k):
+        return [d for d, _ in self.index.search(query, k)]
+
+    def search_batch(self, queries, k):
+        return [self.search(q, k) for q in queries]
+
+
+BACKEND_CLASSES = {
+    "bm25": BM25Backend,
+    "field_bm25": FieldBM25Backend,
+    "dense": DenseBackend,
+    "hybrid": HybridBackend,
+    "fts5": FTS5Backend,
+}
+
+
+# --- MEASUREMENTS ---
+
+def percentiles_ms(samples):
+    values = np.asarray(samples) * 1000
+    return {f"p{p}": round(float(np.percentile(values, p)), 3) for p in (50, 95, 99)}
+
+
+def measure_memory(backend_cls, records):
+    """Retained and peak Python/numpy allocations of one index build (MB)."""
+    gc.collect()
+    tracemalloc.start()
+    backend = backend_cls(records)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del backend
+    return round(current / 2**20, 2), round(peak / 2**20, 2)
+
+
+def recall_at_k(backend, queries, ks=RECALL_KS):
+    """Mean |relevant ∩ top-k| / min(|relevant|, k) over the labelled queries."""
+    top = backend.search_batch([q for q, _ in queries], max(ks))
+    scores = {}
+    for k in ks:
+        per_query = [
+            len(relevant & set(hits[:k])) / min(len(relevant), k)
+            for (_, relevant), hits in zip(queries, top) if relevant
+        ]
+        scores[str(k)] = round(float(np.mean(per_query)), 4) if per_query else 0.0
+    return scores
+
+
+def bench_backend(name, records, queries, args):
+    backend_cls = BACKEND_CLASSES[name]
+    gc.collect()
+    start = time.perf_counter()
+    backend = backend_cls(records)
+    build_s = time.perf_counter() - start
+
+    texts = [q for q, _ in queries]
+    for q in texts:  # warm-up (lazy per-term caches, SQLite page cache)
+        backend.search(q, args.k)
+    latencies = []
+    for _ in range(args.repeat):
+        for q in texts:
+            start = time.perf_counter()
+            backend.search(q, args.k)
+            latencies.append(time.perf_counter() - start)
+
+    batch = [texts[i % len(texts)] for i in range(args.batch_size)]
+    start = time.perf_counter()
+    backend.search_batch(batch, args.k)
+    batch_s = time.perf_counter() - start
+
+    result = {
+        "backend": name,
+        "build_s": round(build_s, 3),
+        "latency_ms": percentiles_ms(latencies),
+        "batch_queries": len(batch),
+        "batch_qps": round(len(batch) / batch_s, 1),
+        "recall_at_k": recall_at_k(backend, queries),
+    }
+    del backend
+    if args.memory:
+        result["memory_mb"], result["peak_memory_mb"] = measure_memory(backend_cls, records)
+    return result
+
+
+def compare(previous_path, results):
+    """Prints per-metric changes against an earlier results file."""
+    with open(previous_path, "r") as f:
+        previous = {(r["size"], r["backend"]): r for r in json.load(f)["results"]}
+    print(f"\nChange vs {previous_path}:")
+    for r in results:
+        old = previous.get((r["size"], r["backend"]))
+        if old is None:
+            continue
+        deltas = [
+            f"build {r['build_s'] - old['build_s']:+.3f}s",
+            f"p95 {r['latency_ms']['p95'] - old['latency_ms']['p95']:+.3f}ms",
+            f"qps {r['batch_qps'] - old['batch_qps']:+.1f}",
+            f"recall@10 {r['recall_at_k']['10'] - old['recall_at_k']['10']:+.4f}",
+        ]
+        print(f"  {r['size']:>7} {r['backend']:<6} " + ", ".join(deltas))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline retrieval benchmark and recall@k harness.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 100_000])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5, help="passes over the query set for latency")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="skip the traced rebuild that measures memory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="results JSON (default: benchmark_results/retrieval-<time>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier results JSON to diff against")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        records, truth = synthetic_corpus(size, args.seed)
+        queries = labelled_queries(truth)
+        for name in args.backends:
+            print(f"[{size} profiles] {name}...", flush=True)
+            result = dict(size=size, **bench_backend(name, records, queries, args))
+            print(f"  {result}")
+            results.append(result)
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "seed": args.seed,
+            "k": args.k,
+            "embedder": "hashing_embed (stub)",
+        },
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / f"retrieval-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
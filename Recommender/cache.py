@@ -0,0 +1,192 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from Recommender.retrieval import tokenize
+
+# --- CACHE CONFIGURATION ---
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))          # seconds
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+
+# Semantic (paraphrase) cache: off by default, it needs the embedding model
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE", "0") == "1"
+SEMANTIC_CACHE_SIZE = int(os.getenv("SEMANTIC_CACHE_SIZE", "256"))
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.9"))  # cosine
+
+
+def normalize_query(query):
+    """
+    Canonical form of a query for cache lookups.
+    "Machine Learning?" and "the  machine learning" both become "machine learning".
+    """
+    normalized = " ".join(tokenize(query))
+    # Stopword-only queries ("who?") keep their literal text so they don't collide
+    return normalized or " ".join(query.lower().split())
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache with a per-entry TTL and a total size cap (in bytes).
+    Thread-safe; sync FastAPI endpoints run in a threadpool.
+    """
+
+    def __init__(self, max_entries=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL,
+                 max_bytes=RESPONSE_CACHE_MAX_BYTES, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (expires_at, value, size)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _size(key, value):
+        return len(repr(key)) + len(value.encode("utf-8"))
+
+    def _drop(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= self._clock():
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        size = self._size(key, value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (self._clock() + self.ttl, value, size)
+            self._bytes += size
+            # Evict least-recently-used entries until both limits hold
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class SemanticCache:
+    """
+    Near-duplicate query cache. Cached queries live as rows of one
+    preallocated float32 matrix, so a lookup is a single matrix-vector
+    product; above `threshold` cosine similarity the cached answer is reused.
+
+    Entries are evicted least-recently-used (and on TTL expiry). The whole
+    cache is dropped when the corpus version changes.
+    """
+
+    def __init__(self, embed_fn, max_entries=SEMANTIC_CACHE_SIZE,
+                 threshold=SEMANTIC_CACHE_THRESHOLD, ttl=RESPONSE_CACHE_TTL,
+                 clock=time.monotonic):
+        self.embed_fn = embed_fn          # list[str] -> (m x d) array
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._vectors = None              # (max_entries x d), allocated on first put
+        self._expires = np.full(max_entries, -np.inf)
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._values = [None] * max_entries
+        self._version = None
+        self._tick = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def embed(self, query):
+        """Normalized embedding of one query."""
+        vector = np.asarray(self.embed_fn([query])[0], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _check_version(self, version):
+        if version != self._version:
+            self._expires[:] = -np.inf
+            self._values = [None] * self.max_entries
+            self._version = version
+
+    def get(self, vector, version):
+        """Returns the cached answer of the closest live query, or None."""
+        with self._lock:
+            self._check_version(version)
+            if self._vectors is None:
+                self.misses += 1
+                return None
+            live = self._expires > self._clock()
+            scores = np.where(live, self._vectors @ vector, -np.inf)
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                self.misses += 1
+                return None
+            self._tick += 1
+            self._last_used[best] = self._tick
+            self.hits += 1
+            return self._values[best]
+
+    def put(self, vector, version, value):
+        with self._lock:
+            self._check_version(version)
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+            # Reuse an empty/expired slot, else evict the least recently used
+            free = np.flatnonzero(self._expires <= self._clock())
+            if len(free):
+                slot = int(free[0])
+            else:
+                slot = int(np.argmin(self._last_used))
+                self.evictions += 1
+            self._tick += 1
+            self._vectors[slot] = vector
+            self._values[slot] = value
+            self._expires[slot] = self._clock() + self.ttl
+            self._last_used[slot] = self._tick
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": int(np.count_nonzero(self._expires > self._clock())),
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
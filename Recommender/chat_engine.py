@@ -1,23 +1,89 @@
-import google.generativeai as genai
+import asyncio
+import logging
 import os
+import time
 from dotenv import load_dotenv
-from Recommender.inference import get_all_faculty_context
+from Recommender.inference import get_all_faculty_context, profile_summary, render_context
+from Recommender.metrics import ERRORS, PROMPT_CHARS, RESPONSE_CHARS, TOKENS, record_stage
+from Recommender.retrieval import retrieve_candidates
 
 load_dotenv()
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 
-def chat_with_faculty(user_query):
-    # 1. Get the text list of all faculty (Very low RAM usage)
-    context_text = get_all_faculty_context()
+MODEL_NAME = 'gemini-2.5-flash'
+
+# How many pre-retrieved candidates Gemini gets to choose from
+DEFAULT_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "15"))
+
+# Max estimated tokens for the candidate list in a prompt (best matches packed first)
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "1500"))
+
+# Prefix of the text returned when the Gemini call fails (never cached)
+AI_ERROR_PREFIX = "⚠️ AI Error"
+
+class LLMStreamError(Exception):
+    """A streamed answer failed part-way; str(e) is the AI error text."""
+
+# Point this at Recommender/stub_llm.py to load-test without Gemini
+LLM_STUB_URL = os.getenv("LLM_STUB_URL")
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+
+_genai = None
+
+def get_genai():
+    """Imports and configures the Gemini SDK on first use (it is slow to import)."""
+    global _genai
+    if _genai is None:
+        import google.generativeai as genai
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        _genai = genai
+    return _genai
+
+def estimate_tokens(text):
+    """Rough token count (~4 chars per token for English prose)."""
+    return len(text) // 4
+
+def build_context(user_query, top_k=DEFAULT_TOP_K):
+    """Returns the faculty context for a query: top-K matches, or the full roster."""
+    start = time.perf_counter()
+    candidates = retrieve_candidates(user_query, k=top_k)
+    retrieval_ms = (time.perf_counter() - start) * 1000
+    record_stage("retrieval", retrieval_ms / 1000)
+
+    if candidates:
+        context_text, packed = pack_context(candidates)
+        return context_text, packed, retrieval_ms
+    # No lexical overlap at all: let Gemini judge against everyone (one line each)
+    return get_all_faculty_context(), 0, retrieval_ms
+
+def pack_context(candidates, budget=PROMPT_TOKEN_BUDGET):
+    """
+    Numbered summary lines for the best-first `candidates`, adding each one
+    only while the estimated total stays within `budget` tokens (the top
+    match is always kept). Returns (context_text, number packed).
+    """
+    lines, used = [], 0
+    for p in candidates:
+        line = f"{len(lines) + 1}. {p['name']} ({p['profile_url']}): {profile_summary(p)}"
+        cost = estimate_tokens(line) + 1
+        if lines and used + cost > budget:
+            continue
+        lines.append(line)
+        used += cost
+    return "\n".join(lines), len(lines)
+
+def build_prompt(user_query, top_k=DEFAULT_TOP_K):
+    start = time.perf_counter()
+    # 1. Pre-retrieve the best-matching faculty locally (BM25, in-process)
+    context_text, n_candidates, retrieval_ms = build_context(user_query, top_k)
 
     # 2. Build a smart prompt for Gemini
     prompt = f"""
-    You are an academic advisor at DA-IICT. 
+    You are an academic advisor at DA-IICT.
     User is looking for expertise in: "{user_query}"
-    
+
     FACULTY DATABASE:
     {context_text}
-    
+
     TASK:
     1. Select the top 3-5 faculty members who best match the query.
     2. Explain clearly WHY each one is a good fit.
@@ -25,10 +91,126 @@ def chat_with_faculty(user_query):
     4. Maintain a professional, helpful tone.
     """
 
+    tokens = estimate_tokens(prompt)
+    record_stage("context", time.perf_counter() - start)
+    PROMPT_CHARS.observe(len(prompt))
+    TOKENS.inc(tokens, kind="prompt")
+    logging.info(
+        f"Retrieval: {n_candidates or 'all'} candidates in {retrieval_ms:.2f} ms, "
+        f"prompt ~{tokens} tokens"
+    )
+    return prompt
+
+def record_answer(text, started):
+    """Counts one finished LLM call: latency, answer size/tokens, or an error."""
+    record_stage("llm", time.perf_counter() - started)
+    if text.startswith(AI_ERROR_PREFIX):
+        ERRORS.inc(kind="llm")
+        return text
+    RESPONSE_CHARS.observe(len(text))
+    TOKENS.inc(estimate_tokens(text), kind="response")
+    return text
+
+def chat_with_faculty(user_query, top_k=DEFAULT_TOP_K):
+    prompt = build_prompt(user_query, top_k)
+    started = time.perf_counter()
+    return record_answer(generate(prompt), started)
+
+def generate(prompt):
+    """Blocking counterpart of generate_async."""
     try:
+        if LLM_STUB_URL:
+            import httpx
+            response = httpx.post(LLM_STUB_URL, json={"prompt": prompt}, timeout=LLM_TIMEOUT)
+            response.raise_for_status()
+            return response.json()["text"]
+
         # 2.5-flash is extremely fast and has a huge memory for the list
-        model = genai.GenerativeModel('gemini-2.5-flash')
+        model = get_genai().GenerativeModel(MODEL_NAME)
         response = model.generate_content(prompt)
         return response.text
     except Exception as e:
-        return f"⚠️ AI Error: {str(e)}"
\ No newline at end of file
+        return f"{AI_ERROR_PREFIX}: {str(e)}"
+
+_async_client = None
+
+def _get_async_client():
+    """One pooled HTTP client for the stub LLM, created on first use."""
+    global _async_client
+    if _async_client is None:
+        import httpx
+        _async_client = httpx.AsyncClient(timeout=LLM_TIMEOUT)
+    return _async_client
+
+async def chat_with_faculty_async(user_query, top_k=DEFAULT_TOP_K):
+    """Same as chat_with_faculty, but awaits the LLM instead of blocking a thread."""
+    # Corpus reload checks and retrieval are blocking: run them on a worker thread
+    prompt = await asyncio.to_thread(build_prompt, user_query, top_k)
+    started = time.perf_counter()
+    return record_answer(await generate_async(prompt), started)
+
+def build_rationale_prompt(user_query, candidates):
+    """Short prompt asking only WHY already-ranked faculty fit (no selection step)."""
+    return f"""
+    You are an academic advisor at DA-IICT.
+    A student is interested in: "{user_query}"
+
+    These faculty were already matched, best first:
+    {render_context(candidates)}
+
+    TASK:
+    In one or two sentences each, explain why every listed faculty member fits.
+    Keep the same order and numbering.
+    """
+
+async def explain_matches_async(user_query, candidates):
+    """LLM rationale for a pre-ranked candidate list (used by batch matching)."""
+    prompt = build_rationale_prompt(user_query, candidates)
+    PROMPT_CHARS.observe(len(prompt))
+    TOKENS.inc(estimate_tokens(prompt), kind="prompt")
+    started = time.perf_counter()
+    return record_answer(await generate_async(prompt), started)
+
+async def generate_async(prompt):
+    """Sends one prompt to the LLM (or the stub) and returns the text or an AI error."""
+    try:
+        if LLM_STUB_URL:
+            response = await _get_async_client().post(LLM_STUB_URL, json={"prompt": prompt})
+            response.raise_for_status()
+            return response.json()["text"]
+
+        model = get_genai().GenerativeModel(MODEL_NAME)
+        response = await model.generate_content_async(prompt)
+        return response.text
+    except Exception as e:
+        return f"{AI_ERROR_PREFIX}: {str(e)}"
+
+async def stream_chat_with_faculty(user_query, top_k=DEFAULT_TOP_K):
+    """Yields the answer in chunks as the LLM produces them; raises LLMStreamError on failure."""
+    prompt = await asyncio.to_thread(build_prompt, user_query, top_k)
+    started = time.perf_counter()
+    parts = []
+
+    try:
+        if LLM_STUB_URL:
+            async with _get_async_client().stream("POST", f"{LLM_STUB_URL}/stream", json={"prompt": prompt}) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_text():
+                    if not parts:
+                        record_stage("llm_first_chunk", time.perf_counter() - started)
+                    parts.append(chunk)
+                    yield chunk
+        else:
+            model = get_genai().GenerativeModel(MODEL_NAME)
+            response = await model.generate_content_async(prompt, stream=True)
+            async for chunk in response:
+                if not parts:
+                    record_stage("llm_first_chunk", time.perf_counter() - started)
+                parts.append(chunk.text)
+                yield chunk.text
+        record_answer("".join(parts), started)
+    except Exception as e:
+        error_text = f"{AI_ERROR_PREFIX}: {str(e)}"
+        record_answer(error_text, started)
+        # Raised, not yielded: chunks already sent must not look like a full answer
+        raise LLMStreamError(error_text) from e
@@ -0,0 +1,96 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+# --- LIMITS ---
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))   # upstream calls in flight
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "32"))              # callers waiting for a slot
+
+
+class Overloaded(Exception):
+    """Raised when the wait queue is full; the caller should shed the request."""
+
+
+class RequestGate:
+    """
+    Bounds concurrent LLM calls with a semaphore and coalesces identical
+    in-flight requests (single-flight): the first caller for a key does the
+    work, later callers with the same key await the same result.
+    """
+
+    def __init__(self, max_concurrency=LLM_MAX_CONCURRENCY, max_queue=LLM_MAX_QUEUE):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._inflight = {}   # key -> Future shared by every caller of that key
+        self.active = 0
+        self.waiting = 0
+        self.coalesced = 0
+        self.shed = 0
+
+    async def run(self, key, factory):
+        """Returns `await factory()`, sharing the call with identical in-flight keys."""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        if self.waiting >= self.max_queue:
+            self.shed += 1
+            raise Overloaded(f"{self.waiting} requests already queued")
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark the outcome as retrieved even if no follower ever awaits it
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            result = await self._run_limited(factory)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _run_limited(self, factory):
+        async with self._acquire():
+            return await factory()
+
+    @asynccontextmanager
+    async def _acquire(self):
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Holds one concurrency slot without coalescing (e.g. for streams)."""
+        if self.waiting >= self.max_queue:
+            self.shed += 1
+            raise Overloaded(f"{self.waiting} requests already queued")
+        async with self._acquire():
+            yield
+
+    def stats(self):
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "coalesced": self.coalesced,
+            "shed": self.shed,
+        }
@@ -1,13 +1,18 @@
+import argparse
+import hashlib
 import json
 import os
 import shutil
 import sys
+import time
 from pathlib import Path
 
+import numpy as np
+
 # --- UPDATED IMPORTS (Fixes ModuleNotFoundError) ---
 from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_community.vectorstores import Chroma
-from langchain_core.documents import Document  # <--- UPDATED IMPORT
+# Chroma / Document are imported in the "chroma" branch only, so the
+# "numpy" format works without langchain_community installed.
 
 # --- PATH CONFIGURATION ---
 # 1. Get the 'faculty-assignment' root folder
@@ -19,8 +24,126 @@ DATA_PATH = BASE_DIR / "Scraper" / "Scraped_data" / "final_faculty_data.json"
 # 3. Destination (Where the Vector DB will be saved)
 DB_PERSIST_DIR = BASE_DIR / "Recommender" / "chroma_db"
 
-def create_vector_db():
-    print("STARTING: Vector Database Creation")
+# --- ROBUST IMPORT SETUP ---
+sys.path.append(str(BASE_DIR))
+from Recommender.vector_index import FacultyIndex, INDEX_DIR, MODEL_NAME, index_exists, normalize, publish
+
+# Documents sent to the embedding model per call
+EMBED_BATCH_SIZE = 64
+
+def build_page_content(profile):
+    """Construct the "Searchable Text" for one profile."""
+    return (
+        f"Name: {profile.get('name', 'Unknown')}. "
+        f"Designation: {profile.get('designation', '')}. "
+        f"Specialization: {profile.get('specialization', '')}. "
+        f"Research Interests: {profile.get('research', '')}. "
+        f"Bio: {profile.get('bio', '')}. "
+        f"Teaching: {profile.get('teaching', '')}."
+    )
+
+def build_metadata(profile):
+    """Metadata allows us to filter or retrieve specific links later."""
+    return {
+        "id": profile.get("id"),
+        "name": profile.get("name"),
+        "profile_url": profile.get("profile_url"),
+        "email": profile.get("email")
+    }
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def doc_key(meta):
+    """Stable identity of a document across runs."""
+    return meta.get("profile_url") or f"id:{meta.get('id')}"
+
+def embed_in_batches(embedding_function, texts, batch_size=EMBED_BATCH_SIZE):
+    vectors = []
+    for start in range(0, len(texts), batch_size):
+        vectors.extend(embedding_function.embed_documents(texts[start:start + batch_size]))
+    return vectors
+
+def update_numpy_index(texts, metadatas, embedding_function, full=False):
+    """
+    Builds the next FacultyIndex version, re-using vectors of documents whose
+    content hash is unchanged. Only new/changed texts are embedded; removed
+    profiles simply don't make it into the new matrix, and metadata-only
+    changes (e.g. a new email) republish without embedding anything. The
+    result is published atomically (new version dir + CURRENT pointer swap).
+    """
+    # 1. What is already indexed?
+    previous = {}
+    if not full and index_exists(INDEX_DIR):
+        old = FacultyIndex.load(INDEX_DIR)
+        if old.model_name == MODEL_NAME:
+            previous = {doc_key(m): (row, m) for row, m in enumerate(old.metadata)}
+
+    # 2. Diff by content hash, then by metadata
+    rows, to_embed, relabeled = [], [], 0
+    for text, meta in zip(texts, metadatas):
+        meta["content_hash"] = content_hash(text)
+        hit = previous.get(doc_key(meta))
+        if hit and hit[1].get("content_hash") == meta["content_hash"]:
+            rows.append(old.embeddings[hit[0]])
+            relabeled += hit[1] != meta
+        else:
+            rows.append(None)
+            to_embed.append(len(rows) - 1)
+
+    live_keys = {doc_key(m) for m in metadatas}
+    removed = sum(1 for key in previous if key not in live_keys)
+    print(f"Index diff: {len(texts) - len(to_embed)} unchanged ({relabeled} with new metadata), "
+          f"{len(to_embed)} to embed, {removed} removed")
+
+    if previous and not to_embed and not removed and not relabeled:
+        print("Index is up to date. Nothing to publish.")
+        return
+
+    # 3. Embed only the delta, in batches
+    if to_embed:
+        print(f"Generating Vectors for {len(to_embed)} documents...")
+        new_vectors = embed_in_batches(embedding_function, [texts[i] for i in to_embed])
+        for i, vector in zip(to_embed, normalize(np.asarray(new_vectors))):
+            rows[i] = vector
+
+    # 4. Publish the new version atomically
+    index = FacultyIndex(np.vstack(rows) if rows else np.zeros((0, 0), dtype=np.float32),
+                         metadatas, model_name=MODEL_NAME)
+    version_dir = publish(index, INDEX_DIR)
+    print(f"SUCCESS! {len(index)} x {index.dim} index published to: {version_dir}")
+
+def publish_chroma(version_dir, link=DB_PERSIST_DIR, keep=2):
+    """
+    Makes `link` (a symlink) point at `version_dir` with an atomic rename, so
+    readers opening DB_PERSIST_DIR see either the old or the new store.
+    Older versions beyond `keep` are removed.
+    """
+    if link.exists() and not link.is_symlink():
+        # Store from before versioning: move it aside once (the only swap with a gap)
+        print("♻️  Moving the old database to a version directory...")
+        os.replace(link, link.with_name(f"{link.name}.v0"))
+
+    tmp_link = link.with_name(f"{link.name}.tmp")
+    tmp_link.unlink(missing_ok=True)
+    tmp_link.symlink_to(version_dir.name)
+    os.replace(tmp_link, link)
+
+    versions = sorted(p for p in link.parent.glob(f"{link.name}.v*") if p.is_dir() and p != version_dir)
+    for old in versions[:max(0, len(versions) - keep + 1)]:
+        print(f"♻️  Removing old database {old.name}...")
+        shutil.rmtree(old, ignore_errors=True)
+
+def create_vector_db(fmt="chroma", full=False):
+    """
+    Builds the search index from the scraped JSON.
+
+    fmt="chroma" writes the LangChain/Chroma store (DB_PERSIST_DIR).
+    fmt="numpy"  writes a FacultyIndex (.npy matrix + metadata) to INDEX_DIR,
+                 which can be memory-mapped at query time without Chroma.
+                 Updates are incremental unless full=True.
+    """
+    print(f"STARTING: Vector Database Creation (format: {fmt})")
     
     # 1. Verify Data Exists
     if not DATA_PATH.exists():
@@ -34,57 +157,60 @@ def create_vector_db():
         data = json.load(f)
     
     # 3. Prepare Documents for Embedding
-    documents = []
-    
-    for profile in data:
-        # Construct the "Searchable Text"
-        page_content = (
-            f"Name: {profile.get('name', 'Unknown')}. "
-            f"Designation: {profile.get('designation', '')}. "
-            f"Specialization: {profile.get('specialization', '')}. "
-            f"Research Interests: {profile.get('research', '')}. "
-            f"Bio: {profile.get('bio', '')}. "
-            f"Teaching: {profile.get('teaching', '')}."
-        )
-        
-        # Metadata allows us to filter or retrieve specific links later
-        metadata = {
-            "id": profile.get("id"),
-            "name": profile.get("name"),
-            "profile_url": profile.get("profile_url"),
-            "email": profile.get("email")
-        }
-        
-        doc = Document(page_content=page_content, metadata=metadata)
-        documents.append(doc)
-    
-    print(f"Processed {len(documents)} profiles into documents.")
+    texts = [build_page_content(profile) for profile in data]
+    metadatas = [build_metadata(profile) for profile in data]
+
+    print(f"Processed {len(texts)} profiles into documents.")
 
     # 4. Initialize the Embedding Model
-    print("Loading Embedding Model (all-MiniLM-L6-v2)...")
+    print(f"Loading Embedding Model ({MODEL_NAME})...")
     try:
-        embedding_function = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+        embedding_function = HuggingFaceEmbeddings(model_name=MODEL_NAME)
     except Exception as e:
         print(f"Model Load Error: {e}")
         return
 
+    if fmt == "numpy":
+        # 5a. Embed only what changed and publish a new version
+        update_numpy_index(texts, metadatas, embedding_function, full=full)
+        return
+
+    from langchain_community.vectorstores import Chroma
+    from langchain_core.documents import Document  # <--- UPDATED IMPORT
+
+    documents = [
+        Document(page_content=text, metadata=meta)
+        for text, meta in zip(texts, metadatas)
+    ]
+
     # 5. Create and Persist the Database
-    # If DB exists, delete it to ensure a fresh start
-    if DB_PERSIST_DIR.exists():
-        print("♻️  Removing old database to ensure freshness...")
-        shutil.rmtree(DB_PERSIST_DIR)
+    # Build into a new version directory next to the live store, so readers
+    # always have a usable index, then point the chroma_db symlink at it.
+    version_dir = DB_PERSIST_DIR.with_name(f"{DB_PERSIST_DIR.name}.v{time.time_ns()}")
 
     print("Generating Vectors and Saving to Disk (This may take a moment)...")
     
     # This single line does the heavy lifting: Embeds text -> Stores in DB
-    vector_db = Chroma.from_documents(
-        documents=documents,
-        embedding=embedding_function,
-        persist_directory=str(DB_PERSIST_DIR)
-    )
+    try:
+        vector_db = Chroma.from_documents(
+            documents=documents,
+            embedding=embedding_function,
+            persist_directory=str(version_dir)
+        )
+    except Exception:
+        shutil.rmtree(version_dir, ignore_errors=True)
+        raise
+
+    publish_chroma(version_dir)
     
     print(f"SUCCESS! Vector Database saved to: {DB_PERSIST_DIR}")
     # Note: New Chroma versions might not expose _collection publicly, but the file check is sufficient.
 
 if __name__ == "__main__":
-    create_vector_db()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Build the faculty search index.")
+    parser.add_argument("--format", choices=["chroma", "numpy"], default="chroma",
+                        help="chroma: LangChain/Chroma store; numpy: memory-mappable FacultyIndex")
+    parser.add_argument("--full", action="store_true",
+                        help="numpy format: re-embed everything instead of only changed profiles")
+    args = parser.parse_args()
+    create_vector_db(fmt=args.format, full=args.full)
\ No newline at end of file
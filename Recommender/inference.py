@@ -1,20 +1,320 @@
+import hashlib
 import json
+import os
+import re
+import threading
 from pathlib import Path
 
+from Recommender.snapshot import open_snapshot
+from Scraper.transformation import BOILERPLATE_RE, sentence_key, split_sentences
+
 BASE_DIR = Path(__file__).resolve().parent.parent
-DATA_PATH = BASE_DIR / "faculty_data.json"
+DATA_PATH = Path(os.getenv("FACULTY_DATA_PATH", BASE_DIR / "faculty_data.json"))
 
-def get_all_faculty_context():
-    """Reads the JSON file and returns a text summary for Gemini."""
-    if not DATA_PATH.exists():
-        return "No faculty data available."
-    
-    with open(DATA_PATH, 'r') as f:
-        data = json.load(f)
-    
+NO_DATA_MESSAGE = "No faculty data available."
+
+# Serve from the shared memory-mapped snapshot (Recommender/snapshot.py) when it is fresh
+USE_SNAPSHOT = os.getenv("FACULTY_SNAPSHOT_ENABLED", "1") == "1"
+
+# Labels of the flattened "research" blob, in the order ingestion writes them
+PROFILE_FIELDS = ["Name", "Designation", "Specialization", "Research Interests", "Bio", "Teaching"]
+FIELD_SPLIT_RE = re.compile(r"(?:^|(?<=\.)\s)(" + "|".join(PROFILE_FIELDS) + r"): ")
+
+
+def split_profile_fields(text):
+    """
+    Splits a "Name: .. Designation: .. Specialization: .." blob back into
+    {label: value}. Labels that are missing come back as "".
+    """
+    fields = dict.fromkeys(PROFILE_FIELDS, "")
+    parts = FIELD_SPLIT_RE.split(text or "")
+    for label, value in zip(parts[1::2], parts[2::2]):
+        fields[label] = value.strip().rstrip(".").strip()
+    return fields
+
+
+# Compact per-faculty summaries (what the LLM sees instead of the raw blob)
+SUMMARY_CHARS = int(os.getenv("PROFILE_SUMMARY_CHARS", "320"))
+# Scraped navigation menu text that leaks into some profiles
+NAV_TEXT_RE = re.compile(
+    r"Research Overview Deans Office Areas Sponsored Projects Noteworthy Contributions "
+    r"Publications Theses and Reports\s*"
+)
+
+
+def summarize_profile(profile, max_chars=SUMMARY_CHARS):
+    """
+    Specialization plus the first distinct, non-boilerplate research/bio
+    sentences, cut at a sentence boundary. Drops the "Name: .. Designation:"
+    preamble and the bio text that repeats the research interests.
+    """
+    fields = split_profile_fields(profile.get("research", ""))
+    summary = f"Specialization: {fields['Specialization']}." if fields["Specialization"] else ""
+
+    seen = set()
+    # split_profile_fields drops each field's final period: put it back so the
+    # research text does not run into the first bio sentence
+    prose = [v if v[-1] in ".!?" else f"{v}." for v in (fields["Research Interests"], fields["Bio"]) if v]
+    text = NAV_TEXT_RE.sub("", " ".join(prose))
+    for sentence in split_sentences(text):
+        sentence = sentence.strip()
+        key = sentence_key(sentence)
+        if len(key) < 20 or key in seen or BOILERPLATE_RE.search(sentence):
+            continue
+        seen.add(key)
+        room = max_chars - len(summary) - 1
+        if len(sentence) > room:
+            # Nothing but the specialization yet: keep the start of the sentence
+            if not seen - {key} and room > 80:
+                summary = f"{summary} {sentence[:room].rsplit(' ', 1)[0]}...".strip()
+            break
+        summary = f"{summary} {sentence}".strip()
+
+    if not summary and fields["Designation"]:
+        # Empty profile pages: the degree line is all we know
+        summary = f"Designation: {fields['Designation']}."
+    return summary
+
+
+def profile_summary(profile):
+    """Summary from the corpus cache (computed at load), or computed now."""
+    summary = CORPUS.summaries.get(profile.get("profile_url"))
+    return summary if summary is not None else summarize_profile(profile)
+
+
+def render_context(data):
+    """Builds the numbered text summary Gemini sees for a list of profiles."""
     context_list = []
     for i, p in enumerate(data):
-        # We give Gemini the name, URL, and a snippet of research
-        context_list.append(f"{i+1}. {p['name']} ({p['profile_url']}): {p['research'][:400]}...")
-    
-    return "\n".join(context_list)
\ No newline at end of file
+        # We give Gemini the name, URL, and a compact research summary
+        context_list.append(f"{i+1}. {p['name']} ({p['profile_url']}): {profile_summary(p)}")
+
+    return "\n".join(context_list)
+
+
+def render_roster(data):
+    """One short line per faculty member (name, URL, specialization) for whole-roster prompts."""
+    lines = []
+    for i, p in enumerate(data):
+        specialization = split_profile_fields(p.get("research", ""))["Specialization"]
+        lines.append(f"{i+1}. {p['name']} ({p['profile_url']}): {specialization}")
+    return "\n".join(lines)
+
+
+# --- SCRAPER EXPORTS (streamed) ---
+# Batch size when reading a Parquet export; NDJSON is read line by line
+EXPORT_BATCH_ROWS = 1000
+
+
+def iter_export_rows(path, batch_rows=EXPORT_BATCH_ROWS):
+    """
+    Yields faculty table rows (dicts) from the scraper's NDJSON or Parquet
+    export one at a time; at most one Parquet batch is decoded at once.
+    """
+    path = Path(path)
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows):
+            yield from batch.to_pylist()
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def profile_from_row(row):
+    """A faculty table row in the faculty_data.json shape (fields flattened into "research")."""
+    values = {
+        "Name": row.get("name"), "Designation": row.get("designation"),
+        "Specialization": row.get("specialization"), "Research Interests": row.get("research"),
+        "Bio": row.get("bio"), "Teaching": row.get("teaching"),
+    }
+    return {
+        "name": row.get("name") or "",
+        "email": row.get("email") or "",
+        "profile_url": row.get("profile_url") or "",
+        "research": " ".join(f"{label}: {values[label] or ''}." for label in PROFILE_FIELDS),
+    }
+
+
+def iter_export_profiles(path):
+    """Profiles from a scraper export, converted row by row."""
+    return map(profile_from_row, iter_export_rows(path))
+
+
+def write_faculty_data(export_path, out_path=DATA_PATH):
+    """
+    Streams a scraper export into faculty_data.json (one profile per line),
+    via a temp file and an atomic rename. Returns the number of profiles.
+    """
+    out_path = Path(out_path)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    count = 0
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("[")
+        for profile in iter_export_profiles(export_path):
+            f.write(("," if count else "") + "\n" + json.dumps(profile, ensure_ascii=False))
+            count += 1
+        f.write("\n]\n")
+    os.replace(tmp, out_path)
+    return count
+
+
+class FacultyCorpus:
+    """
+    Process-wide, in-memory copy of faculty_data.json.
+
+    The file is parsed once and kept together with its pre-rendered roster
+    string and per-profile summaries. If a fresh binary snapshot exists, its
+    memory-mapped records are used instead, so worker processes share them.
+    Every access does a cheap os.stat(); the file is only re-read when
+    its mtime/size changes, and only re-parsed when its content hash changes.
+    """
+
+    def __init__(self, path=DATA_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._signature = None   # (mtime_ns, size) of the loaded file
+        self._digest = None      # sha256 of the loaded file
+        self._records = []
+        self._context_text = NO_DATA_MESSAGE
+        self.summaries = {}      # profile_url -> compact summary, rebuilt with the records
+        self.mapped = None       # the Snapshot backing the records, if any
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def _refresh(self):
+        """Reloads the file if it changed on disk. Caller must hold the lock."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            # File vanished: drop the stale copy so callers see "no data"
+            self._signature = self._digest = None
+            self._records, self._context_text = [], NO_DATA_MESSAGE
+            self.summaries, self.mapped = {}, None
+            self.misses += 1
+            return
+
+        signature = (st.st_mtime_ns, st.st_size)
+        if signature == self._signature:
+            self.hits += 1
+            return
+
+        # 1. A snapshot built from exactly this file: map it instead of parsing
+        mapped = open_snapshot(signature) if USE_SNAPSHOT else None
+        if mapped is not None:
+            if mapped.version != self._digest:
+                self.misses += 1
+                if self._digest is not None:
+                    self.reloads += 1
+                self._records = mapped.records()
+                self.summaries = mapped.summaries()
+                self._context_text = mapped.text("roster")
+                self.mapped = mapped
+            else:
+                self.hits += 1
+            self._signature, self._digest = signature, mapped.version
+            return
+
+        # 2. Stat changed -> hash the bytes before paying for json.loads
+        raw = self.path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if digest == self._digest:
+            # Touched but identical (e.g. re-export of the same data)
+            self._signature = signature
+            self.hits += 1
+            return
+
+        # 3. Real change -> parse and pre-render once
+        self.misses += 1
+        if self._digest is not None:
+            self.reloads += 1
+        self._records = json.loads(raw)
+        self.mapped = None
+        # Summaries are computed once per load, not per prompt
+        self.summaries = {p.get("profile_url"): summarize_profile(p) for p in self._records}
+        self._context_text = render_roster(self._records)
+        self._signature, self._digest = signature, digest
+
+    def records(self):
+        """Returns the parsed profile list (shared; do not mutate)."""
+        with self._lock:
+            self._refresh()
+            return self._records
+
+    def context_text(self):
+        """Returns the pre-rendered context string."""
+        with self._lock:
+            self._refresh()
+            return self._context_text
+
+    def version(self):
+        """Content hash of the loaded corpus (None if there is no data)."""
+        with self._lock:
+            self._refresh()
+            return self._digest
+
+    def snapshot(self):
+        """Returns (records, version) from the same load, for derived indexes."""
+        with self._lock:
+            self._refresh()
+            return self._records, self._digest
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "records": len(self._records),
+            "version": self._digest,
+            "snapshot": str(self.mapped.path) if self.mapped is not None else None,
+        }
+
+
+# Shared by every request handled in this process
+CORPUS = FacultyCorpus()
+
+
+def get_all_faculty_records():
+    """Returns the cached list of faculty profiles."""
+    return CORPUS.records()
+
+
+def get_all_faculty_context():
+    """Returns the cached one-line-per-faculty roster for Gemini."""
+    return CORPUS.context_text()
+
+
+def get_corpus_stats():
+    """Hit/miss/reload counters for the corpus cache."""
+    return CORPUS.stats()
+
+
+if __name__ == "__main__":
+    # python -m Recommender.inference: rebuild faculty_data.json from the latest scraper export
+    import argparse
+    import logging
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    data_dir = Path(os.getenv("SCRAPED_DATA_DIR", BASE_DIR / "Scraper" / "Scraped_data"))
+    exports = [data_dir / "final_faculty_data.parquet", data_dir / "final_faculty_data.ndjson"]
+    parser = argparse.ArgumentParser(description="Stream a scraper export (Parquet or NDJSON) into faculty_data.json.")
+    parser.add_argument("--export", type=Path, help="default: the Parquet export if present, else the NDJSON one")
+    parser.add_argument("--output", type=Path, default=DATA_PATH)
+    parser.add_argument("--snapshot", action="store_true", help="also rebuild the shared serving snapshot")
+    args = parser.parse_args()
+
+    export = args.export or next((p for p in exports if p.exists()), None)
+    if export is None:
+        parser.error(f"no export found in {data_dir}; run Scraper/ingestion.py first")
+    count = write_faculty_data(export, args.output)
+    logging.info(f"{count} profiles streamed from {export} to {args.output}")
+    if args.snapshot:
+        from Recommender.snapshot import write_snapshot
+
+        with open(args.output, "r") as f:
+            write_snapshot(json.load(f), args.output)
+        logging.info("Snapshot rebuilt")
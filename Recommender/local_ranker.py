@@ -0,0 +1,70 @@
+import logging
+import time
+
+from Recommender.inference import split_profile_fields
+from Recommender.retrieval import get_index, tokenize
+from Scraper.transformation import split_sentences
+
+# How many faculty a local answer lists (the LLM prompt asks for 3-5)
+LOCAL_TOP_K = 5
+SNIPPET_CHARS = 220
+
+
+def best_sentence(text, query_terms):
+    """The sentence of `text` sharing the most terms with the query (first wins ties)."""
+    best, best_overlap = "", 0
+    for sentence in split_sentences(text):
+        overlap = len(query_terms & set(tokenize(sentence)))
+        if overlap > best_overlap:
+            best, best_overlap = sentence, overlap
+    return best
+
+
+def clip(text, limit=SNIPPET_CHARS):
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit].rsplit(" ", 1)[0] + "..."
+
+
+def explain_match(profile, query_terms):
+    """Rationale lines for one profile, built from its matched fields."""
+    fields = split_profile_fields(profile.get("research", ""))
+    matched = sorted(query_terms & set(tokenize(f"{profile.get('name', '')} {profile.get('research', '')}")))
+
+    lines = []
+    if fields["Specialization"]:
+        lines.append(f"Specialization: {clip(fields['Specialization'])}")
+    if matched:
+        lines.append(f"Matches your query on: {', '.join(matched)}")
+    evidence = best_sentence(fields["Research Interests"] or fields["Bio"], query_terms)
+    if evidence:
+        lines.append(f"Research: \"{clip(evidence)}\"")
+    lines.append(f"Profile: {profile.get('profile_url', '')}")
+    return lines
+
+
+def local_recommendations(user_query, k=LOCAL_TOP_K):
+    """
+    Answers a query from the in-process BM25 index alone (no LLM), in the
+    same "intro + numbered **Name** / rationale" shape Gemini produces, so
+    app.py's parse_and_clean_response renders it unchanged.
+    """
+    start = time.perf_counter()
+    index = get_index()
+    hits = index.search(user_query, k)
+    query_terms = set(tokenize(user_query))
+
+    if not hits:
+        return (f"No faculty profiles matched \"{user_query}\" in the local index. "
+                f"Try broader or different keywords.")
+
+    sections = [
+        f"Top {len(hits)} faculty for \"{user_query}\" from the local faculty index, "
+        f"ranked by keyword relevance (AI reasoning is not included in this answer)."
+    ]
+    for rank, (doc_id, _) in enumerate(hits, 1):
+        profile = index.records[doc_id]
+        body = "\n".join(explain_match(profile, query_terms))
+        sections.append(f"{rank}. **{profile['name']}**\n{body}")
+
+    logging.info(f"Local answer: {len(hits)} faculty in {(time.perf_counter() - start) * 1000:.2f} ms")
+    return "\n\n".join(sections)
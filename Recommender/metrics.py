@@ -0,0 +1,206 @@
+import contextvars
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# --- BUCKETS ---
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CHARS_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144)
+
+# Send this request header (any value) to get a Server-Timing breakdown back
+TRACE_HEADER = b"x-trace"
+
+
+def _format_labels(names, values, extra=""):
+    pairs = [f'{n}="{str(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with optional labels (Prometheus text format)."""
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(n, "") for n in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {value}")
+        return lines
+
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a bisect plus three additions."""
+
+    def __init__(self, name, help_text, labels=(), buckets=SECONDS_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}   # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(n, "") for n in self.labels)
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            series[slot] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """
+    Holds the metrics plus "collectors": callables that read existing stats
+    (cache and gate counters) only when /metrics is scraped, so those cost
+    nothing on the request path.
+    """
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, name, help_text, kind, read):
+        """`read()` returns {labels_dict_as_tuple_of_pairs or (): value}."""
+        self.collectors.append((name, help_text, kind, read))
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for name, help_text, kind, read in self.collectors:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in read().items():
+                label_text = _format_labels([k for k, _ in labels], [v for _, v in labels])
+                lines.append(f"{name}{label_text} {value}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "faculty_stage_seconds", "Time spent in each serving stage.", ["stage"]))
+HTTP_SECONDS = REGISTRY.register(Histogram(
+    "faculty_http_request_seconds", "End-to-end HTTP request latency.", ["path", "status"]))
+PROMPT_CHARS = REGISTRY.register(Histogram(
+    "faculty_prompt_chars", "Size of prompts sent to the LLM.", buckets=CHARS_BUCKETS))
+RESPONSE_CHARS = REGISTRY.register(Histogram(
+    "faculty_response_chars", "Size of LLM answers.", buckets=CHARS_BUCKETS))
+TOKENS = REGISTRY.register(Counter(
+    "faculty_llm_tokens_estimated_total", "Estimated LLM tokens (~4 chars each).", ["kind"]))
+REQUESTS = REGISTRY.register(Counter(
+    "faculty_recommend_requests_total", "Recommendation requests by endpoint and answer source.",
+    ["endpoint", "source"]))
+ERRORS = REGISTRY.register(Counter(
+    "faculty_errors_total", "Errors by kind (llm, shed, fallback, stream, ...).", ["kind"]))
+
+
+# --- PER-REQUEST TRACE ---
+_current_trace = contextvars.ContextVar("faculty_trace", default=None)
+
+
+class Trace:
+    """Stage timings of one request, returned as a Server-Timing header."""
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex[:16]
+        self.stages = []
+
+    def add(self, stage, seconds):
+        self.stages.append((stage, seconds))
+
+    def server_timing(self):
+        return ", ".join(f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in self.stages)
+
+
+def record_stage(stage, seconds):
+    """Records a stage duration in the histogram and, if tracing, in the trace."""
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(stage, seconds)
+
+
+@contextmanager
+def timed(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start)
+
+
+class MetricsMiddleware:
+    """
+    Plain ASGI middleware (no BaseHTTPMiddleware task overhead): times every
+    HTTP request and, when the X-Trace header is present, attaches the
+    request's stage timings as Server-Timing plus an X-Trace-Id.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        trace = Trace() if any(name == TRACE_HEADER for name, _ in scope["headers"]) else None
+        token = _current_trace.set(trace)
+        status = 500
+
+        async def send_with_trace(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if trace is not None:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                    headers.append((b"x-trace-id", trace.id.encode("latin-1")))
+                    message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_trace)
+        finally:
+            _current_trace.reset(token)
+            # Unknown paths share one label so scanners can't blow up cardinality
+            path = scope["path"] if status != 404 else "unmatched"
+            HTTP_SECONDS.observe(time.perf_counter() - start, path=path, status=status)
@@ -0,0 +1,371 @@
+import heapq
+import logging
+import math
+import os
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from Recommender.inference import CORPUS, split_profile_fields
+from Recommender.vector_index import top_k
+
+# --- BM25 PARAMETERS ---
+K1 = 1.5
+B = 0.75
+
+# Query terms whose vocabulary position a snapshot-backed index remembers
+TERM_ID_MEMO_SIZE = 50_000
+# Queries scored together by search_batch (bounds its score block to this many rows)
+BATCH_QUERY_ROWS = 256
+
+# --- HYBRID RETRIEVAL ---
+# Per-field BM25 boosts: a match in the specialization counts most, the bio least
+FIELD_BOOSTS = {"Specialization": 3.0, "Research Interests": 2.0, "Teaching": 1.5, "Bio": 1.0, "Name": 1.0}
+# Reciprocal-rank fusion: score = sum(weight / (RRF_K + rank)) over the two rankings
+RRF_K = 60
+RRF_DEPTH = 50                      # candidates taken from each ranking before fusing
+RRF_WEIGHTS = {"lexical": 1.0, "dense": 1.0}
+HYBRID_ENABLED = os.getenv("HYBRID_RETRIEVAL", "1") == "1"
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Words that appear in almost every profile or query and carry no signal
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have he her his i in is it its of on or
+she that the their this to was were who with working works professor faculty
+research interests name designation bio teaching specialization dr
+""".split())
+
+
+def tokenize(text):
+    """Lowercases and splits text into alphanumeric terms, minus stopwords."""
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def profile_text(profile):
+    """The searchable text of one faculty_data.json record."""
+    return f"{profile.get('name', '')} {profile.get('research', '')}"
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index, built once per corpus version."""
+
+    def __init__(self, records, text_of=profile_text):
+        self.records = records
+        self.postings = defaultdict(list)   # term -> [(doc_id, tf), ...]
+        self.doc_len = []
+
+        for doc_id, profile in enumerate(records):
+            terms = tokenize(text_of(profile))
+            self.doc_len.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self.postings[term].append((doc_id, tf))
+
+        n = len(records)
+        self.avg_len = (sum(self.doc_len) / n) if n else 0.0
+        self.idf = {
+            term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5))
+            for term, p in self.postings.items()
+        }
+        self._weights = {}  # term -> (doc_ids, bm25 weights) as arrays, filled lazily
+
+    def terms(self):
+        return self.postings.keys()
+
+    def has_term(self, term):
+        return term in self.postings
+
+    def term_weights(self, term):
+        """Per-document BM25 contribution of one term, as (doc_ids, weights) arrays."""
+        cached = self._weights.get(term)
+        if cached is None:
+            postings = self.postings[term]
+            doc_ids = np.fromiter((d for d, _ in postings), dtype=np.int64, count=len(postings))
+            tf = np.fromiter((t for _, t in postings), dtype=np.float32, count=len(postings))
+            lengths = np.asarray(self.doc_len, dtype=np.float32)[doc_ids]
+            norm = K1 * (1 - B + B * lengths / self.avg_len)
+            cached = (doc_ids, (self.idf[term] * tf * (K1 + 1) / (tf + norm)).astype(np.float32))
+            self._weights[term] = cached
+        return cached
+
+    def search(self, query, k=15):
+        """
+        Returns [(doc_id, score), ...] for the k best-matching profiles.
+        Works on has_term/term_weights only, so subclasses that store the
+        weights differently (per field, memory-mapped) reuse it as is.
+        """
+        scores = np.zeros(len(self.records), dtype=np.float32)
+        for term in set(tokenize(query)):
+            if self.has_term(term):
+                doc_ids, weights = self.term_weights(term)
+                scores[doc_ids] += weights
+        top = top_k(scores, k)
+        return [(int(j), float(scores[j])) for j in top if scores[j] > 0]
+
+    def search_batch(self, queries, k=15):
+        """
+        Same scores as search() for many queries: each query term's weights
+        are scatter-added into the score rows of the queries that use it, a
+        chunk of BATCH_QUERY_ROWS queries at a time, so memory is one
+        (chunk x n) score block however many queries or terms there are.
+        """
+        results = []
+        for start in range(0, len(queries), BATCH_QUERY_ROWS):
+            chunk = queries[start:start + BATCH_QUERY_ROWS]
+            rows_of = defaultdict(list)  # term -> rows of the chunk that use it
+            for row, query in enumerate(chunk):
+                for term in set(tokenize(query)):
+                    rows_of[term].append(row)
+
+            scores = np.zeros((len(chunk), len(self.records)), dtype=np.float32)
+            for term, rows in rows_of.items():
+                if self.has_term(term):
+                    doc_ids, weights = self.term_weights(term)
+                    scores[np.ix_(rows, doc_ids)] += weights
+            top = top_k(scores, k)
+            results.extend(
+                [(int(j), float(scores[row, j])) for j in top[row] if scores[row, j] > 0]
+                for row in range(len(chunk))
+            )
+        return results
+
+
+class SnapshotBM25(BM25Index):
+    """
+    BM25 over the precomputed weights of a memory-mapped Snapshot: nothing
+    is rebuilt per worker, and the postings pages are shared between them.
+    `prefix` picks the weights: "bm25" (plain) or "field_bm25" (boosted fields).
+    """
+
+    def __init__(self, snapshot, prefix="bm25"):
+        self.records = snapshot.records()
+        self._vocab = snapshot.strings(f"{prefix}_vocab")
+        self._offsets = snapshot.array(f"{prefix}_offsets")
+        self._doc_ids = snapshot.array(f"{prefix}_doc_ids")
+        self._weights_flat = snapshot.array(f"{prefix}_weights")
+        self._term_ids = {}  # per-process memo of vocabulary lookups (query terms only)
+
+    def _term_id(self, term):
+        if term in self._term_ids:
+            return self._term_ids[term]
+        i = bisect_left(self._vocab, term)
+        term_id = i if i < len(self._vocab) and self._vocab[i] == term else None
+        if len(self._term_ids) >= TERM_ID_MEMO_SIZE:
+            self._term_ids.clear()
+        self._term_ids[term] = term_id
+        return term_id
+
+    def terms(self):
+        return self._vocab
+
+    def has_term(self, term):
+        return self._term_id(term) is not None
+
+    def term_weights(self, term):
+        i = self._term_id(term)
+        start, end = int(self._offsets[i]), int(self._offsets[i + 1])
+        return self._doc_ids[start:end], self._weights_flat[start:end]
+
+
+class FieldBM25Index(BM25Index):
+    """
+    One BM25 index per profile field, summed with per-field boosts (BM25F
+    style), so a term in the specialization outweighs the same term in the
+    bio. Each term's boosted weights are merged once and cached, so a query
+    costs the same as a single-field search.
+    """
+
+    def __init__(self, records, boosts=None):
+        self.records = records
+        self.boosts = dict(FIELD_BOOSTS if boosts is None else boosts)
+        # Split every blob once rather than once per field
+        fields = [split_profile_fields(p.get("research", "")) for p in records]
+        for profile, split in zip(records, fields):
+            split["Name"] = profile.get("name", "")
+        self.fields = {
+            field: BM25Index(fields, text_of=lambda split, field=field: split[field])
+            for field in self.boosts
+        }
+        self._weights = {}
+
+    def terms(self):
+        return set().union(*(index.terms() for index in self.fields.values()))
+
+    def has_term(self, term):
+        return any(index.has_term(term) for index in self.fields.values())
+
+    def term_weights(self, term):
+        cached = self._weights.get(term)
+        if cached is None:
+            ids, weights = [], []
+            for field, index in self.fields.items():
+                if index.has_term(term):
+                    field_ids, field_weights = index.term_weights(term)
+                    ids.append(field_ids)
+                    weights.append(field_weights * self.boosts[field])
+            doc_ids, slots = np.unique(np.concatenate(ids), return_inverse=True)
+            summed = np.bincount(slots, weights=np.concatenate(weights)).astype(np.float32)
+            cached = self._weights[term] = (doc_ids, summed)
+        return cached
+
+
+class HybridRetriever:
+    """
+    Field-weighted BM25 plus dense vectors, merged with reciprocal-rank
+    fusion. Exact-term lookups ("Who teaches VLSI?") are carried by BM25,
+    paraphrased interests by the embeddings; RRF only looks at ranks, so the
+    two score scales never have to be calibrated against each other.
+    """
+
+    def __init__(self, lexical, dense_index=None, embed=None,
+                 rrf_k=RRF_K, depth=RRF_DEPTH, weights=None):
+        self.lexical = lexical
+        self.records = lexical.records
+        self.embed = embed
+        self.rrf_k = rrf_k
+        self.depth = depth
+        self.weights = dict(RRF_WEIGHTS if weights is None else weights)
+        self.dense_index = None
+        if dense_index is not None and len(dense_index):
+            self.attach_dense(dense_index)
+
+    def attach_dense(self, dense_index):
+        """Maps the dense index rows onto corpus rows by profile_url."""
+        rows = {url: i for i, url in enumerate(profile_urls(self.records)) if url}
+        dense_rows = np.array([rows.get(m.get("profile_url"), -1) for m in dense_index.metadata], dtype=np.int64)
+        if not (dense_rows >= 0).any():
+            logging.warning("Dense index shares no profiles with the corpus; using BM25 only")
+            return
+        self.dense_index = dense_index
+        self.dense_rows = dense_rows
+
+    def warm(self):
+        """Loads the query embedder (e.g. the sentence model) before the first request needs it."""
+        if self.dense_index is not None:
+            self.embed(["warm-up"])
+        return self
+
+    def dense_search(self, query):
+        """Corpus row ids of the best dense matches, best first."""
+        if self.dense_index is None:
+            return []
+        try:
+            vector = self.embed([query])[0]
+        except Exception as e:
+            # This query only: the next one tries the embedder again
+            logging.warning(f"Query embedding failed ({e}); using BM25 only for this query")
+            return []
+        norm = np.linalg.norm(vector)
+        scores = self.dense_index.embeddings @ (vector / norm if norm else vector)
+        rows = self.dense_rows[top_k(scores, self.depth)]
+        return rows[rows >= 0].tolist()
+
+    def search(self, query, k=15):
+        """
+        Returns [(doc_id, rrf_score), ...] for the k best-fused profiles.
+        Dense neighbours always exist, so they are only fused in when BM25
+        matched something; an off-topic query returns [] and the caller
+        falls back to the whole roster.
+        """
+        lexical = [doc_id for doc_id, _ in self.lexical.search(query, self.depth)]
+        if not lexical:
+            return []
+        rankings = {"lexical": lexical, "dense": self.dense_search(query)}
+        fused = defaultdict(float)
+        for source, ranking in rankings.items():
+            weight = self.weights.get(source, 0.0)
+            for rank, doc_id in enumerate(ranking, 1):
+                fused[doc_id] += weight / (self.rrf_k + rank)
+        return heapq.nlargest(k, fused.items(), key=lambda item: item[1])
+
+
+def profile_urls(records):
+    """The profile_url of every corpus row, read from the URL table of a snapshot (no record decoding)."""
+    mapped = getattr(records, "snapshot", None)
+    if mapped is None:
+        return [r.get("profile_url") for r in records]
+    urls = [None] * len(records)
+    for url, row in zip(mapped.strings("urls_sorted"), mapped.array("url_rows")):
+        urls[row] = url
+    return urls
+
+
+def field_index(records):
+    """The boosted per-field index: shared from the snapshot if it has one built with FIELD_BOOSTS."""
+    mapped = getattr(records, "snapshot", None)
+    if mapped is not None and mapped.has("field_bm25_offsets") and mapped.header.get("field_boosts") == FIELD_BOOSTS:
+        return SnapshotBM25(mapped, "field_bm25")
+    return FieldBM25Index(records)
+
+
+def query_embedder(model_name):
+    """The embedding function matching an index: the sentence model or the hashing stub."""
+    from Recommender.vector_index import embed_queries, hashing_embed
+
+    if model_name and model_name.startswith("hashing"):
+        return hashing_embed
+    return embed_queries
+
+
+def load_dense_index(records):
+    """The snapshot's embeddings if it has them, else the published FacultyIndex, else None."""
+    from Recommender.vector_index import FacultyIndex, INDEX_DIR, index_exists
+
+    mapped = getattr(records, "snapshot", None)
+    if mapped is not None and mapped.has("embeddings"):
+        return mapped.faculty_index()
+    if index_exists(INDEX_DIR):
+        return FacultyIndex.load(INDEX_DIR)
+    return None
+
+
+_index = None
+_index_version = None
+_index_lock = threading.Lock()
+
+_hybrid = None
+_hybrid_version = None
+_hybrid_lock = threading.Lock()
+
+
+def get_index():
+    """Returns the BM25 index for the current corpus, rebuilding on change."""
+    global _index, _index_version
+    records, version = CORPUS.snapshot()
+    with _index_lock:
+        if _index is None or version != _index_version:
+            mapped = getattr(records, "snapshot", None)
+            _index = SnapshotBM25(mapped) if mapped is not None else BM25Index(records)
+            _index_version = version
+        return _index
+
+
+def get_hybrid():
+    """Returns the hybrid retriever for the current corpus, rebuilding on change."""
+    global _hybrid, _hybrid_version
+    records, version = CORPUS.snapshot()
+    with _hybrid_lock:
+        if _hybrid is None or version != _hybrid_version:
+            dense_index = load_dense_index(records)
+            embed = query_embedder(dense_index.model_name) if dense_index is not None else None
+            _hybrid = HybridRetriever(field_index(records), dense_index, embed)
+            _hybrid_version = version
+        return _hybrid
+
+
+def retrieve_candidates(query, k=15):
+    """Returns the top-k faculty records for a query (best first)."""
+    index = get_hybrid() if HYBRID_ENABLED else get_index()
+    return [index.records[doc_id] for doc_id, _ in index.search(query, k)]
+
+
+def rank_batch(queries, k=5):
+    """Ranks faculty for many queries in one pass: [[(doc_id, record, score), ...], ...]."""
+    index = get_index()
+    return [
+        [(doc_id, index.records[doc_id], score) for doc_id, score in hits]
+        for hits in index.search_batch(queries, k)
+    ]
@@ -0,0 +1,266 @@
+import argparse
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_left
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+# --- PATH CONFIGURATION ---
+BASE_DIR = Path(__file__).resolve().parent.parent
+SNAPSHOT_PATH = Path(os.getenv("FACULTY_SNAPSHOT", BASE_DIR / "Recommender" / "faculty_snapshot.bin"))
+
+# File layout: [MAGIC][sections, each 64-byte aligned][header JSON][header length: u64][MAGIC]
+# The header sits at the end so section offsets are known when it is written.
+MAGIC = b"FACSNAP1"
+FORMAT_VERSION = 1
+ALIGN = 64
+
+
+class StringTable(Sequence):
+    """Read-only list of strings stored as one UTF-8 blob plus (n + 1) offsets."""
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+
+class SnapshotRecords(Sequence):
+    """The faculty records, decoded from the shared mapping on access."""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self._rows = snapshot.strings("records")
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [json.loads(row) for row in self._rows[i]]
+        return json.loads(self._rows[i])
+
+
+class SummaryLookup:
+    """profile_url -> summary, by binary search over the sorted URL table."""
+
+    def __init__(self, snapshot):
+        self._urls = snapshot.strings("urls_sorted")
+        self._rows = snapshot.array("url_rows")
+        self._summaries = snapshot.strings("summaries")
+
+    def get(self, url, default=None):
+        if url is None:
+            return default
+        i = bisect_left(self._urls, url)
+        if i < len(self._urls) and self._urls[i] == url:
+            return self._summaries[int(self._rows[i])]
+        return default
+
+
+class Snapshot:
+    """
+    A read-only, memory-mapped faculty snapshot. Every array is a zero-copy
+    view into the mapping, so all worker processes that open the same file
+    share one copy of its pages in the OS page cache.
+    """
+
+    def __init__(self, path=SNAPSHOT_PATH):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC or self._mmap[-len(MAGIC):] != MAGIC:
+            raise ValueError(f"{self.path} is not a faculty snapshot")
+        (header_len,) = struct.unpack("<Q", self._mmap[-len(MAGIC) - 8:-len(MAGIC)])
+        header_end = len(self._mmap) - len(MAGIC) - 8
+        self.header = json.loads(self._mmap[header_end - header_len:header_end])
+        if self.header.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format {self.header.get('format')}")
+        self._buffer = memoryview(self._mmap)
+
+    @property
+    def version(self):
+        """Content hash of the faculty_data.json the snapshot was built from."""
+        return self.header["source"]["digest"]
+
+    def matches(self, signature):
+        """True if built from a file with this (mtime_ns, size) signature."""
+        source = self.header["source"]
+        return (source["mtime_ns"], source["size"]) == tuple(signature)
+
+    def has(self, name):
+        return name in self.header["sections"]
+
+    def array(self, name):
+        section = self.header["sections"][name]
+        count = int(np.prod(section["shape"])) if section["shape"] else 0
+        flat = np.frombuffer(self._buffer, dtype=section["dtype"], count=count, offset=section["offset"])
+        return flat.reshape(section["shape"])
+
+    def strings(self, name):
+        return StringTable(self.array(f"{name}.offsets"), self.array(f"{name}.data"))
+
+    def text(self, name):
+        return self.array(name).tobytes().decode("utf-8")
+
+    def records(self):
+        return SnapshotRecords(self)
+
+    def summaries(self):
+        return SummaryLookup(self)
+
+    def faculty_index(self):
+        """The embedding matrix as a FacultyIndex, or None if none was included."""
+        if not self.has("embeddings"):
+            return None
+        from Recommender.vector_index import FacultyIndex
+
+        metadata = [json.loads(m) for m in self.strings("embedding_meta")]
+        return FacultyIndex(self.array("embeddings"), metadata, self.header.get("embedding_model"))
+
+
+def open_snapshot(signature, path=SNAPSHOT_PATH):
+    """Opens the snapshot if it exists and was built from the current data file."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        snapshot = Snapshot(path)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring unreadable snapshot {path}: {e}")
+        return None
+    if not snapshot.matches(signature):
+        logging.warning(f"Snapshot {path} is stale; rebuild it with `python Recommender/snapshot.py`")
+        return None
+    return snapshot
+
+
+# --- BUILDING ---
+
+def _string_sections(name, strings):
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return {
+        f"{name}.offsets": offsets,
+        f"{name}.data": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+    }
+
+
+def _weight_sections(prefix, index):
+    """An index's weights in CSR form: vocabulary (sorted) -> slice of (doc_ids, weights)."""
+    vocab = sorted(index.terms())
+    doc_ids, weights, offsets = [], [], [0]
+    for term in vocab:
+        ids, w = index.term_weights(term)
+        doc_ids.append(ids.astype(np.int32))
+        weights.append(w)
+        offsets.append(offsets[-1] + len(ids))
+    sections = _string_sections(f"{prefix}_vocab", vocab)
+    sections[f"{prefix}_offsets"] = np.asarray(offsets, dtype=np.uint64)
+    sections[f"{prefix}_doc_ids"] = np.concatenate(doc_ids) if doc_ids else np.zeros(0, dtype=np.int32)
+    sections[f"{prefix}_weights"] = np.concatenate(weights) if weights else np.zeros(0, dtype=np.float32)
+    return sections
+
+
+def build_sections(records, include_embeddings=True):
+    """Everything a serving worker needs, as flat numpy arrays."""
+    from Recommender.inference import render_roster, summarize_profile
+    from Recommender.retrieval import BM25Index, FIELD_BOOSTS, FieldBM25Index
+    from Recommender.vector_index import FacultyIndex, INDEX_DIR, index_exists
+
+    sections = {}
+    sections.update(_string_sections("records", [json.dumps(r, ensure_ascii=False) for r in records]))
+    sections.update(_string_sections("summaries", [summarize_profile(r) for r in records]))
+    urls = [r.get("profile_url") or "" for r in records]
+    order = sorted(range(len(urls)), key=urls.__getitem__)
+    sections.update(_string_sections("urls_sorted", [urls[i] for i in order]))
+    sections["url_rows"] = np.asarray(order, dtype=np.int32)
+    sections["roster"] = np.frombuffer(render_roster(records).encode("utf-8"), dtype=np.uint8)
+
+    # Plain BM25 (local ranking, batch matching) and the boosted per-field
+    # BM25 of hybrid retrieval, both as precomputed weights
+    sections.update(_weight_sections("bm25", BM25Index(records)))
+    sections.update(_weight_sections("field_bm25", FieldBM25Index(records)))
+
+    extra = {"field_boosts": FIELD_BOOSTS}
+    if include_embeddings and index_exists(INDEX_DIR):
+        faculty_index = FacultyIndex.load(INDEX_DIR, mmap=False)
+        sections["embeddings"] = np.ascontiguousarray(faculty_index.embeddings, dtype=np.float32)
+        sections.update(_string_sections("embedding_meta", [json.dumps(m) for m in faculty_index.metadata]))
+        extra["embedding_model"] = faculty_index.model_name
+    return sections, extra
+
+
+def write_snapshot(records, source_path, path=SNAPSHOT_PATH, include_embeddings=True):
+    """Builds the snapshot for `records` (read from `source_path`) and swaps it in atomically."""
+    path = Path(path)
+    raw = Path(source_path).read_bytes()
+    st = os.stat(source_path)
+    sections, extra = build_sections(records, include_embeddings)
+
+    header = {
+        "format": FORMAT_VERSION,
+        "source": {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "digest": hashlib.sha256(raw).hexdigest()},
+        "count": len(records),
+        "sections": {},
+        **extra,
+    }
+    tmp = path.with_name(path.name + ".tmp")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        for name, array in sections.items():
+            f.write(b"\0" * (-f.tell() % ALIGN))
+            header["sections"][name] = {
+                "offset": f.tell(),
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+            }
+            f.write(np.ascontiguousarray(array).tobytes())
+        header_bytes = json.dumps(header).encode("utf-8")
+        f.write(header_bytes)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(MAGIC)
+    # Workers that already mapped the old file keep reading it until they reload
+    os.replace(tmp, path)
+    return path
+
+
+def build_snapshot(path=SNAPSHOT_PATH, include_embeddings=True):
+    """Builds the snapshot from faculty_data.json."""
+    from Recommender.inference import DATA_PATH
+
+    with open(DATA_PATH, "r") as f:
+        records = json.load(f)
+    out = write_snapshot(records, DATA_PATH, path, include_embeddings)
+    logging.info(f"Snapshot of {len(records)} profiles written to {out} ({out.stat().st_size / 1024:.0f} KiB)")
+    return out
+
+
+if __name__ == "__main__":
+    sys.path.append(str(BASE_DIR))
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="Build the shared, memory-mapped faculty snapshot.")
+    parser.add_argument("--output", type=Path, default=SNAPSHOT_PATH)
+    parser.add_argument("--no-embeddings", dest="embeddings", action="store_false")
+    args = parser.parse_args()
+    build_snapshot(args.output, args.embeddings)
@@ -0,0 +1,56 @@
+import asyncio
+import os
+import re
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+# Simulated Gemini latency (seconds); override with LLM_STUB_LATENCY
+LATENCY = float(os.getenv("LLM_STUB_LATENCY", "1.5"))
+# Delay between streamed chunks (seconds)
+CHUNK_DELAY = float(os.getenv("LLM_STUB_CHUNK_DELAY", "0.05"))
+
+# "3. Jane Doe (https://...): snippet..." lines from the FACULTY DATABASE block
+CANDIDATE_RE = re.compile(r"^\s*\d+\. (.+?) \((\S+)\): (.*)$", re.MULTILINE)
+
+app = FastAPI(title="Stub LLM")
+
+
+class GenerateRequest(BaseModel):
+    prompt: str
+
+
+def fake_answer(prompt, n=3):
+    """A Gemini-shaped answer: an intro line, then numbered faculty entries."""
+    lines = ["Based on your interest, these faculty members are a strong fit:"]
+    for i, (name, url, snippet) in enumerate(CANDIDATE_RE.findall(prompt)[:n], 1):
+        lines.append(f"{i}. **{name}**\n{snippet[:160]}\nProfile: {url}")
+    return "\n".join(lines)
+
+
+@app.post("/generate")
+async def generate(request: GenerateRequest):
+    await asyncio.sleep(LATENCY)
+    return {"text": fake_answer(request.prompt)}
+
+
+@app.post("/generate/stream")
+async def generate_stream(request: GenerateRequest):
+    """Streams the same answer in small chunks, like Gemini's stream=True."""
+    text = fake_answer(request.prompt)
+
+    async def chunks():
+        # First token arrives after a fraction of the full latency
+        await asyncio.sleep(LATENCY / 5)
+        for start in range(0, len(text), 24):
+            yield text[start:start + 24]
+            await asyncio.sleep(CHUNK_DELAY)
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+if __name__ == "__main__":
+    # Local load testing: LLM_STUB_URL=http://127.0.0.1:8001/generate
+    import uvicorn
+    uvicorn.run(app, host="127.0.0.1", port=8001)
@@ -1,47 +1,81 @@
 import sys
 from pathlib import Path
 
-# --- IMPORTS ---
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_community.vectorstores import Chroma
-
 # --- PATH CONFIGURATION ---
-BASE_DIR = Path(__file__).resolve().parent.parent 
+BASE_DIR = Path(__file__).resolve().parent.parent
 DB_PATH = BASE_DIR / "Recommender" / "chroma_db"
 
-def test_search(query):
+sys.path.append(str(BASE_DIR))
+from Recommender.vector_index import FacultyIndex, INDEX_DIR, MODEL_NAME, embed_queries, index_exists
+
+_vector_db = None
+
+def get_chroma_db():
+    """Loads the Chroma store (and its embedding model) once per process."""
+    global _vector_db
+    if _vector_db is None:
+        from langchain_huggingface import HuggingFaceEmbeddings
+        from langchain_community.vectorstores import Chroma
+
+        # Must be same model as creation!
+        embedding_function = HuggingFaceEmbeddings(model_name=MODEL_NAME)
+        _vector_db = Chroma(
+            persist_directory=str(DB_PATH),
+            embedding_function=embedding_function
+        )
+    return _vector_db
+
+def run_search_batch(queries, k=3):
+    """Searches the memory-mapped FacultyIndex: one embed call, one matmul."""
+    index = FacultyIndex.load(INDEX_DIR)
+    results = index.search_batch(embed_queries(queries), k=k)
+
+    for query, hits in zip(queries, results):
+        print(f"\n🔎 SEARCHING FOR: '{query}'")
+        print("-" * 50)
+        if not hits:
+            print("No matches found.")
+        for i, (meta, score) in enumerate(hits, 1):
+            print(f"#{i}: {meta.get('name', 'Unknown')} (score: {score:.3f})")
+            print(f"   Profile: {meta.get('profile_url', '')}")
+            print("-" * 20)
+
+def run_search(query):
     print(f"\n🔎 SEARCHING FOR: '{query}'")
     print("-" * 50)
 
-    # 1. Initialize the Embedding Model (Must be same as creation!)
-    embedding_function = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
-
-    # 2. Load the Existing Database
+    # 1. Load the Existing Database
     if not DB_PATH.exists():
         print("Error: DB not found. Run create_vector_db.py first.")
         return
 
-    vector_db = Chroma(
-        persist_directory=str(DB_PATH), 
-        embedding_function=embedding_function
-    )
+    vector_db = get_chroma_db()
 
-    # 3. Perform Similarity Search (Get top 3 results)
+    # 2. Perform Similarity Search (Get top 3 results)
     results = vector_db.similarity_search(query, k=3)
 
-    # 4. Display Results
+    # 3. Display Results
     if not results:
         print("No matches found.")
-    
+
     for i, doc in enumerate(results, 1):
         name = doc.metadata.get("name", "Unknown")
         score = "N/A" # Chroma's basic search doesn't always return score visibly in this method
-        
+
         print(f"#{i}: {name}")
         print(f"   Context Snippet: {doc.page_content[:150]}...") # Show first 150 chars
         print("-" * 20)
 
 if __name__ == "__main__":
     # Test Queries
-    test_search("Professor working on Graph Neural Networks")
-    test_search("Who teaches VLSI?")
\ No newline at end of file
+    queries = [
+        "Professor working on Graph Neural Networks",
+        "Who teaches VLSI?",
+    ]
+
+    # Prefer the NumPy index (python Recommender/create_vector_db.py --format numpy)
+    if index_exists(INDEX_DIR):
+        run_search_batch(queries)
+    else:
+        for q in queries:
+            run_search(q)
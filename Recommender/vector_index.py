@@ -0,0 +1,177 @@
+import json
+import os
+import shutil
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+# --- PATH CONFIGURATION ---
+BASE_DIR = Path(__file__).resolve().parent.parent
+INDEX_DIR = BASE_DIR / "Recommender" / "faculty_index"
+
+EMBEDDINGS_FILE = "embeddings.npy"
+METADATA_FILE = "metadata.json"
+# Names the live version directory; replaced atomically on publish
+CURRENT_FILE = "CURRENT"
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+def normalize(matrix):
+    """L2-normalizes rows so a dot product is a cosine similarity."""
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k(scores, k):
+    """Indices of the k largest scores per row, best first (argpartition + sort)."""
+    n = scores.shape[-1]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.int64)
+    if k < n:
+        idx = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    else:
+        idx = np.broadcast_to(np.arange(n), scores.shape).copy()
+    order = np.argsort(-np.take_along_axis(scores, idx, axis=-1), axis=-1, kind="stable")
+    return np.take_along_axis(idx, order, axis=-1)
+
+
+class FacultyIndex:
+    """
+    Dense similarity index: one contiguous float32 matrix of normalized
+    embeddings plus a parallel list of metadata dicts.
+
+    Saved as a plain .npy so it can be memory-mapped at startup; queries are a
+    single matrix multiply, no Chroma/SQLite involved.
+    """
+
+    def __init__(self, embeddings, metadata, model_name=MODEL_NAME):
+        if len(embeddings) != len(metadata):
+            raise ValueError(f"{len(embeddings)} embeddings but {len(metadata)} metadata rows")
+        self.embeddings = embeddings
+        self.metadata = metadata
+        self.model_name = model_name
+
+    def __len__(self):
+        return len(self.metadata)
+
+    @property
+    def dim(self):
+        return self.embeddings.shape[1] if len(self.embeddings) else 0
+
+    @classmethod
+    def build(cls, embeddings, metadata, model_name=MODEL_NAME):
+        """Creates an index from raw (unnormalized) document embeddings."""
+        return cls(normalize(np.asarray(embeddings)), list(metadata), model_name)
+
+    def save(self, directory=INDEX_DIR):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / EMBEDDINGS_FILE, np.ascontiguousarray(self.embeddings, dtype=np.float32))
+        with open(directory / METADATA_FILE, "w") as f:
+            json.dump({"model": self.model_name, "documents": self.metadata}, f)
+        return directory
+
+    @classmethod
+    def load(cls, directory=INDEX_DIR, mmap=True):
+        """Loads a saved index; with mmap=True the matrix is paged in lazily and shared."""
+        directory = resolve_index_dir(directory)
+        embeddings = np.load(directory / EMBEDDINGS_FILE, mmap_mode="r" if mmap else None)
+        with open(directory / METADATA_FILE, "r") as f:
+            meta = json.load(f)
+        return cls(embeddings, meta["documents"], meta.get("model", MODEL_NAME))
+
+    def search(self, query_embedding, k=3):
+        """Returns [(metadata, score), ...] for one query vector."""
+        return self.search_batch(np.asarray(query_embedding)[None, :], k)[0]
+
+    def search_batch(self, query_embeddings, k=3):
+        """Top-k for many queries at once: one (m x d) @ (d x n) multiply."""
+        queries = normalize(np.atleast_2d(query_embeddings))
+        scores = queries @ self.embeddings.T
+        top = top_k(scores, k)
+        return [
+            [(self.metadata[j], float(scores[row, j])) for j in top[row]]
+            for row in range(len(top))
+        ]
+
+
+def resolve_index_dir(directory=INDEX_DIR):
+    """Follows the CURRENT pointer of a published index root, if there is one."""
+    directory = Path(directory)
+    pointer = directory / CURRENT_FILE
+    if pointer.exists():
+        return directory / pointer.read_text().strip()
+    return directory
+
+
+def index_exists(directory=INDEX_DIR):
+    return (resolve_index_dir(directory) / EMBEDDINGS_FILE).exists()
+
+
+def publish(index, root=INDEX_DIR, keep=2):
+    """
+    Saves `index` as a new version directory under `root`, then swaps the
+    CURRENT pointer with an atomic rename. Readers see either the old or the
+    new version, never a half-written one. Older versions beyond `keep` are
+    removed (open memory maps stay valid after unlink on POSIX).
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    version = f"v{time.time_ns()}"
+    index.save(root / version)
+
+    tmp_pointer = root / f"{CURRENT_FILE}.tmp"
+    tmp_pointer.write_text(version)
+    os.replace(tmp_pointer, root / CURRENT_FILE)
+
+    versions = sorted(p for p in root.iterdir() if p.is_dir() and p.name.startswith("v"))
+    for old in versions[:-keep]:
+        shutil.rmtree(old, ignore_errors=True)
+    return root / version
+
+
+_embedder = None
+
+
+def get_embedder(model_name=MODEL_NAME):
+    """Loads the sentence embedding model once per process."""
+    global _embedder
+    if _embedder is None:
+        from langchain_huggingface import HuggingFaceEmbeddings
+        _embedder = HuggingFaceEmbeddings(model_name=model_name)
+    return _embedder
+
+
+def embed_queries(queries):
+    """Embeds a list of query strings into an (m x d) float32 matrix."""
+    return np.asarray(get_embedder().embed_documents(list(queries)), dtype=np.float32)
+
+
+_trigram_slots = {}   # (trigram, dim) -> column, so each distinct trigram is hashed once
+
+
+def hashing_embed(texts, dim=256):
+    """
+    Offline stand-in for the sentence model: hashed character-trigram counts.
+    Deterministic and dependency-free, for benchmarks and stubbed runs.
+    """
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        padded = f"  {' '.join(text.lower().split())}  "
+        counts = Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+        columns = []
+        for gram in counts:
+            slot = _trigram_slots.get((gram, dim))
+            if slot is None:
+                slot = _trigram_slots[(gram, dim)] = zlib.crc32(gram.encode()) % dim
+            columns.append(slot)
+        # Distinct trigrams can share a column: add.at accumulates repeats
+        np.add.at(matrix[row], columns, list(counts.values()))
+    return matrix
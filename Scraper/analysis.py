@@ -1,90 +1,520 @@
-import pandas as pd
-import os
+import argparse
+import html
+import json
+import sqlite3
 import sys
+import time
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
 # --- ROBUST PATH SETUP ---
 # 1. Get the directory where THIS script is located
 BASE_DIR = Path(__file__).resolve().parent
+sys.path.append(str(BASE_DIR))
 
-# 2. Define the path to the CSV file relative to this script
-CSV_FILE = BASE_DIR / "final_faculty_data.csv"
+import faculty_db as storage
+
+# 2. Default outputs, next to the data they describe
+REPORT_JSON = storage.DATA_DIR / "quality_report.json"
+REPORT_HTML = storage.DATA_DIR / "quality_report.html"
 # -------------------------
 
-def analyze_data():
-    # 1. Check if file exists
-    if not CSV_FILE.exists():
-        print(f"Error: '{CSV_FILE}' not found. Run 'ingestion.py' first.")
-        return
-
-    # 2. Load Data
-    try:
-        df = pd.read_csv(CSV_FILE)
-        print(f"Successfully loaded {len(df)} records from {CSV_FILE.name}\n")
-    except Exception as e:
-        print(f"Error reading CSV: {e}")
-        return
-
-    # 3. Overall Health Check
+KEY_COLUMN = "profile_url"
+NEAR_DUP_COLUMN = "bio"
+SAMPLE_LIMIT = 10           # examples listed per finding
+
+# --- NEAR-DUPLICATE DETECTION (one-permutation MinHash + LSH) ---
+MINHASH_BINS = 32           # signature length; one hash per shingle, split into bins
+LSH_BANDS = 8               # MINHASH_BINS / LSH_BANDS bins per band
+NEAR_DUP_THRESHOLD = 0.8    # estimated Jaccard similarity of the shingle sets
+SHINGLE_BYTES = 16          # bytes from each word start per shingle (about two words; multiple of 8)
+MIN_SHINGLES = 4            # shorter texts are too small to call near-duplicates
+MAX_BUCKET = 200            # LSH buckets larger than this are boilerplate, not duplicates
+MINHASH_CHUNK_ROWS = 100_000
+
+_EMPTY_BIN = np.iinfo(np.uint64).max
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_BIN_SHIFT = np.uint64(64 - int(np.log2(MINHASH_BINS)))
+_VALUE_MASK = np.uint64((1 << (64 - int(np.log2(MINHASH_BINS)))) - 1)
+
+
+# --- LOADING ---
+
+def load_frame(path):
+    """Reads a SQLite DB, Parquet/NDJSON export or CSV into a DataFrame."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in (".db", ".sqlite", ".sqlite3"):
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            return pd.read_sql_query("SELECT * FROM faculty", conn)
+        finally:
+            conn.close()
+    if suffix == ".parquet":
+        return pd.read_parquet(path)
+    if suffix in (".ndjson", ".jsonl"):
+        return pd.read_json(path, lines=True, dtype=False)
+    return pd.read_csv(path)
+
+
+def default_source():
+    """The freshest local data: the DB, else the Parquet export, else the CSV export."""
+    for path in (storage.DB_PATH, storage.PARQUET_PATH, storage.CSV_PATH):
+        if path.exists():
+            return path
+    return None
+
+
+# --- PER-COLUMN PROFILE ---
+
+def _stripped_len(value):
+    if isinstance(value, str):
+        return len(value.strip())
+    if value is None or value != value:  # None / NaN
+        return -1
+    return len(str(value))
+
+
+def stripped_lengths(values):
+    """One pass over a column: stripped length per value, -1 for null."""
+    values = np.asarray(values, dtype=object)
+    return np.fromiter(map(_stripped_len, values), dtype=np.int64, count=len(values))
+
+
+def length_histogram(lengths):
+    """Counts of non-empty lengths in power-of-two buckets: {"1-1": n, "2-3": n, "4-7": n, ...}."""
+    filled = lengths[lengths > 0]
+    if not len(filled):
+        return {}
+    buckets = np.bincount(np.floor(np.log2(filled)).astype(np.int64))
+    return {f"{2**i}-{2**(i + 1) - 1}": int(n) for i, n in enumerate(buckets) if n}
+
+
+def profile_column(series):
+    """Completeness, empty strings and length distribution of one column."""
+    rows = len(series)
+    if series.dtype != object:
+        nulls = int(series.isna().sum())
+        return {"rows": rows, "nulls": nulls, "empty": 0, "filled": rows - nulls,
+                "completeness": round(100 * (rows - nulls) / rows, 2) if rows else 0.0}
+
+    lengths = stripped_lengths(series.to_numpy())
+    nulls = int((lengths < 0).sum())
+    empty = int((lengths == 0).sum())
+    filled = lengths[lengths > 0]
+    profile = {
+        "rows": rows,
+        "nulls": nulls,
+        "empty": empty,
+        "filled": len(filled),
+        "completeness": round(100 * len(filled) / rows, 2) if rows else 0.0,
+        "length": None,
+        "histogram": length_histogram(lengths),
+    }
+    if len(filled):
+        p50, p90, p99 = np.percentile(filled, [50, 90, 99])
+        profile["length"] = {
+            "min": int(filled.min()), "mean": round(float(filled.mean()), 1),
+            "p50": float(p50), "p90": float(p90), "p99": float(p99), "max": int(filled.max()),
+        }
+    return profile
+
+
+# --- DUPLICATES ---
+
+def url_duplicates(urls):
+    """Rows that repeat an already-seen, non-empty profile URL."""
+    counts = urls.value_counts()
+    repeated = counts[(counts > 1) & (counts.index != "")]
+    return {
+        "duplicate_rows": int((repeated - 1).sum()),
+        "duplicate_urls": len(repeated),
+        "examples": [{"profile_url": url, "count": int(n)} for url, n in repeated.head(SAMPLE_LIMIT).items()],
+    }
+
+
+def _mix(h):
+    """Finalizer so nearby shingle values spread over all 64 bits."""
+    h = h ^ (h >> np.uint64(31))
+    h = h * _MIX
+    return h ^ (h >> np.uint64(29))
+
+
+def minhash_signatures(texts):
+    """
+    (n x MINHASH_BINS) one-permutation MinHash signatures: every shingle is
+    hashed once, its top bits pick a bin and the bin keeps the minimum of
+    the remaining bits. Empty bins hold _EMPTY_BIN. Shingles are read
+    straight from one UTF-8 byte buffer per chunk with numpy, so no
+    per-word Python strings are ever created.
+    """
+    signatures = np.full((len(texts), MINHASH_BINS), _EMPTY_BIN, dtype=np.uint64)
+    shingle_counts = np.zeros(len(texts), dtype=np.int64)
+    for start in range(0, len(texts), MINHASH_CHUNK_ROWS):
+        chunk = texts[start:start + MINHASH_CHUNK_ROWS]
+        encoded = "\0".join(chunk).lower().encode("utf-8")
+        buf = np.frombuffer(encoded + b"\0" * SHINGLE_BYTES, dtype=np.uint8)
+        separators = np.flatnonzero(buf[:len(encoded)] == 0)
+        doc_ends = np.r_[separators, len(encoded)]
+
+        # Word starts: a non-space byte after a space/separator (or at 0)
+        space = buf <= 32
+        starts = np.flatnonzero(~space[:len(encoded)] & np.r_[True, space[:len(encoded) - 1]])
+        doc = np.searchsorted(separators, starts)
+        fits = starts + SHINGLE_BYTES <= doc_ends[doc]
+        starts, doc = starts[fits], doc[fits]
+        if not len(starts):
+            continue
+
+        # Unaligned uint64 view with a 1-byte stride: 8 bytes per gather
+        windows = np.ndarray((len(buf) - 7,), dtype="<u8", buffer=buf, strides=(1,))
+        h = windows[starts]
+        for offset in range(8, SHINGLE_BYTES, 8):
+            h = _mix(h) ^ windows[starts + offset]
+        shingles = _mix(h)
+
+        flat = signatures[start:start + len(chunk)].reshape(-1)
+        bins = (shingles >> _BIN_SHIFT).astype(np.int64)
+        np.minimum.at(flat, doc * MINHASH_BINS + bins, shingles & _VALUE_MASK)
+        signatures[start:start + len(chunk)] = flat.reshape(len(chunk), MINHASH_BINS)
+        shingle_counts[start:start + len(chunk)] = np.bincount(doc, minlength=len(chunk))
+    return signatures, shingle_counts
+
+
+def signature_similarity(signatures, a, b):
+    """Estimated Jaccard similarity of the pairs (a[i], b[i])."""
+    sa, sb = signatures[a], signatures[b]
+    used = (sa != _EMPTY_BIN) | (sb != _EMPTY_BIN)
+    agree = ((sa == sb) & used).sum(axis=1)
+    return agree / np.maximum(used.sum(axis=1), 1)
+
+
+def lsh_candidates(signatures, eligible):
+    """Unique (a, b) pairs that share at least one LSH band, a < b."""
+    rows_per_band = MINHASH_BINS // LSH_BANDS
+    n = len(signatures)
+    pairs = []
+    for band in range(LSH_BANDS):
+        block = signatures[:, band * rows_per_band:(band + 1) * rows_per_band]
+        keys = block[:, 0].copy()
+        for col in range(1, rows_per_band):
+            keys = (keys * _MIX) ^ block[:, col]
+        valid = eligible & (block != _EMPTY_BIN).any(axis=1)
+        ids = np.flatnonzero(valid)
+        order = ids[np.argsort(keys[ids], kind="stable")]
+        sorted_keys = keys[order]
+        if not len(order):
+            continue
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        sizes = np.diff(np.r_[starts, len(order)])
+        run = np.repeat(np.arange(len(starts)), sizes)
+        leader = order[starts][run]
+        keep = (order != leader) & (sizes[run] <= MAX_BUCKET)
+        a, b = np.minimum(leader[keep], order[keep]), np.maximum(leader[keep], order[keep])
+        pairs.append(a * n + b)
+    if not pairs:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    unique = np.unique(np.concatenate(pairs))
+    return unique // n, unique % n
+
+
+def _groups(pairs, n):
+    """Connected components of the pair graph, as lists of ids (size >= 2)."""
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b in pairs:
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+    members = {}
+    for x in {v for pair in pairs for v in pair}:
+        members.setdefault(find(x), []).append(x)
+    return sorted((sorted(m) for m in members.values()), key=len, reverse=True)
+
+
+def text_duplicates(texts, keys):
+    """
+    Exact duplicates (same stripped text) and near-duplicates (MinHash/LSH,
+    estimated Jaccard >= NEAR_DUP_THRESHOLD) of one text column. Only the
+    distinct texts are shingled, so repeated boilerplate costs nothing extra.
+    """
+    texts = np.array([v.strip() if isinstance(v, str) else "" for v in texts.to_numpy()], dtype=object)
+    present = np.flatnonzero(np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)) > 0)
+    if not len(present):
+        return {"exact_groups": 0, "exact_rows": 0, "near_groups": 0, "near_rows": 0, "examples": []}
+    # Mostly-distinct strings: hashing directly beats factorizing first
+    hashes = pd.util.hash_array(texts[present], categorize=False)
+    unique_hashes, first, inverse, counts = np.unique(hashes, return_index=True, return_inverse=True, return_counts=True)
+
+    signatures, shingles = minhash_signatures(texts[present[first]].tolist())
+    a, b = lsh_candidates(signatures, shingles >= MIN_SHINGLES)
+    similarity = signature_similarity(signatures, a, b)
+    close = similarity >= NEAR_DUP_THRESHOLD
+    groups = _groups(list(zip(a[close].tolist(), b[close].tolist())), len(unique_hashes))
+
+    def rows(unique_id):
+        """Row numbers holding one distinct text (only called for the few examples)."""
+        return present[inverse == unique_id].tolist()
+
+    key_values = keys.to_numpy()
+    examples = [
+        {"size": sum(len(rows(u)) for u in group),
+         "keys": [str(key_values[r]) for u in group[:5] for r in rows(u)[:1]],
+         "sample": texts[rows(group[0])[0]][:120]}
+        for group in groups[:SAMPLE_LIMIT]
+    ]
+    return {
+        "exact_groups": int((counts > 1).sum()),
+        "exact_rows": int((counts[counts > 1] - 1).sum()),
+        "near_groups": len(groups),
+        "near_rows": int(sum(counts[u] for group in groups for u in group)),
+        "candidate_pairs": len(a),
+        "examples": examples,
+    }
+
+
+# --- DRIFT BETWEEN TWO SNAPSHOTS ---
+
+def psi(current, baseline):
+    """Population stability index of two bucket-count dicts (0 = identical)."""
+    labels = sorted(set(current) | set(baseline))
+    if not labels:
+        return 0.0
+    p = np.array([current.get(l, 0) for l in labels], dtype=float)
+    q = np.array([baseline.get(l, 0) for l in labels], dtype=float)
+    p = p / max(p.sum(), 1) + 1e-6
+    q = q / max(q.sum(), 1) + 1e-6
+    return round(float(((p - q) * np.log(p / q)).sum()), 4)
+
+
+def _blank(values):
+    return pd.isna(values) | (values == "")
+
+
+def drift(current, baseline, current_columns, baseline_columns):
+    """Per-field changes between two ingestion snapshots, joined on KEY_COLUMN."""
+    fields = {}
+    for col in current_columns.keys() & baseline_columns.keys():
+        now, before = current_columns[col], baseline_columns[col]
+        entry = {"completeness_delta": round(now["completeness"] - before["completeness"], 2)}
+        if now.get("length") and before.get("length"):
+            entry["mean_length_delta"] = round(now["length"]["mean"] - before["length"]["mean"], 1)
+            entry["length_psi"] = psi(now["histogram"], before["histogram"])
+        fields[col] = entry
+
+    rows = {}
+    if KEY_COLUMN in current and KEY_COLUMN in baseline:
+        # Align both snapshots on the first row of every URL, once for all fields
+        now_first = np.flatnonzero(~current[KEY_COLUMN].duplicated().to_numpy())
+        before_first = np.flatnonzero(~baseline[KEY_COLUMN].duplicated().to_numpy())
+        now_keys = pd.Index(current[KEY_COLUMN].to_numpy()[now_first])
+        before_keys = pd.Index(baseline[KEY_COLUMN].to_numpy()[before_first])
+        common = now_keys.intersection(before_keys)
+        rows = {
+            "added": int(len(now_keys.difference(before_keys))),
+            "removed": int(len(before_keys.difference(now_keys))),
+            "common": len(common),
+        }
+        now_rows = now_first[now_keys.get_indexer(common)]
+        before_rows = before_first[before_keys.get_indexer(common)]
+        shared = current.columns.intersection(baseline.columns).drop(["id", KEY_COLUMN], errors="ignore")
+        for col in shared:
+            left = current[col].to_numpy()[now_rows]
+            right = baseline[col].to_numpy()[before_rows]
+            # Null and "" count as the same (CSV round-trips turn one into the other)
+            changed = (left != right) & ~(_blank(left) & _blank(right))
+            fields.setdefault(col, {})["changed_rows"] = int(changed.sum())
+    return {"rows": rows, "fields": dict(sorted(fields.items()))}
+
+
+# --- REPORT ---
+
+def build_report(df, baseline=None):
+    """Everything the report contains, as a JSON-serializable dict."""
+    timings = {}
+
+    def timed(name, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+
+    columns = timed("columns", lambda: {col: profile_column(df[col]) for col in df.columns})
+    report = {"rows": len(df), "columns": columns}
+    if KEY_COLUMN in df:
+        report["url_duplicates"] = timed("url_duplicates", url_duplicates, df[KEY_COLUMN])
+    if NEAR_DUP_COLUMN in df:
+        keys = df[KEY_COLUMN] if KEY_COLUMN in df else pd.Series(df.index)
+        report["bio_duplicates"] = timed("bio_duplicates", text_duplicates, df[NEAR_DUP_COLUMN], keys)
+    if baseline is not None:
+        baseline_columns = timed("baseline_columns", lambda: {col: profile_column(baseline[col]) for col in baseline.columns})
+        report["drift"] = timed("drift", drift, df, baseline, columns, baseline_columns)
+    report["timings_ms"] = timings
+    return report
+
+
+def _table(headers, rows):
+    head = "".join(f"<th>{html.escape(str(h))}</th>" for h in headers)
+    body = "".join("<tr>" + "".join(f"<td>{html.escape(str(c))}</td>" for c in row) + "</tr>" for row in rows)
+    return f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>"
+
+
+def render_html(report, title="Faculty data-quality report"):
+    """A self-contained HTML page of the report."""
+    parts = [f"<h1>{html.escape(title)}</h1>", f"<p>{report['rows']} rows</p>", "<h2>Columns</h2>"]
+    parts.append(_table(
+        ["Column", "Nulls", "Empty", "Filled", "% Complete", "Length p50", "Length p99", "Length max"],
+        [[col, c["nulls"], c["empty"], c["filled"], c["completeness"],
+          *(([c["length"]["p50"], c["length"]["p99"], c["length"]["max"]]) if c.get("length") else ["", "", ""])]
+         for col, c in report["columns"].items()],
+    ))
+    if "url_duplicates" in report:
+        dupes = report["url_duplicates"]
+        parts.append(f"<h2>Duplicate URLs</h2><p>{dupes['duplicate_rows']} duplicate rows over {dupes['duplicate_urls']} URLs</p>")
+        parts.append(_table(["Profile URL", "Count"], [[e["profile_url"], e["count"]] for e in dupes["examples"]]))
+    if "bio_duplicates" in report:
+        bios = report["bio_duplicates"]
+        parts.append(f"<h2>Duplicate bios</h2><p>Exact: {bios['exact_rows']} rows in {bios['exact_groups']} groups. "
+                     f"Near (Jaccard &ge; {NEAR_DUP_THRESHOLD}): {bios['near_rows']} rows in {bios['near_groups']} groups.</p>")
+        parts.append(_table(["Group size", "Profiles", "Sample"],
+                            [[e["size"], ", ".join(e["keys"]), e["sample"]] for e in bios["examples"]]))
+    if "drift" in report:
+        rows = report["drift"]["rows"]
+        if rows:
+            parts.append(f"<h2>Drift</h2><p>{rows['added']} added, {rows['removed']} removed, {rows['common']} in both</p>")
+        parts.append(_table(
+            ["Field", "Completeness Δ", "Mean length Δ", "Length PSI", "Changed rows"],
+            [[col, f.get("completeness_delta", ""), f.get("mean_length_delta", ""), f.get("length_psi", ""),
+              f.get("changed_rows", "")] for col, f in report["drift"]["fields"].items()],
+        ))
+    style = ("body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin-bottom:1em}"
+             "td,th{border:1px solid #ccc;padding:4px 8px;text-align:left;vertical-align:top}")
+    return f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title><style>{style}</style></head><body>{''.join(parts)}</body></html>"
+
+
+def print_summary(report):
     print("="*40)
     print(" DATA HEALTH REPORT")
     print("="*40)
-    print(df.info())
-    print("\n")
+    print(f"{report['rows']} rows")
+    print(f"{'Column':<20} | {'Missing (NaN)':<15} | {'Empty String':<15} | {'% Complete':<15}")
+    print("-" * 75)
+    for col, c in report["columns"].items():
+        print(f"{col:<20} | {c['nulls']:<15} | {c['empty']:<15} | {c['completeness']:.1f}%")
+    if "url_duplicates" in report:
+        print(f"\nDuplicate profiles by URL: {report['url_duplicates']['duplicate_rows']}")
+    if "bio_duplicates" in report:
+        bios = report["bio_duplicates"]
+        print(f"Duplicate bios: {bios['exact_rows']} exact, {bios['near_rows']} rows in {bios['near_groups']} near-duplicate groups")
+    if "drift" in report and report["drift"]["rows"]:
+        rows = report["drift"]["rows"]
+        print(f"Drift vs baseline: +{rows['added']} added, -{rows['removed']} removed")
+    print(f"Timings (ms): {report['timings_ms']}")
+
+
+def analyze_data(source=None, baseline=None, json_path=REPORT_JSON, html_path=REPORT_HTML):
+    """Builds the report for `source` (optionally against a `baseline` snapshot) and writes JSON + HTML."""
+    source = source or default_source()
+    if source is None:
+        print("Error: no faculty data found. Run 'ingestion.py' first.")
+        return None
+    df = load_frame(source)
+    print(f"Successfully loaded {len(df)} records from {Path(source).name}\n")
+    report = build_report(df, load_frame(baseline) if baseline else None)
+    report["source"] = str(source)
+    write_report(report, json_path, html_path)
+    print_summary(report)
+    return report
+
+
+def write_report(report, json_path=REPORT_JSON, html_path=REPORT_HTML):
+    for path, text in ((json_path, json.dumps(report, indent=2, default=str)), (html_path, render_html(report))):
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text(text, encoding="utf-8")
+            print(f"Report written to {path}")
+
+
+# --- SYNTHETIC CORPUS (for scale testing) ---
+
+SYNTHETIC_VOCABULARY = 5000
+
+
+def synthetic_frame(n, seed=0, sentences=2000):
+    """
+    n faculty rows with realistic defects: ~4% empty bios, ~2% near-duplicate
+    bios (a copied bio with a short suffix), ~0.5% repeated URLs.
+    """
+    rng = np.random.default_rng(seed)
+    syllables = np.array(["ka", "ro", "mi", "ten", "sa", "lu", "ve", "dor", "pi", "na", "gre", "ul"], dtype=object)
+    words = np.array(sorted({"".join(rng.choice(syllables, rng.integers(2, 5))) for _ in range(SYNTHETIC_VOCABULARY)}), dtype=object)
+    pool = np.array([" ".join(rng.choice(words, rng.integers(6, 14))) + "." for _ in range(sentences)], dtype=object)
+    picks = rng.integers(0, sentences, (n, 4))
+    bio = pd.Series(pool[picks[:, 0]]).str.cat([pd.Series(pool[picks[:, j]]) for j in range(1, 4)], sep=" ")
+
+    ids = np.arange(n)
+    copies = rng.random(n) < 0.02
+    bio[copies] = bio.iloc[rng.integers(0, n, copies.sum())].to_numpy() + " Updated profile."
+    bio[rng.random(n) < 0.04] = ""
+    urls = pd.Series(ids).astype(str).radd("https://example.edu/faculty/")
+    repeats = rng.random(n) < 0.005
+    urls[repeats] = urls.iloc[rng.integers(0, n, repeats.sum())].to_numpy()
+    names = pd.Series(ids).astype(str).radd("Faculty ")
+    return pd.DataFrame({
+        "id": ids + 1,
+        "name": names,
+        "designation": rng.choice(np.array(["Professor", "Associate Professor", "Assistant Professor", ""], dtype=object), n),
+        "email": names.str.replace(" ", ".").str.lower() + "@example.edu",
+        "bio": bio,
+        "research": pd.Series(pool[picks[:, 1]]),
+        "publications": None,
+        "teaching": rng.choice(np.array(["Signals and Systems", "Algorithms", "Machine Learning", "", None], dtype=object), n),
+        "specialization": pd.Series(pool[picks[:, 2]]),
+        "profile_url": urls,
+    })
+
+
+def drifted(df, seed=1):
+    """A later 'ingestion' of df: 1% removed, 1% added, 2% bios edited, teaching blanked in 3%."""
+    rng = np.random.default_rng(seed)
+    n = len(df)
+    later = df[rng.random(n) >= 0.01].copy()
+    edited = rng.random(len(later)) < 0.02
+    later.loc[edited, "bio"] = later.loc[edited, "bio"] + " New grant awarded."
+    later.loc[rng.random(len(later)) < 0.03, "teaching"] = ""
+    added = synthetic_frame(max(1, n // 100), seed=seed + 1)
+    added["profile_url"] = added["profile_url"].str.replace("/faculty/", "/faculty/new-")
+    return pd.concat([later, added], ignore_index=True)
 
-    # 4. Missing Value Analysis (NaN vs Empty Strings)
-    print("="*40)
-    print(" MISSING DATA BREAKDOWN")
-    print("="*40)
-    print(f"{'Column':<20} | {'Missing (NaN)':<15} | {'Empty String':<15} | {'Total Empty':<15} | {'% Complete':<15}")
-    print("-" * 90)
-
-    for col in df.columns:
-        # Count actual NaNs
-        nan_count = df[col].isnull().sum()
-        
-        # Count empty strings (often happens in scraping)
-        empty_str_count = 0
-        if df[col].dtype == object:
-            empty_str_count = (df[col].astype(str).str.strip() == '').sum()
-            # Note: Pandas sometimes reads empty CSV cells as NaN, so we handle both
-        
-        total_empty = nan_count + empty_str_count
-        completeness = 100 - ((total_empty / len(df)) * 100)
-        
-        print(f"{col:<20} | {nan_count:<15} | {empty_str_count:<15} | {total_empty:<15} | {completeness:.1f}%")
-
-    # 5. Content Sampling (Quality Check)
-    print("\n" + "="*40)
-    print("CONTENT SAMPLING (First 3 Valid Entries)")
-    print("="*40)
-    
-    columns_to_check = ['specialization', 'teaching', 'bio', 'research']
-    
-    for col in columns_to_check:
-        if col in df.columns:
-            print(f"\n--- Sample Data for: {col.upper()} ---")
-            # Get first 3 non-empty values
-            valid_samples = df[df[col].notna() & (df[col].astype(str).str.strip() != '')][col].head(3)
-            
-            if len(valid_samples) > 0:
-                for i, text in enumerate(valid_samples, 1):
-                    # Truncate long text for display
-                    display_text = (text[:90] + '...') if len(str(text)) > 90 else text
-                    print(f"{i}. {display_text}")
-            else:
-                print("   (No data found in this column)")
-
-    # 6. Duplicate Check
-    print("\n" + "="*40)
-    print(" 👯 DUPLICATE CHECK")
-    print("="*40)
-    if 'profile_url' in df.columns:
-        dupes = df.duplicated(subset=['profile_url']).sum()
-        if dupes == 0:
-            print("No duplicate profiles found.")
-        else:
-            print(f"Found {dupes} duplicate profiles based on URL.")
 
 if __name__ == "__main__":
-    analyze_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Data-quality report for the faculty table.")
+    parser.add_argument("source", nargs="?", type=Path, help="faculty.db, .parquet, .ndjson or .csv (default: latest local data)")
+    parser.add_argument("--baseline", type=Path, help="earlier snapshot to measure drift against")
+    parser.add_argument("--json", type=Path, default=REPORT_JSON)
+    parser.add_argument("--html", type=Path, default=REPORT_HTML)
+    parser.add_argument("--synthetic", type=int, metavar="N",
+                        help="report on N synthetic rows (with a drifted baseline) instead of real data")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        start = time.perf_counter()
+        base = synthetic_frame(args.synthetic)
+        current = drifted(base)
+        print(f"Generated {len(current)} synthetic rows in {time.perf_counter() - start:.1f}s")
+        start = time.perf_counter()
+        report = build_report(current, base)
+        print(f"Report built in {time.perf_counter() - start:.1f}s\n")
+        report["source"] = f"synthetic:{args.synthetic}"
+        write_report(report, args.json, args.html)
+        print_summary(report)
+    else:
+        analyze_data(args.source, args.baseline, args.json, args.html)
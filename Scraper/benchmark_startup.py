@@ -0,0 +1,153 @@
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+# --- ROBUST IMPORT SETUP ---
+BASE_DIR = Path(__file__).resolve().parent
+ROOT_DIR = BASE_DIR.parent
+sys.path.append(str(BASE_DIR))
+sys.path.append(str(ROOT_DIR))
+
+SAMPLE_DATA = ROOT_DIR / "faculty_data.json"
+# Imports that must NOT happen at startup any more
+HEAVY_MODULES = ["pandas", "google.generativeai", "httpx", "langchain_huggingface", "sentence_transformers", "torch"]
+
+
+def import_profile(top=10):
+    """Runs `python -X importtime -c "import serving"` and summarizes stderr."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import serving"],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True,
+    )
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if not parts[0].strip().isdigit():
+            continue  # header line
+        modules.append((parts[2].rstrip(), int(parts[0]), int(parts[1])))
+
+    total_us = next((cum for name, _, cum in modules if name.strip() == "serving"), 0)
+    # Cumulative time per top-level package (its largest single import)
+    top_level = {}
+    for name, _, cum in modules:
+        root = name.strip().split(".")[0]
+        if root != "serving":
+            top_level[root] = max(top_level.get(root, 0), cum)
+    loaded = {name.strip() for name, _, _ in modules}
+    return {
+        "import_serving_ms": round(total_us / 1000, 1),
+        "slowest_packages_ms": {
+            name: round(us / 1000, 1)
+            for name, us in sorted(top_level.items(), key=lambda kv: -kv[1])[:top]
+        },
+        "heavy_modules_imported": [m for m in HEAVY_MODULES if m in loaded],
+    }
+
+
+def seed_data_dir():
+    """A throwaway SCRAPED_DATA_DIR holding faculty_data.json as a SQLite DB."""
+    data_dir = Path(tempfile.mkdtemp(prefix="faculty_startup_"))
+    os.environ["SCRAPED_DATA_DIR"] = str(data_dir)
+    import faculty_db as storage
+    from Recommender.inference import split_profile_fields
+
+    with open(SAMPLE_DATA, "r") as f:
+        records = json.load(f)
+    rows = []
+    for r in records:
+        fields = split_profile_fields(r["research"])
+        rows.append({
+            "name": r["name"], "designation": fields["Designation"], "email": r.get("email", ""),
+            "bio": fields["Bio"], "research": fields["Research Interests"], "publications": "",
+            "teaching": fields["Teaching"], "specialization": fields["Specialization"],
+            "url": r["profile_url"],
+        })
+    storage.init_db()
+    storage.save_profiles_bulk(rows)
+    storage.close_db_connection()
+    return data_dir
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_200(url, started, timeout):
+    """Seconds from `started` until `url` first answers 200."""
+    while time.perf_counter() - started < timeout:
+        try:
+            if requests.get(url, timeout=5).status_code == 200:
+                return time.perf_counter() - started
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"{url} did not answer 200 within {timeout}s")
+
+
+def time_to_first_200(data_dir, prewarm, timeout=60):
+    """Spawns uvicorn and measures time to the first 200 from / and then /faculty."""
+    port = free_port()
+    env = dict(os.environ, SCRAPED_DATA_DIR=str(data_dir), PREWARM="1" if prewarm else "0")
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "Scraper.serving:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        root_s = wait_for_200(f"http://127.0.0.1:{port}/", started, timeout)
+        faculty_s = wait_for_200(f"http://127.0.0.1:{port}/faculty", started, timeout)
+    finally:
+        proc.terminate()
+        proc.wait()
+    return root_s, faculty_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup benchmark: import time and time-to-first-200.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--prewarm", action="store_true", help="start the server with PREWARM=1")
+    parser.add_argument("--output", type=Path, help="also write the results as JSON")
+    args = parser.parse_args()
+
+    report = import_profile()
+    print(f"import serving: {report['import_serving_ms']} ms")
+    print(f"slowest packages (ms): {report['slowest_packages_ms']}")
+    print(f"heavy modules imported at startup: {report['heavy_modules_imported'] or 'none'}")
+
+    data_dir = seed_data_dir()
+    root_times, faculty_times = [], []
+    for _ in range(args.runs):
+        root_s, faculty_s = time_to_first_200(data_dir, args.prewarm)
+        root_times.append(root_s)
+        faculty_times.append(faculty_s)
+
+    report.update({
+        "runs": args.runs,
+        "prewarm": args.prewarm,
+        "first_200_root_ms": round(statistics.median(root_times) * 1000, 1),
+        "first_200_faculty_ms": round(statistics.median(faculty_times) * 1000, 1),
+    })
+    print(f"time to first 200 (median of {args.runs}): / {report['first_200_root_ms']} ms, "
+          f"/faculty {report['first_200_faculty_ms']} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
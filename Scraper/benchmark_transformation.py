@@ -0,0 +1,66 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# --- ROBUST IMPORT SETUP ---
+BASE_DIR = Path(__file__).resolve().parent
+sys.path.append(str(BASE_DIR))
+
+import transformation
+from benchmark_search import synthetic_profiles
+
+
+def browser_style(profile):
+    """The same profile as the Selenium path delivers it: line breaks, indentation, obfuscated email."""
+    raw = {}
+    for field, value in profile.items():
+        if field in ("url", "publications"):
+            raw[field] = value
+        else:
+            raw[field] = "\n    ".join(value.replace(". ", ".\n\n").split(" "))
+    raw["email"] = profile["email"].replace("@", " [at] ").replace(".", "[dot]")
+    raw["publications"] = [f"  {s.strip()}.\n" for s in profile["bio"].split(".") if s.strip()]
+    return raw
+
+
+def records_per_sec(fn, profiles, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(profiles)
+        best = min(best, time.perf_counter() - start)
+    return round(len(profiles) / best)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Records/sec of clean_profile (per record) vs clean_profiles (batch).")
+    parser.add_argument("--profiles", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="also write the results as JSON")
+    args = parser.parse_args()
+
+    # "http": text the HTML parser already collapsed; "browser": raw Selenium text
+    clean = list(synthetic_profiles(args.profiles))
+    inputs = {"http": clean, "browser": [browser_style(p) for p in clean]}
+
+    results = {}
+    for name, profiles in inputs.items():
+        expected = [transformation.clean_profile(p) for p in profiles]
+        if transformation.clean_profiles(profiles) != expected:
+            raise SystemExit(f"clean_profiles output differs from clean_profile on {name} input")
+        before = records_per_sec(lambda ps: [transformation.clean_profile(p) for p in ps], profiles, args.repeat)
+        after = records_per_sec(transformation.clean_profiles, profiles, args.repeat)
+        results[name] = {"per_record": before, "batch": after, "speedup": round(after / before, 2)}
+        print(f"{name:8s} clean_profile {before:>9,} rec/s   clean_profiles {after:>9,} rec/s   "
+              f"x{results[name]['speedup']}  (output identical)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"profiles": args.profiles, "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
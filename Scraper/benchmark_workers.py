@@ -0,0 +1,140 @@
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+# --- ROBUST IMPORT SETUP ---
+BASE_DIR = Path(__file__).resolve().parent
+ROOT_DIR = BASE_DIR.parent
+sys.path.append(str(BASE_DIR))
+sys.path.append(str(ROOT_DIR))
+
+from benchmark_startup import free_port, wait_for_200
+from Recommender.benchmark_retrieval import TOPICS, synthetic_corpus
+from Recommender.snapshot import write_snapshot
+
+QUERIES = [q for topic in TOPICS.values() for q in topic["queries"]]
+
+
+def worker_memory(master_pid):
+    """{pid: (rss_mb, pss_mb)} of the uvicorn worker processes (Linux /proc)."""
+    # With --workers 1 uvicorn serves from the master process itself
+    children = Path(f"/proc/{master_pid}/task/{master_pid}/children").read_text().split() or [master_pid]
+    usage = {}
+    for pid in children:
+        fields = {}
+        for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+            key, value = line.split(":", 1)
+            fields[key] = int(value.split()[0])  # kB
+        usage[int(pid)] = (round(fields["Rss"] / 1024, 1), round(fields["Pss"] / 1024, 1))
+    return usage
+
+
+async def load(url, requests, concurrency, mode="local"):
+    slots = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def one(client, i):
+        nonlocal failures
+        # mode=llm: a unique query each time, so every request really retrieves (no cache hits)
+        q = QUERIES[i % len(QUERIES)] if mode == "local" else f"{QUERIES[i % len(QUERIES)]} {i}"
+        async with slots:
+            response = await client.get(url, params={"q": q, "mode": mode})
+            failures += response.status_code != 200
+
+    start = time.perf_counter()
+    async with httpx.AsyncClient(timeout=120) as client:
+        await asyncio.gather(*(one(client, i) for i in range(requests)))
+    return requests / (time.perf_counter() - start), failures
+
+
+def run(workers, env, args):
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "Scraper.serving:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers)],
+        cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_200(f"http://127.0.0.1:{port}/", time.perf_counter(), 60)
+        url = f"http://127.0.0.1:{port}/recommend"
+        # Warm-up: enough requests that every worker has loaded the corpus and index
+        asyncio.run(load(url, workers * 20, workers * 4, args.mode))
+        rps, failures = asyncio.run(load(url, args.requests, args.concurrency, args.mode))
+        memory = worker_memory(proc.pid)
+    finally:
+        proc.terminate()
+        proc.wait()
+    return {
+        "workers": workers,
+        "requests_per_sec": round(rps, 1),
+        "failures": failures,
+        "rss_mb_total": round(sum(r for r, _ in memory.values()), 1),
+        "pss_mb_total": round(sum(p for _, p in memory.values()), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput and memory of N uvicorn workers, with and without the snapshot.")
+    parser.add_argument("--profiles", type=int, default=20_000, help="synthetic corpus size (0 = faculty_data.json)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mode", choices=["local", "llm"], default="local",
+                        help="local: BM25 ranking only; llm: hybrid retrieval + prompt, answered by a zero-latency stub LLM")
+    parser.add_argument("--output", type=Path, help="also write the results as JSON")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="faculty_workers_"))
+    env = dict(os.environ, PREWARM="0")
+    if args.profiles:
+        data_path = workdir / "faculty_data.json"
+        records, _ = synthetic_corpus(args.profiles)
+        data_path.write_text(json.dumps(records))
+        env["FACULTY_DATA_PATH"] = str(data_path)
+    else:
+        from Recommender.inference import DATA_PATH as data_path
+        with open(data_path, "r") as f:
+            records = json.load(f)
+    snapshot_path = write_snapshot(records, data_path, workdir / "faculty_snapshot.bin")
+    env["FACULTY_SNAPSHOT"] = str(snapshot_path)
+    print(f"{len(records)} profiles, snapshot {snapshot_path.stat().st_size / 2**20:.1f} MB, {os.cpu_count()} CPUs")
+
+    stub = None
+    if args.mode == "llm":
+        stub_port = free_port()
+        stub = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "Recommender.stub_llm:app", "--host", "127.0.0.1", "--port", str(stub_port)],
+            cwd=ROOT_DIR, env=dict(os.environ, LLM_STUB_LATENCY="0", LLM_STUB_CHUNK_DELAY="0"),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        env["LLM_STUB_URL"] = f"http://127.0.0.1:{stub_port}/generate"
+
+    results = []
+    try:
+        for use_snapshot in (False, True):
+            for workers in args.workers:
+                run_env = dict(env, FACULTY_SNAPSHOT_ENABLED="1" if use_snapshot else "0")
+                result = dict(snapshot=use_snapshot, mode=args.mode, **run(workers, run_env, args))
+                print(result)
+                results.append(result)
+    finally:
+        if stub is not None:
+            stub.terminate()
+            stub.wait()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"profiles": len(records), "cpus": os.cpu_count(), "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
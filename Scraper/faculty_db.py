@@ -1,35 +1,102 @@
 import sqlite3
+import csv
+import gzip
+import hashlib
+import json
 import logging
-import pandas as pd
+import re
+import threading
 import os
 from pathlib import Path
 
+try:
+    import brotli  # optional: adds a .br variant of the /faculty payload
+except ImportError:
+    brotli = None
+
 # --- DYNAMIC PATH SETUP ---
 # 1. Get the directory where THIS script is located (Scraper folder)
 BASE_DIR = Path(__file__).resolve().parent
 
-# 2. Define the subfolder for data
-DATA_DIR = BASE_DIR / "Scraped_data"
+# 2. Define the subfolder for data (override with SCRAPED_DATA_DIR, e.g. a mounted volume)
+DATA_DIR = Path(os.getenv("SCRAPED_DATA_DIR", BASE_DIR / "Scraped_data"))
 
-# 3. Create the folder if it doesn't exist
-DATA_DIR.mkdir(parents=True, exist_ok=True)
+# 3. The folder is created on first write (see ensure_data_dir), not at import
 
 # 4. Define Full Paths (Use these in your functions!)
 DB_PATH = DATA_DIR / "faculty.db"
 CSV_PATH = DATA_DIR / "final_faculty_data.csv"
 JSON_PATH = DATA_DIR / "final_faculty_data.json"
+NDJSON_PATH = DATA_DIR / "final_faculty_data.ndjson"
+PARQUET_PATH = DATA_DIR / "final_faculty_data.parquet"
+CHANGESET_PATH = DATA_DIR / "changeset.json"
+
+# Pre-serialized GET /faculty body (+ .gz/.br variants); the .etag file is written last
+PAYLOAD_PATH = DATA_DIR / "faculty_payload.json"
+PAYLOAD_ETAG_PATH = DATA_DIR / "faculty_payload.etag"
+PAYLOAD_ENCODINGS = {"gzip": ".gz", "br": ".br"}
+
+# Columns a client may ask for with GET /faculty?fields=...
+FACULTY_COLUMNS = ["id", "name", "designation", "email", "bio", "research",
+                   "publications", "teaching", "specialization", "profile_url"]
+
+# Rows fetched from SQLite (and buffered per Parquet row group) per export step
+EXPORT_CHUNK_ROWS = 1000
+
+# Full-text index: columns (in order) and their bm25() weights
+FTS_COLUMNS = ["name", "specialization", "research", "teaching", "bio", "publications"]
+FTS_WEIGHTS = [10.0, 5.0, 3.0, 2.0, 1.0, 1.0]
+
+# Connection tuning (per connection; WAL itself is persisted in the file)
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",        # readers never block the ingest writer
+    "synchronous": "NORMAL",      # safe with WAL, avoids an fsync per commit
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64000,         # negative = KiB, i.e. ~64 MB page cache
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
+BUSY_TIMEOUT = 30          # seconds a writer waits for the lock before failing
+STATEMENT_CACHE = 128      # compiled statements kept per connection
 
 # Logging setup
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 # --------------------------
 
+def ensure_data_dir():
+    """Creates the data folder (and parents) before anything is written there."""
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+
+# One long-lived connection per thread (sqlite3 connections are not
+# thread-safe). Reusing it keeps the statement cache warm, so the fixed SQL
+# strings below are compiled once and re-bound on every call.
+_local = threading.local()
+
 def get_db_connection():
-    """Helper to get a connection using the FULL PATH."""
-    # Use DB_PATH, not "faculty.db"
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """Returns this thread's pooled connection to DB_PATH, opening it on first use."""
+    pool = getattr(_local, "connections", None)
+    if pool is None:
+        pool = _local.connections = {}
+
+    # Keyed by path so tools that point DB_PATH elsewhere get their own connection
+    key = str(DB_PATH)
+    conn = pool.get(key)
+    if conn is None:
+        ensure_data_dir()
+        conn = sqlite3.connect(DB_PATH, timeout=BUSY_TIMEOUT, cached_statements=STATEMENT_CACHE)
+        conn.row_factory = sqlite3.Row
+        for pragma, value in SQLITE_PRAGMAS.items():
+            conn.execute(f"PRAGMA {pragma}={value}")
+        pool[key] = conn
     return conn
 
+def close_db_connection():
+    """Closes the calling thread's connections (e.g. at the end of a worker)."""
+    for conn in getattr(_local, "connections", {}).values():
+        conn.close()
+    _local.connections = {}
+
 def init_db():
     """Creates the table schema."""
     try:
@@ -49,66 +116,428 @@ def init_db():
                 profile_url TEXT UNIQUE
             )
         ''')
+        # Per-URL fingerprint for incremental re-ingestion:
+        # HTTP validators + hash of the cleaned profile
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS page_fingerprints (
+                profile_url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                listing_hash TEXT,
+                checked_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        # DBs from before listing hashes: NULL means "fetch unconditionally once"
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(page_fingerprints)")}
+        if "listing_hash" not in columns:
+            cursor.execute("ALTER TABLE page_fingerprints ADD COLUMN listing_hash TEXT")
+        # Sentences found repeated across profiles (transformation.find_boilerplate),
+        # kept so later incremental runs strip them too; last_seen drives expiry.
+        # Keys from before were 32-bit hashes, which cannot be mapped back to
+        # sentences: drop them, the next full run finds the boilerplate again
+        columns = {row["name"]: row["type"] for row in conn.execute("PRAGMA table_info(boilerplate_sentences)")}
+        if columns.get("sentence_key") == "INTEGER":
+            cursor.execute("DROP TABLE boilerplate_sentences")
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS boilerplate_sentences (
+                sentence_key TEXT PRIMARY KEY,
+                first_seen TEXT DEFAULT CURRENT_TIMESTAMP,
+                last_seen TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        init_fts(conn)
         conn.commit()
-        conn.close()
         logging.info(f"Storage Layer Initialized at: {DB_PATH}")
     except Exception as e:
         logging.error(f"Database Initialization Failed: {e}")
 
+def init_fts(conn):
+    """
+    Creates the FTS5 index over `faculty` (external content, so the text is
+    not stored twice) and the triggers that keep it in sync.
+    """
+    existed = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='faculty_fts'"
+    ).fetchone()
+    cols = ", ".join(FTS_COLUMNS)
+    new_cols = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    old_cols = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+
+    conn.executescript(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS faculty_fts USING fts5(
+            {cols},
+            content='faculty', content_rowid='id',
+            tokenize='porter unicode61', prefix='2 3'
+        );
+        CREATE TRIGGER IF NOT EXISTS faculty_fts_ai AFTER INSERT ON faculty BEGIN
+            INSERT INTO faculty_fts(rowid, {cols}) VALUES (new.id, {new_cols});
+        END;
+        CREATE TRIGGER IF NOT EXISTS faculty_fts_ad AFTER DELETE ON faculty BEGIN
+            INSERT INTO faculty_fts(faculty_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+        END;
+        CREATE TRIGGER IF NOT EXISTS faculty_fts_au AFTER UPDATE ON faculty BEGIN
+            INSERT INTO faculty_fts(faculty_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+            INSERT INTO faculty_fts(rowid, {cols}) VALUES (new.id, {new_cols});
+        END;
+    ''')
+    if not existed:
+        # Index rows that were stored before the FTS table existed
+        conn.execute("INSERT INTO faculty_fts(faculty_fts) VALUES ('rebuild')")
+
+UPSERT_PROFILE_SQL = '''
+    INSERT INTO faculty 
+    (name, designation, email, bio, research, publications, teaching, specialization, profile_url)
+    VALUES (:name, :designation, :email, :bio, :research, :publications, :teaching, :specialization, :url)
+    ON CONFLICT(profile_url) DO UPDATE SET
+        name=excluded.name,
+        designation=excluded.designation,
+        bio=excluded.bio,
+        research=excluded.research,
+        publications=excluded.publications,
+        teaching=excluded.teaching,
+        specialization=excluded.specialization,
+        email=excluded.email
+'''
+
+UPSERT_FINGERPRINT_SQL = '''
+    INSERT INTO page_fingerprints (profile_url, etag, last_modified, content_hash, listing_hash, checked_at)
+    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(profile_url) DO UPDATE SET
+        etag=excluded.etag,
+        last_modified=excluded.last_modified,
+        content_hash=excluded.content_hash,
+        listing_hash=excluded.listing_hash,
+        checked_at=excluded.checked_at
+'''
+
 def save_profile(data: dict):
-    """Upsert: Insert new or Update existing."""
+    """Upsert: Insert new or Update existing (errors propagate, like save_profiles_bulk)."""
+    conn = get_db_connection() # Uses DB_PATH internally
+    with conn:  # commits, or rolls back on error
+        conn.execute(UPSERT_PROFILE_SQL, data)
+
+def save_profiles_bulk(profiles, fingerprints=()):
+    """
+    Upserts a batch of profiles in a single transaction (one commit, one
+    fsync) instead of one per row, together with their page `fingerprints`
+    (see save_fingerprints_bulk). Either everything is written or nothing
+    is: errors propagate, so a failed write never leaves fingerprints that
+    claim the new content is already stored. Returns the number of profiles.
+    """
+    profiles = list(profiles)
+    fingerprint_rows = _fingerprint_params(fingerprints)
+    if not profiles and not fingerprint_rows:
+        return 0
+    conn = get_db_connection()
+    with conn:  # commits, or rolls back on error
+        conn.executemany(UPSERT_PROFILE_SQL, profiles)
+        conn.executemany(UPSERT_FINGERPRINT_SQL, fingerprint_rows)
+    return len(profiles)
+
+def profile_hash(data: dict) -> str:
+    """Stable hash of a cleaned profile, used to detect real content changes."""
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def get_fingerprints():
+    """Returns {profile_url: {etag, last_modified, content_hash, listing_hash, checked_at}}."""
+    conn = get_db_connection()
+    rows = conn.execute("SELECT * FROM page_fingerprints").fetchall()
+    return {row["profile_url"]: dict(row) for row in rows}
+
+def get_profiles():
+    """Every stored profile, shaped like transformation.clean_profile() output."""
+    conn = get_db_connection()
+    rows = conn.execute(
+        "SELECT name, designation, email, bio, research, publications, teaching, specialization, "
+        "profile_url AS url FROM faculty"
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+def get_profile_urls():
+    """Every stored profile URL, with or without a fingerprint."""
+    conn = get_db_connection()
+    return {row[0] for row in conn.execute("SELECT profile_url FROM faculty")}
+
+def save_fingerprint(url, content_hash, etag=None, last_modified=None, listing_hash=None):
+    """Records what we last saw at a URL."""
+    save_fingerprints_bulk([(url, content_hash, etag, last_modified, listing_hash)])
+
+def _fingerprint_params(rows):
+    return [(url, etag, last_modified, content_hash, listing_hash)
+            for url, content_hash, etag, last_modified, listing_hash in rows]
+
+def save_fingerprints_bulk(rows):
+    """Records many (url, content_hash, etag, last_modified, listing_hash) tuples in one transaction."""
+    conn = get_db_connection()
+    with conn:
+        conn.executemany(UPSERT_FINGERPRINT_SQL, _fingerprint_params(rows))
+
+def touch_fingerprints(urls):
+    """Marks URLs as re-checked (e.g. after a 304 Not Modified)."""
+    conn = get_db_connection()
+    with conn:
+        conn.executemany(
+            "UPDATE page_fingerprints SET checked_at = CURRENT_TIMESTAMP WHERE profile_url = ?",
+            [(u,) for u in urls]
+        )
+
+def get_boilerplate_keys():
+    """Returns the set of known boilerplate sentence keys (transformation.sentence_key strings)."""
+    conn = get_db_connection()
+    return {row[0] for row in conn.execute("SELECT sentence_key FROM boilerplate_sentences")}
+
+def save_boilerplate_keys(keys):
+    """Adds boilerplate sentence keys, or marks known ones as seen again."""
+    conn = get_db_connection()
+    with conn:
+        conn.executemany(
+            '''INSERT INTO boilerplate_sentences (sentence_key) VALUES (?)
+               ON CONFLICT(sentence_key) DO UPDATE SET last_seen = CURRENT_TIMESTAMP''',
+            [(k,) for k in keys]
+        )
+
+def delete_boilerplate_keys(keys):
+    """Forgets boilerplate keys, e.g. a sentence wrongly treated as site chrome."""
+    conn = get_db_connection()
+    with conn:
+        conn.executemany("DELETE FROM boilerplate_sentences WHERE sentence_key = ?", [(k,) for k in keys])
+
+def prune_boilerplate_keys(max_age_days):
+    """Forgets keys not seen for `max_age_days`. Returns how many were removed."""
+    conn = get_db_connection()
+    with conn:
+        cursor = conn.execute(
+            "DELETE FROM boilerplate_sentences WHERE COALESCE(last_seen, first_seen) < datetime('now', ?)",
+            (f"-{int(max_age_days)} days",)
+        )
+    return cursor.rowcount
+
+def delete_profiles(urls):
+    """Removes profiles (and their fingerprints) that vanished from the site."""
+    conn = get_db_connection()
+    params = [(u,) for u in urls]
+    with conn:
+        conn.executemany("DELETE FROM faculty WHERE profile_url = ?", params)
+        conn.executemany("DELETE FROM page_fingerprints WHERE profile_url = ?", params)
+
+def export_changeset(changeset: dict):
+    """
+    Writes the delta of the last ingest run: full rows for added/updated
+    profiles plus the removed URLs, so downstream steps can skip the rest.
+    """
     try:
-        conn = get_db_connection() # Uses DB_PATH internally
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO faculty 
-            (name, designation, email, bio, research, publications, teaching, specialization, profile_url)
-            VALUES (:name, :designation, :email, :bio, :research, :publications, :teaching, :specialization, :url)
-            ON CONFLICT(profile_url) DO UPDATE SET
-                bio=excluded.bio,
-                research=excluded.research,
-                publications=excluded.publications,
-                teaching=excluded.teaching,
-                specialization=excluded.specialization,
-                email=excluded.email
-        ''', data)
-        
-        conn.commit()
-        conn.close()
+        changed = changeset["added"] + changeset["updated"]
+        conn = get_db_connection()
+        rows = []
+        if changed:
+            placeholders = ",".join("?" * len(changed))
+            rows = conn.execute(
+                f"SELECT * FROM faculty WHERE profile_url IN ({placeholders})", changed
+            ).fetchall()
+
+        payload = dict(changeset, records=[dict(r) for r in rows])
+        ensure_data_dir()
+        with open(CHANGESET_PATH, "w") as f:
+            json.dump(payload, f, indent=2)
+        logging.info(f"Changeset exported to: {CHANGESET_PATH}")
     except Exception as e:
-        logging.error(f"Storage Error: {e}")
+        logging.error(f"Changeset export failed: {e}")
 
-def export_to_files():
-    """Exports DB data to CSV and JSON in the Scraped_data folder."""
+def _parquet_writer(path, conn):
+    """A ParquetWriter for the faculty table, or None if pyarrow is unavailable."""
     try:
-        conn = get_db_connection() # Uses DB_PATH
-        df = pd.read_sql_query("SELECT * FROM faculty", conn)
-        conn.close()
-        
-        # Save to files using the FULL PATHS
-        df.to_csv(CSV_PATH, index=False)
-        df.to_json(JSON_PATH, orient="records", indent=4)
-        logging.info(f"Data exported to:\n - {CSV_PATH}\n - {JSON_PATH}")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        logging.info(f"Parquet export skipped (pyarrow unavailable: {e})")
+        return None
+    columns = conn.execute("PRAGMA table_info(faculty)").fetchall()
+    schema = pa.schema([
+        (col[1], pa.int64() if col[2].upper() == "INTEGER" else pa.string()) for col in columns
+    ])
+    return pq.ParquetWriter(str(path), schema, compression="zstd")
+
+def _parquet_chunk(rows, columns, schema):
+    """One chunk of rows as a pyarrow Table (column-major, no per-row dicts)."""
+    import pyarrow as pa
+
+    return pa.Table.from_arrays([pa.array(values, type=schema.field(name).type)
+                                 for name, values in zip(columns, zip(*rows))], schema=schema)
+
+def export_to_files(chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Streams the faculty table to CSV, JSON, NDJSON and (if pyarrow is
+    installed) Parquet in one pass over the cursor, `chunk_rows` rows at a
+    time, so memory stays bounded by one chunk whatever the table size.
+    Every file is written to a .tmp sibling and renamed into place only
+    after all of them are complete.
+    """
+    ensure_data_dir()
+    targets = [CSV_PATH, JSON_PATH, NDJSON_PATH]
+    tmp = {path: path.with_name(path.name + ".tmp") for path in targets + [PARQUET_PATH]}
+    conn = get_db_connection()
+    parquet = None
+    try:
+        cursor = conn.execute("SELECT * FROM faculty")
+        columns = [d[0] for d in cursor.description]
+        with open(tmp[CSV_PATH], "w", newline="", encoding="utf-8") as csv_file, \
+                open(tmp[JSON_PATH], "w", encoding="utf-8") as json_file, \
+                open(tmp[NDJSON_PATH], "w", encoding="utf-8") as ndjson_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(columns)
+            parquet = _parquet_writer(tmp[PARQUET_PATH], conn)
+            json_file.write("[")
+            count = 0
+            while True:
+                chunk = cursor.fetchmany(chunk_rows)
+                if not chunk:
+                    break
+                writer.writerows(chunk)
+                lines = [json.dumps(dict(zip(columns, row)), ensure_ascii=False) for row in chunk]
+                ndjson_file.write("\n".join(lines) + "\n")
+                json_file.write(("," if count else "") + "\n" + ",\n".join(lines))
+                if parquet is not None:
+                    parquet.write_table(_parquet_chunk(chunk, columns, parquet.schema))
+                count += len(chunk)
+            json_file.write("\n]\n")
+        if parquet is not None:
+            parquet.close()
+            parquet = None
+            targets.append(PARQUET_PATH)
+
+        for path in targets:
+            os.replace(tmp[path], path)
+        logging.info(f"Data exported ({count} rows):\n" + "\n".join(f" - {path}" for path in targets))
     except Exception as e:
         logging.error(f"Export failed: {e}")
+    finally:
+        if parquet is not None:
+            parquet.close()
+        for path in tmp.values():
+            path.unlink(missing_ok=True)
+
+def _write_atomic(path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+def export_faculty_payload():
+    """
+    Serializes the full faculty list once, compresses it (gzip, plus brotli
+    if installed) and stores it with a strong ETag, so GET /faculty never has
+    to query or re-encode per request. Returns the ETag.
+    """
+    rows = [dict(r) for r in get_all_faculty()]
+    body = json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    etag = hashlib.sha256(body).hexdigest()[:32]
+
+    variants = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=11)
+
+    _write_atomic(PAYLOAD_PATH, body)
+    for encoding, suffix in PAYLOAD_ENCODINGS.items():
+        variant = PAYLOAD_PATH.with_name(PAYLOAD_PATH.name + suffix)
+        if encoding in variants:
+            _write_atomic(variant, variants[encoding])
+        else:
+            # Left over from an export that could still encode it: it would be stale
+            variant.unlink(missing_ok=True)
+    # Last, so a reader that sees the new tag also sees the new bodies
+    _write_atomic(PAYLOAD_ETAG_PATH, etag.encode("ascii"))
+    logging.info(f"Faculty payload exported: {len(rows)} rows, {len(body)} bytes, etag {etag}")
+    return etag
+
+def load_faculty_payload():
+    """Returns {"etag", "identity", "gzip"[, "br"]} from the last export, or None."""
+    for _ in range(3):
+        try:
+            etag = PAYLOAD_ETAG_PATH.read_text().strip()
+            payload = {"etag": etag, "identity": PAYLOAD_PATH.read_bytes()}
+            for encoding, suffix in PAYLOAD_ENCODINGS.items():
+                variant = PAYLOAD_PATH.with_name(PAYLOAD_PATH.name + suffix)
+                if variant.exists():
+                    payload[encoding] = variant.read_bytes()
+        except FileNotFoundError:
+            return None
+        # An export finished while we were reading: read again
+        if PAYLOAD_ETAG_PATH.read_text().strip() == etag:
+            return payload
+    return payload
+
+def get_faculty_page(limit=50, cursor=0, fields=None):
+    """
+    Keyset pagination: up to `limit` rows with id > `cursor`, in id order,
+    projected onto `fields` (always including id, which is the next cursor).
+    """
+    fields = fields or FACULTY_COLUMNS
+    unknown = set(fields) - set(FACULTY_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    columns = ["id"] + [f for f in fields if f != "id"]
+    conn = get_db_connection()
+    rows = conn.execute(
+        f"SELECT {', '.join(columns)} FROM faculty WHERE id > ? ORDER BY id LIMIT ?",
+        (cursor, limit)
+    ).fetchall()
+    return [dict(r) for r in rows]
 
 def get_all_faculty():
     """Retrieves all faculty records."""
     conn = get_db_connection() # Uses DB_PATH
     rows = conn.execute("SELECT * FROM faculty").fetchall()
-    conn.close()
     return rows
 
-def search_faculty(query: str):
-    """Simple SQL-based search."""
+def build_fts_query(query: str):
+    """
+    Turns free text into an FTS5 MATCH expression: every word must match,
+    as a prefix ("neur netw" finds "neural networks"). Quoting each term
+    keeps user punctuation from being parsed as FTS syntax.
+    """
+    # Single letters (e.g. the "s" in "Jane's") would match almost everything
+    terms = [t for t in re.findall(r"\w+", query.lower()) if len(t) > 1]
+    return " ".join(f'"{t}"*' for t in terms)
+
+def search_faculty(query: str, limit: int = 20):
+    """
+    Full-text search ranked by bm25() (name > specialization > research >
+    teaching > bio/publications), with a highlighted snippet per hit.
+    Falls back to the LIKE scan if the FTS index is unavailable.
+    """
+    match = build_fts_query(query)
+    if not match:
+        return []
+
+    weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+    conn = get_db_connection() # Uses DB_PATH
+    try:
+        rows = conn.execute(f"""
+            SELECT f.*,
+                   bm25(faculty_fts, {weights}) AS score,
+                   snippet(faculty_fts, -1, '<mark>', '</mark>', '…', 12) AS snippet
+            FROM faculty_fts
+            JOIN faculty f ON f.id = faculty_fts.rowid
+            WHERE faculty_fts MATCH ?
+            ORDER BY score
+            LIMIT ?
+        """, (match, limit)).fetchall()
+    except sqlite3.OperationalError as e:
+        logging.warning(f"FTS search unavailable ({e}); falling back to LIKE")
+        rows = search_faculty_like(query)[:limit]
+    return rows
+
+def search_faculty_like(query: str):
+    """Simple SQL-based search (full table scan, unranked)."""
     conn = get_db_connection() # Uses DB_PATH
     wildcard = f"%{query}%"
     rows = conn.execute("""
         SELECT * FROM faculty 
         WHERE name LIKE ? OR bio LIKE ? OR research LIKE ?
     """, (wildcard, wildcard, wildcard)).fetchall()
-    conn.close()
     return rows
 
 if __name__ == "__main__":
@@ -0,0 +1,502 @@
+import logging
+import queue
+import random
+import threading
+import time
+from bisect import bisect_left
+from html.parser import HTMLParser
+from urllib.parse import urlparse
+
+import requests
+
+# --- FETCH SETTINGS ---
+REQUEST_TIMEOUT = 15          # seconds per HTTP request
+MAX_RETRIES = 3               # extra attempts after the first failure
+BACKOFF_BASE = 0.5            # seconds; doubles on every retry (+ jitter)
+MIN_HOST_INTERVAL = 0.25      # seconds between two requests to the same host
+USER_AGENT = "Mozilla/5.0 (compatible; DAIICT-Faculty-Recommender/1.0)"
+
+# Same selectors the Selenium path uses (Drupal profile pages)
+FIELD_SELECTORS = {
+    "bio": [".field--name-field-biography", ".about"],
+    "research": [".work-exp1", ".field--name-field-research-interests"],
+    "teaching": [".field--name-field-courses-taught", ".field--name-field-teaching"],
+    "specialization": [".field--name-field-area-of-specialization"],
+}
+PUBLICATION_SELECTOR = ".education.overflowContent ul.bulletText li"
+# Keywords smart_extract looks for when a field's selectors match nothing
+FIELD_KEYWORDS = {
+    "bio": ["biography", "about"],
+    "research": ["research", "interest"],
+    "teaching": ["teaching", "courses"],
+    "publications": ["publication"],
+    "specialization": ["specialization"],
+}
+# Elements smart_extract checks for a keyword (its XPath's self:: axes)
+KEYWORD_TAGS = {"h2", "h3", "div", "strong", "span", "p"}
+
+# Elements whose text a browser never renders
+SKIP_TAGS = {"script", "style", "noscript", "template"}
+# Everything else is treated as a block and separated by a line break, like
+# Selenium's rendered .text
+INLINE_TAGS = {"a", "abbr", "b", "code", "em", "font", "i", "small", "span",
+               "strong", "sub", "sup", "u"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input",
+             "link", "meta", "param", "source", "track", "wbr"}
+
+# Tags whose end tag is optional: a new sibling implicitly closes the open one
+AUTO_CLOSE_TAGS = {"li", "p", "dt", "dd", "tr", "td", "th", "option"}
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    """Raised when a page could not be fetched after all retries."""
+
+
+# --- CSS SELECTOR MATCHING (tag.class descendant chains only) ---
+
+def parse_selector(selector):
+    """'.a.b ul.c li' -> [(None, {'a','b'}), ('ul', {'c'}), ('li', set())]"""
+    compounds = []
+    for part in selector.split():
+        tag, *classes = part.split(".")
+        compounds.append((tag or None, set(classes)))
+    return compounds
+
+
+def _matches(compound, tag, classes):
+    want_tag, want_classes = compound
+    return (want_tag is None or want_tag == tag) and want_classes <= classes
+
+
+def selector_matches(compounds, tag, classes, ancestors):
+    """True if the element (with its open ancestors, outermost first) matches."""
+    if not _matches(compounds[-1], tag, classes):
+        return False
+    remaining = len(compounds) - 2
+    for anc_tag, anc_classes in reversed(ancestors):
+        if remaining < 0:
+            break
+        if _matches(compounds[remaining], anc_tag, anc_classes):
+            remaining -= 1
+    return remaining < 0
+
+
+class ProfilePageParser(HTMLParser):
+    """
+    Single pass over a profile page that collects the text of the first
+    element matching each field selector, plus every publication <li>.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.field_selectors = {
+            field: [parse_selector(s) for s in selectors]
+            for field, selectors in FIELD_SELECTORS.items()
+        }
+        self.publication_selector = parse_selector(PUBLICATION_SELECTOR)
+        self.stack = []          # [(tag, classes)] of open elements
+        self.captures = []       # [(depth, key, [text parts])] currently recording
+        self.fields = {}         # field -> text ("" while still recording)
+        self.publications = []
+        self.skip_depth = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self.handle_data("\n")
+            return
+        if tag in AUTO_CLOSE_TAGS and self.stack and self.stack[-1][0] == tag:
+            self.handle_endtag(tag)
+        if tag not in INLINE_TAGS:
+            self.handle_data("\n")
+        classes = set((dict(attrs).get("class") or "").split())
+        depth = len(self.stack)
+        if tag in SKIP_TAGS and self.skip_depth is None:
+            self.skip_depth = depth
+
+        for field, selectors in self.field_selectors.items():
+            # Like Selenium's find_elements(".a, .b")[0]: first hit in document order
+            if field in self.fields:
+                continue
+            if any(selector_matches(c, tag, classes, self.stack) for c in selectors):
+                self.fields[field] = ""
+                self.captures.append((depth, field, []))
+
+        if selector_matches(self.publication_selector, tag, classes, self.stack):
+            self.captures.append((depth, "publication", []))
+
+        self.stack.append((tag, classes))
+
+    def handle_endtag(self, tag):
+        # Pop to the matching open tag (tolerates unclosed <p>/<li>)
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                break
+        else:
+            return
+        if tag not in INLINE_TAGS:
+            self.handle_data("\n")
+        while len(self.stack) > i:
+            self.stack.pop()
+            depth = len(self.stack)
+            if self.skip_depth is not None and depth <= self.skip_depth:
+                self.skip_depth = None
+            while self.captures and self.captures[-1][0] >= depth:
+                _, key, parts = self.captures.pop()
+                text = " ".join("".join(parts).split())
+                if key == "publication":
+                    self.publications.append(text)
+                else:
+                    self.fields[key] = text
+
+    def handle_data(self, data):
+        if self.skip_depth is not None:
+            return
+        for _, _, parts in self.captures:
+            parts.append(data)
+
+    def result(self):
+        self.close()
+        # Unclosed captures at EOF still count
+        while self.captures:
+            _, key, parts = self.captures.pop()
+            text = " ".join("".join(parts).split())
+            if key == "publication":
+                self.publications.append(text)
+            else:
+                self.fields[key] = text
+        data = {field: (self.fields.get(field) or "") for field in FIELD_SELECTORS}
+        data["publications"] = [p for p in self.publications if p]
+        return data
+
+
+def extract_profile_fields(html):
+    """Returns {'bio','research','teaching','specialization','publications'} from raw HTML."""
+    parser = ProfilePageParser()
+    parser.feed(html)
+    return parser.result()
+
+
+# --- KEYWORD FALLBACK (smart_extract without a browser) ---
+
+class PageNode:
+    __slots__ = ("tag", "parent", "children")
+
+    def __init__(self, tag, parent):
+        self.tag = tag
+        self.parent = parent
+        self.children = []   # PageNodes and text strings, in document order
+
+    def own_text(self):
+        """The first text child, like XPath's text() inside contains()."""
+        return next((c for c in self.children if isinstance(c, str)), "")
+
+    def text(self):
+        """Rendered text with whitespace collapsed (blocks separated by a space)."""
+        parts = []
+        self._collect(parts)
+        return " ".join("".join(parts).split())
+
+    def _collect(self, parts):
+        for child in self.children:
+            if isinstance(child, str):
+                parts.append(child)
+            elif child.tag not in SKIP_TAGS:
+                block = child.tag not in INLINE_TAGS
+                if block:
+                    parts.append(" ")
+                child._collect(parts)
+                if block:
+                    parts.append(" ")
+
+    def next_sibling(self, tag):
+        siblings = self.parent.children
+        for child in siblings[siblings.index(self) + 1:]:
+            if isinstance(child, PageNode) and child.tag == tag:
+                return child
+        return None
+
+
+class PageTree(HTMLParser):
+    """Minimal element tree of a page, built only when a field needs the keyword fallback."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = PageNode(None, None)
+        self.node = self.root
+        self.elements = []   # every element, in document order
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self.node.children.append("\n")
+            return
+        if tag in AUTO_CLOSE_TAGS and self.node.tag == tag:
+            self.handle_endtag(tag)
+        node = PageNode(tag, self.node)
+        self.node.children.append(node)
+        self.elements.append(node)
+        self.node = node
+
+    def handle_endtag(self, tag):
+        node = self.node
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.node = node.parent
+
+    def handle_data(self, data):
+        self.node.children.append(data)
+
+
+def keyword_extract(tree, keywords):
+    """
+    Same search as ingestion.smart_extract: the first h2/h3/div/strong/span/p
+    whose own text contains a keyword, then its next <div> sibling's text,
+    else its parent's text if that is neither tiny nor the whole page.
+    """
+    for key in keywords:
+        for element in tree.elements:
+            if element.tag not in KEYWORD_TAGS or key not in element.own_text().lower():
+                continue
+            sibling = element.next_sibling("div")
+            if sibling is not None:
+                text = sibling.text()
+                if len(text) > 5:
+                    return text
+            if element.parent is not tree.root:
+                text = element.parent.text()
+                if 20 < len(text) < 1000:
+                    return text
+    return ""
+
+
+def fill_missing_fields(fields, html):
+    """Runs the keyword fallback for every field whose selectors matched nothing (in place)."""
+    missing = [field for field in FIELD_KEYWORDS if not fields[field]]
+    if not missing:
+        return fields
+    tree = PageTree()
+    tree.feed(html)
+    tree.close()
+    for field in missing:
+        text = keyword_extract(tree, FIELD_KEYWORDS[field])
+        if field == "publications":
+            fields[field] = [text] if text else []
+        else:
+            fields[field] = text
+    return fields
+
+
+# --- POLITENESS & RESILIENCE ---
+
+class HostRateLimiter:
+    """Spaces out requests to the same host by at least `min_interval` seconds."""
+
+    def __init__(self, min_interval=MIN_HOST_INTERVAL):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def with_retries(action, url, retries=MAX_RETRIES, backoff=BACKOFF_BASE):
+    """Calls action() with exponential backoff; re-raises the last error as FetchError."""
+    for attempt in range(retries + 1):
+        try:
+            return action()
+        except Exception as e:
+            if attempt == retries:
+                raise FetchError(f"{url}: {e}") from e
+            delay = backoff * (2 ** attempt) * (1 + random.random() * 0.25)
+            logging.warning(f"   Retry {attempt + 1}/{retries} for {url} in {delay:.1f}s ({e})")
+            time.sleep(delay)
+
+
+def http_get(session, url, limiter, headers=None):
+    """GET with per-host rate limiting and retries on network errors / 429 / 5xx."""
+    def attempt():
+        limiter.wait(url)
+        start = time.perf_counter()
+        response = session.get(url, timeout=REQUEST_TIMEOUT, headers=headers)
+        # Network time only, excluding rate-limit waits and backoff
+        response.fetch_seconds = time.perf_counter() - start
+        if response.status_code in RETRYABLE_STATUS:
+            raise FetchError(f"HTTP {response.status_code}")
+        return response
+
+    return with_retries(attempt, url)
+
+
+class TimingHistogram:
+    """Thread-safe per-page latency histogram (milliseconds)."""
+
+    BUCKETS_MS = [100, 250, 500, 1000, 2000, 5000, float("inf")]
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = []
+
+    def observe(self, seconds):
+        with self._lock:
+            self.samples.append(seconds * 1000)
+
+    def percentile(self, p):
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] if ordered else 0.0
+
+    def counts(self):
+        counts = [0] * len(self.BUCKETS_MS)
+        for ms in self.samples:
+            counts[bisect_left(self.BUCKETS_MS, ms)] += 1
+        return counts
+
+    def report(self):
+        lines = [f"Page timings ({len(self.samples)} pages): "
+                 f"p50 {self.percentile(50):.0f} ms, p95 {self.percentile(95):.0f} ms, "
+                 f"max {max(self.samples, default=0):.0f} ms"]
+        lower = 0
+        for upper, count in zip(self.BUCKETS_MS, self.counts()):
+            label = f"{lower:>5}-{upper:<5}" if upper != float("inf") else f"{lower:>5}+     "
+            lines.append(f"   {label} ms | {'#' * min(count, 60)} {count}")
+            lower = upper
+        return "\n".join(lines)
+
+
+# --- WORKER POOL ---
+
+def run_workers(items, handle, workers, make_state=None, close_state=None):
+    """
+    Feeds `items` through a queue to `workers` threads.
+    handle(state, item) returns a result (or None); make_state() builds
+    per-worker resources (e.g. an HTTP session or a browser) and
+    close_state(state) releases them. Returns results in completion order.
+    """
+    tasks = queue.Queue()
+    for item in items:
+        tasks.put(item)
+    results = []
+    results_lock = threading.Lock()
+
+    def worker():
+        state = make_state() if make_state else None
+        try:
+            while True:
+                try:
+                    item = tasks.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    result = handle(state, item)
+                    if result is not None:
+                        with results_lock:
+                            results.append(result)
+                except Exception as e:
+                    logging.warning(f"Worker error on {item}: {e}")
+                finally:
+                    tasks.task_done()
+        finally:
+            if close_state and state is not None:
+                close_state(state)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, workers))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def new_session():
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+# Returned instead of fields when the server answers 304 Not Modified
+NOT_MODIFIED = "not-modified"
+
+
+def conditional_headers(fingerprint):
+    """If-None-Match / If-Modified-Since from a stored page fingerprint."""
+    headers = {}
+    if fingerprint:
+        if fingerprint.get("etag"):
+            headers["If-None-Match"] = fingerprint["etag"]
+        if fingerprint.get("last_modified"):
+            headers["If-Modified-Since"] = fingerprint["last_modified"]
+    return headers
+
+
+def fetch_profile_http(session, person, limiter, histogram, fingerprint=None):
+    """
+    Fetches and parses one profile page; fields whose selectors matched
+    nothing are filled by keyword (fill_missing_fields).
+    Returns NOT_MODIFIED on a 304, None if no known selector matched, else
+    (fields, validators) where validators holds the response's ETag/Last-Modified.
+    """
+    response = http_get(session, person["url"], limiter, headers=conditional_headers(fingerprint))
+    if response.status_code == 304:
+        histogram.observe(response.fetch_seconds)
+        return NOT_MODIFIED
+    response.raise_for_status()
+    start = time.perf_counter()
+    fields = extract_profile_fields(response.text)
+    if not any(fields.values()):
+        # Not a standard Drupal profile page: needs the browser + smart_extract
+        histogram.observe(response.fetch_seconds + time.perf_counter() - start)
+        return None
+    # Partly matched: recover the other fields by keyword, as the browser path does
+    fill_missing_fields(fields, response.text)
+    histogram.observe(response.fetch_seconds + time.perf_counter() - start)
+
+    validators = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    return fields, validators
+
+
+def deep_scrape_http(profiles, workers=8, limiter=None, histogram=None, fingerprints=None):
+    """
+    Deep-scrapes profile pages over plain HTTP with a worker pool.
+    `fingerprints` ({url: {"etag", "last_modified", ...}}) turns requests into
+    conditional GETs. Returns (results, misses, unchanged):
+      results   [(person, fields, validators)] for pages that were parsed
+      misses    profiles whose pages need the Selenium fallback
+      unchanged profiles the server reported as 304 Not Modified
+    """
+    limiter = limiter or HostRateLimiter()
+    histogram = histogram or TimingHistogram()
+    fingerprints = fingerprints or {}
+    misses, unchanged = [], []
+    lists_lock = threading.Lock()
+
+    def handle(session, person):
+        try:
+            outcome = fetch_profile_http(session, person, limiter, histogram,
+                                         fingerprints.get(person["url"]))
+        except Exception as e:
+            logging.warning(f"HTTP fetch failed for {person['name']}: {e}")
+            outcome = None
+        if outcome is None or outcome == NOT_MODIFIED:
+            with lists_lock:
+                (misses if outcome is None else unchanged).append(person)
+            return None
+        logging.info(f"   [http] {person['name']}")
+        fields, validators = outcome
+        return person, fields, validators
+
+    results = run_workers(profiles, handle, workers,
+                          make_state=new_session, close_state=lambda s: s.close())
+    return results, misses, unchanged
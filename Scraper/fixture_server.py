@@ -0,0 +1,114 @@
+import argparse
+import html
+import json
+import logging
+import re
+import sys
+import tempfile
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# --- ROBUST IMPORT SETUP ---
+BASE_DIR = Path(__file__).resolve().parent
+sys.path.append(str(BASE_DIR))
+
+import fetcher
+
+# Saved profile pages (e.g. "curl -o fixtures/jane-doe.html <profile url>")
+FIXTURE_DIR = BASE_DIR / "fixtures"
+SAMPLE_DATA = BASE_DIR.parent / "faculty_data.json"
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><title>{name} | DA-IICT</title><script>var menu = "Research Overview";</script></head>
+<body>
+<nav><span>Research</span><span>Teaching</span></nav>
+<div class="field--name-field-area-of-specialization">{specialization}</div>
+<div class="about"><p>{bio}</p></div>
+<div class="field--name-field-research-interests"><p>{research}</p></div>
+<div class="field--name-field-courses-taught">{teaching}</div>
+<div class="education overflowContent"><ul class="bulletText">{publications}</ul></div>
+</body></html>
+"""
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def write_synthetic_pages(directory, count):
+    """Renders `count` Drupal-style profile pages from faculty_data.json."""
+    with open(SAMPLE_DATA, "r") as f:
+        data = json.load(f)
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        p = data[i % len(data)]
+        text = html.escape(p.get("research", ""))
+        spec = re.search(r"Specialization: (.*?)\. Research Interests:", p.get("research", ""))
+        page = PAGE_TEMPLATE.format(
+            name=html.escape(p["name"]),
+            specialization=html.escape(spec.group(1)) if spec else "",
+            bio=text,
+            research=text,
+            teaching="Course A<br>Course B",
+            publications="".join(f"<li>Publication {j} of {html.escape(p['name'])}</li>" for j in range(3)),
+        )
+        (directory / f"profile-{i}.html").write_text(page)
+
+
+def serve(directory, port=0):
+    """Starts a background HTTP server for `directory`; returns (server, base_url)."""
+    handler = partial(QuietHandler, directory=str(directory))
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve saved profile pages for offline scraping.")
+    parser.add_argument("--dir", type=Path, default=FIXTURE_DIR)
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--synthetic", type=int, default=0, help="generate N pages into a temp dir instead")
+    parser.add_argument("--scrape", action="store_true", help="run the HTTP deep scrape against the server and exit")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--min-interval", type=float, default=0.0, help="per-host rate limit (seconds)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    directory = args.dir
+    if args.synthetic:
+        directory = Path(tempfile.mkdtemp(prefix="faculty_fixtures_"))
+        write_synthetic_pages(directory, args.synthetic)
+
+    pages = sorted(p.name for p in directory.glob("*.html"))
+    server, base_url = serve(directory, 0 if args.scrape else args.port)
+    print(f"Serving {len(pages)} pages from {directory} at {base_url}")
+
+    if not args.scrape:
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+        return
+
+    profiles = [{"name": name, "url": f"{base_url}/{name}"} for name in pages]
+    fingerprints = {}
+    # Second pass sends the validators from the first: expect 304s
+    for label in ("cold", "conditional"):
+        histogram = fetcher.TimingHistogram()
+        results, misses, unchanged = fetcher.deep_scrape_http(
+            profiles, workers=args.workers,
+            limiter=fetcher.HostRateLimiter(args.min_interval),
+            histogram=histogram,
+            fingerprints=fingerprints,
+        )
+        print(f"[{label}] parsed {len(results)} pages, {len(unchanged)} not modified, "
+              f"{len(misses)} need the browser fallback")
+        print(histogram.report())
+        fingerprints = {person["url"]: validators for person, _, validators in results}
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
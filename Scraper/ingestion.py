@@ -1,3 +1,4 @@
+import argparse
 import logging
 import time
 import sys
@@ -20,10 +21,21 @@ sys.path.append(str(BASE_DIR))
 # --- IMPORTS ---
 import transformation 
 import faculty_db as storage
+import fetcher
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
+# Explicit wait for a profile page to finish loading (replaces a fixed sleep)
+PAGE_LOAD_TIMEOUT = 10
+
+# Marks results scraped with Selenium (raw page text, not parser-collapsed)
+BROWSER_SOURCE = "browser"
+
+# Fields that come from the listing cards, not the profile page: a 304 from
+# the page says nothing about them, so they are fingerprinted separately
+LISTING_FIELDS = ["name", "email", "designation", "specialization"]
+
 def get_driver():
     """
     Launches a Chrome Browser.
@@ -93,7 +105,248 @@ def smart_extract(driver, keywords):
             continue
     return ""
 
-def run_pipeline():
+def wait_for_page(driver, url):
+    """Loads a page and waits until the document is ready (no fixed sleep)."""
+    driver.get(url)
+    WebDriverWait(driver, PAGE_LOAD_TIMEOUT).until(
+        lambda d: d.execute_script("return document.readyState") == "complete"
+    )
+
+def scrape_profile_selenium(driver, person):
+    """Extracts the raw profile fields from a page with a live browser."""
+    fetcher.with_retries(lambda: wait_for_page(driver, person['url']), person['url'])
+
+    # 1. BIOGRAPHY
+    bio_els = driver.find_elements(By.CSS_SELECTOR, ".field--name-field-biography, .about")
+    if bio_els: raw_bio = bio_els[0].text
+    else: raw_bio = smart_extract(driver, fetcher.FIELD_KEYWORDS["bio"])
+
+    # 2. RESEARCH
+    res_els = driver.find_elements(By.CSS_SELECTOR, ".work-exp1, .field--name-field-research-interests")
+    if res_els: raw_research = res_els[0].text
+    else: raw_research = smart_extract(driver, fetcher.FIELD_KEYWORDS["research"])
+
+    # 3. TEACHING
+    teach_els = driver.find_elements(By.CSS_SELECTOR, ".field--name-field-courses-taught, .field--name-field-teaching")
+    if teach_els: raw_teach = teach_els[0].text
+    else: raw_teach = smart_extract(driver, fetcher.FIELD_KEYWORDS["teaching"])
+
+    # 4. PUBLICATIONS
+    pub_els = driver.find_elements(By.CSS_SELECTOR, ".education.overflowContent ul.bulletText li")
+    if pub_els: raw_pubs = [li.text for li in pub_els]
+    else: 
+        raw_pubs_text = smart_extract(driver, fetcher.FIELD_KEYWORDS["publications"])
+        raw_pubs = [raw_pubs_text] if raw_pubs_text else []
+
+    # 5. SPECIALIZATION (from the profile page; merged in merge_profile)
+    spec_els = driver.find_elements(By.CSS_SELECTOR, ".field--name-field-area-of-specialization")
+    if spec_els: deep_spec = spec_els[0].text
+    else: deep_spec = smart_extract(driver, fetcher.FIELD_KEYWORDS["specialization"])
+
+    return {
+        "bio": raw_bio,
+        "research": raw_research,
+        "teaching": raw_teach,
+        "publications": raw_pubs,
+        "specialization": deep_spec,
+    }
+
+def merge_profile(person, fields):
+    """Combines listing data with deep-scraped fields (cleaned later, per batch)."""
+    raw_research = fields["research"]
+    # Filter bad research grabs (like menu tabs)
+    if "Research Overview" in raw_research and len(raw_research) < 50:
+        raw_research = ""
+
+    # SPECIALIZATION (Merge Strategy)
+    # Start with what we found on the Listing Page;
+    # only overwrite if deep data is better/longer
+    final_spec = person.get("specialization", "") or ""
+    deep_spec = fields.get("specialization") or ""
+    if len(deep_spec) > len(final_spec):
+        final_spec = deep_spec
+
+    person = dict(person)
+    person.update({
+        "bio": fields["bio"],
+        "research": raw_research,
+        "publications": fields["publications"],
+        "teaching": fields["teaching"],
+        "specialization": final_spec
+    })
+    return person
+
+def listing_hash(person):
+    """Hash of a profile's listing-card fields."""
+    return storage.profile_hash({field: person.get(field) for field in LISTING_FIELDS})
+
+def conditional_fingerprints(profiles, fingerprints):
+    """
+    The fingerprints that may be sent as conditional GETs: only for profiles
+    whose listing card is unchanged. Pages behind a changed card are fetched
+    in full, so the new name/email/... is merged and stored.
+    """
+    current = {p["url"]: listing_hash(p) for p in profiles}
+    return {
+        url: fp for url, fp in fingerprints.items()
+        if fp.get("listing_hash") is not None and fp["listing_hash"] == current.get(url)
+    }
+
+def clean_merged(merged):
+    """
+    Cleans [(merged profile, validators, card hash)] in order. Text from the
+    HTTP parser is already collapsed, where the batch clean_profiles is ~1.7x
+    faster; raw browser text is not (~0.9x), so those rows use clean_profile.
+    A row that cannot be cleaned is logged and skipped, never the whole batch.
+    """
+    cleaned = [None] * len(merged)
+    batch = [i for i, (_, validators, _) in enumerate(merged) if validators.get("source") != BROWSER_SOURCE]
+    try:
+        for i, profile in zip(batch, transformation.clean_profiles([merged[i][0] for i in batch])):
+            cleaned[i] = profile
+    except Exception as e:
+        logging.warning(f"Batch cleaning failed ({e}); cleaning row by row")
+
+    rows = []
+    for (person, validators, card_hash), profile in zip(merged, cleaned):
+        if profile is None:
+            try:
+                profile = transformation.clean_profile(person)
+            except Exception as e:
+                logging.warning(f"Error on {person.get('name')}: {e}")
+                continue
+        rows.append((profile, validators, card_hash))
+    return rows
+
+def deep_scrape_selenium(profiles, workers, histogram):
+    """Deep-scrapes with a pool of browsers, one per worker thread."""
+    def handle(driver, person):
+        start = time.perf_counter()
+        fields = scrape_profile_selenium(driver, person)
+        histogram.observe(time.perf_counter() - start)
+        logging.info(f"   [browser] {person['name']}")
+        return person, fields, {"source": BROWSER_SOURCE}
+
+    return fetcher.run_workers(profiles, handle, workers,
+                               make_state=get_driver, close_state=lambda d: d.quit())
+
+def deep_scrape(profiles, engine="http", workers=4, fingerprints=None):
+    """
+    PHASE B: visits every profile page concurrently.
+    engine="http":     plain HTTP + HTML parser (conditional GETs against
+                       `fingerprints`), with the browser only for pages the
+                       static selectors can't read.
+    engine="selenium": a pool of `workers` browsers for every page.
+    Returns (results, unchanged): [(person, raw_fields, validators)] and the
+    profiles the server reported as not modified.
+    """
+    histogram = fetcher.TimingHistogram()
+    started = time.perf_counter()
+    unchanged = []
+
+    if engine == "http":
+        results, misses, unchanged = fetcher.deep_scrape_http(
+            profiles, workers=workers, histogram=histogram, fingerprints=fingerprints
+        )
+        if misses:
+            logging.info(f"{len(misses)} pages need the browser fallback...")
+            results += deep_scrape_selenium(misses, min(workers, len(misses)), histogram)
+    else:
+        results = deep_scrape_selenium(profiles, workers, histogram)
+
+    logging.info(f"Deep scrape: {len(results)} parsed, {len(unchanged)} not modified, "
+                 f"{len(profiles)} total in {time.perf_counter() - started:.1f}s")
+    logging.info(histogram.report())
+    return results, unchanged
+
+def restrip_stored(boilerplate, skip_urls, fingerprints, live_urls=None):
+    """
+    Re-runs the dedup stage with `boilerplate` over stored profiles outside
+    `skip_urls`. Yields (profile, fingerprint row) for every row it changed;
+    the page validators are kept, only the content hash follows the new text.
+    """
+    live = set(live_urls) if live_urls is not None else None
+    for stored in storage.get_profiles():
+        url = stored["url"]
+        if url in skip_urls or (live is not None and url not in live):
+            continue
+        profile, saved, _, _ = transformation.dedupe_profile(stored, boilerplate)
+        if not saved:
+            continue
+        fp = fingerprints.get(url) or {}
+        yield profile, (url, storage.profile_hash(profile), fp.get("etag"), fp.get("last_modified"), fp.get("listing_hash"))
+
+def apply_changes(results, unchanged, fingerprints, live_urls=None):
+    """
+    Stores only profiles whose cleaned content actually changed.
+    `live_urls` is the full set of URLs seen on the listing pages; stored
+    profiles missing from it are removed (pass None if the listing was incomplete).
+    Returns the changeset {"added", "updated", "removed", "unchanged", "dedup"}.
+    """
+    changeset = {"added": [], "updated": [], "removed": [], "unchanged": len(unchanged)}
+    to_save, seen = [], []
+
+    merged = []
+    for person, fields, validators in results:
+        try:
+            merged.append((merge_profile(person, fields), validators, listing_hash(person)))
+        except Exception as e:
+            logging.warning(f"Error on {person['name']}: {e}")
+
+    cleaned_rows = clean_merged(merged)
+    # Repeated sentences (across fields and across profiles) go before hashing,
+    # so the fingerprints describe what is actually stored
+    storage.prune_boilerplate_keys(transformation.BOILERPLATE_MAX_AGE_DAYS)
+    known = storage.get_boilerplate_keys()
+    cleaned_profiles, dedup, found, used = transformation.dedupe_profiles([c for c, _, _ in cleaned_rows], known)
+    changeset["dedup"] = dedup
+    logging.info(
+        f"Dedup: {dedup['duplicate_sentences']} repeated and {dedup['boilerplate_sentences']} boilerplate "
+        f"sentences dropped, {dedup['bytes_before']} -> {dedup['bytes_after']} bytes "
+        f"(-{dedup['saved_pct']}%, by field: {dedup['saved_by_field']})"
+    )
+
+    for cleaned, (_, validators, card_hash) in zip(cleaned_profiles, cleaned_rows):
+        url = cleaned["url"]
+        new_hash = storage.profile_hash(cleaned)
+        old = fingerprints.get(url)
+
+        if old and old["content_hash"] == new_hash:
+            changeset["unchanged"] += 1
+        else:
+            to_save.append(cleaned)
+            changeset["added" if old is None else "updated"].append(url)
+
+        seen.append((url, new_hash, validators.get("etag"), validators.get("last_modified"), card_hash))
+
+    # New boilerplate also applies to stored rows this run did not re-clean
+    # (304s, unchanged pages), so a sentence is never kept in some and dropped in others
+    if found - known:
+        batch_urls = {c["url"] for c in cleaned_profiles}
+        for profile, row in restrip_stored(known | found, batch_urls, fingerprints, live_urls):
+            to_save.append(profile)
+            seen.append(row)
+            changeset["updated"].append(profile["url"])
+
+    # One transaction for the whole batch, fingerprints included: if the write
+    # fails nothing is recorded, so the next run retries these profiles
+    storage.save_profiles_bulk(to_save, fingerprints=seen)
+    # Saved after the profiles: if this fails, the next full run finds them again
+    storage.save_boilerplate_keys(found | used)
+
+    if unchanged:
+        storage.touch_fingerprints([p["url"] for p in unchanged])
+
+    if live_urls is not None:
+        # Against the profile table too: rows stored before fingerprints existed have none
+        known_urls = storage.get_profile_urls() | set(fingerprints)
+        changeset["removed"] = sorted(known_urls - set(live_urls))
+        if changeset["removed"]:
+            storage.delete_profiles(changeset["removed"])
+
+    return changeset
+
+def run_pipeline(engine="http", workers=4):
     storage.init_db()
     driver = get_driver()
     
@@ -108,6 +361,7 @@ def run_pipeline():
     try:
         # --- PHASE A: HARVEST LINKS & BASIC DATA ---
         profiles_to_visit = []
+        listing_complete = True
         logging.info("PIPELINE STARTED: Harvesting Links...")
         
         for url in base_urls:
@@ -117,6 +371,7 @@ def run_pipeline():
                 WebDriverWait(driver, 8).until(EC.presence_of_element_located((By.CLASS_NAME, "facultyInformation")))
             except:
                 logging.warning(f"Could not load list on {url}")
+                listing_complete = False
                 continue
             
             cards = driver.find_elements(By.CSS_SELECTOR, ".facultyInformation li")
@@ -163,76 +418,37 @@ def run_pipeline():
 
         # --- PHASE B: DEEP SCRAPE ---
         linked_profiles = [p for p in profiles_to_visit if p['url']]
-        logging.info(f"Found {len(linked_profiles)} profiles. Starting Deep Scrape...")
+        logging.info(f"Found {len(linked_profiles)} profiles. Starting Deep Scrape ({engine}, {workers} workers)...")
 
-        for index, person in enumerate(linked_profiles):
-            logging.info(f"   [{index+1}/{len(linked_profiles)}] {person['name']}...")
-            try:
-                driver.get(person['url'])
-                time.sleep(1.2) 
-
-                # 1. BIOGRAPHY
-                bio_els = driver.find_elements(By.CSS_SELECTOR, ".field--name-field-biography, .about")
-                if bio_els: raw_bio = bio_els[0].text
-                else: raw_bio = smart_extract(driver, ["biography", "about"])
-
-                # 2. RESEARCH
-                res_els = driver.find_elements(By.CSS_SELECTOR, ".work-exp1, .field--name-field-research-interests")
-                if res_els: raw_research = res_els[0].text
-                else: raw_research = smart_extract(driver, ["research", "interest"])
-                
-                # Filter bad research grabs (like menu tabs)
-                if "Research Overview" in raw_research and len(raw_research) < 50:
-                    raw_research = ""
-
-                # 3. TEACHING
-                teach_els = driver.find_elements(By.CSS_SELECTOR, ".field--name-field-courses-taught, .field--name-field-teaching")
-                if teach_els: raw_teach = teach_els[0].text
-                else: raw_teach = smart_extract(driver, ["teaching", "courses"])
-
-                # 4. PUBLICATIONS
-                pub_els = driver.find_elements(By.CSS_SELECTOR, ".education.overflowContent ul.bulletText li")
-                if pub_els: raw_pubs = [li.text for li in pub_els]
-                else: 
-                    raw_pubs_text = smart_extract(driver, ["publication"])
-                    raw_pubs = [raw_pubs_text] if raw_pubs_text else []
-
-                # 5. SPECIALIZATION (Merge Strategy)
-                # Start with what we found on the Listing Page
-                final_spec = person.get("specialization", "")
-                
-                # Check Profile Page
-                spec_els = driver.find_elements(By.CSS_SELECTOR, ".field--name-field-area-of-specialization")
-                if spec_els: 
-                    deep_spec = spec_els[0].text
-                    # Only overwrite if deep data is better/longer
-                    if len(deep_spec) > len(final_spec):
-                        final_spec = deep_spec
-                else:
-                    deep_spec = smart_extract(driver, ["specialization"])
-                    if deep_spec and len(deep_spec) > len(final_spec):
-                        final_spec = deep_spec
-
-                person.update({
-                    "bio": raw_bio,
-                    "research": raw_research,
-                    "publications": raw_pubs,
-                    "teaching": raw_teach,
-                    "specialization": final_spec
-                })
-
-                cleaned_data = transformation.clean_profile(person)
-                storage.save_profile(cleaned_data)
+    finally:
+        # The listing browser is not needed for Phase B
+        driver.quit()
 
-            except Exception as e:
-                logging.warning(f"Error on {person['name']}: {e}")
+    # Only pages (and content) that changed since the last run are stored
+    fingerprints = storage.get_fingerprints()
+    results, unchanged = deep_scrape(linked_profiles, engine=engine, workers=workers,
+                                     fingerprints=conditional_fingerprints(linked_profiles, fingerprints))
+    live_urls = [p['url'] for p in linked_profiles] if listing_complete else None
+    changeset = apply_changes(results, unchanged, fingerprints, live_urls)
 
-        logging.info("PIPELINE FINISHED.")
-        storage.export_to_files()
+    logging.info(
+        f"PIPELINE FINISHED. Changeset: +{len(changeset['added'])} added, "
+        f"~{len(changeset['updated'])} updated, -{len(changeset['removed'])} removed, "
+        f"={changeset['unchanged']} unchanged"
+    )
 
-    finally:
-        driver.quit()
+    # Downstream steps only run (and only see the delta) when something changed
+    if changeset["added"] or changeset["updated"] or changeset["removed"]:
+        storage.export_to_files()
+        storage.export_changeset(changeset)
+        storage.export_faculty_payload()
+    else:
+        logging.info("No changes: skipping export.")
 
 if __name__ == "__main__":
-    run_pipeline()
-    
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scrape DA-IICT faculty profiles.")
+    parser.add_argument("--engine", choices=["http", "selenium"], default="http",
+                        help="http: static fetch + parser (browser fallback); selenium: browsers only")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent fetchers / browsers")
+    args = parser.parse_args()
+    run_pipeline(engine=args.engine, workers=args.workers)
@@ -1,5 +1,14 @@
+import asyncio
+import hashlib
+import json
 import os
-from fastapi import FastAPI, HTTPException
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel
 import sys
 from pathlib import Path
 
@@ -12,34 +21,439 @@ sys.path.append(str(ROOT_DIR))
 # --- IMPORTS ---
 # We ONLY import the logic we need. 
 # Make sure faculty_db.py does NOT import torch or chromadb!
+# Heavy dependencies (pandas, the Gemini SDK, the embedding model) are
+# imported on first use inside these modules, not here.
 import faculty_db as storage 
-from Recommender.chat_engine import chat_with_faculty 
+from Recommender.chat_engine import AI_ERROR_PREFIX, LLMStreamError, chat_with_faculty_async, explain_matches_async, get_genai, stream_chat_with_faculty
+from Recommender.inference import CORPUS, get_corpus_stats
+from Recommender.cache import ResponseCache, SemanticCache, SEMANTIC_CACHE_ENABLED, normalize_query
+from Recommender.vector_index import embed_queries, get_embedder
+from Recommender.concurrency import Overloaded, RequestGate
+from Recommender.retrieval import HYBRID_ENABLED, get_hybrid, get_index, rank_batch
+from Recommender.local_ranker import local_recommendations
+from Recommender.metrics import ERRORS, REGISTRY, REQUESTS, MetricsMiddleware, timed
 
-app = FastAPI(title="DA-IICT Faculty AI")
+# PREWARM=1: load the lazy pieces in a background thread right after startup,
+# so the port opens immediately and the first real request is still fast
+PREWARM = os.getenv("PREWARM", "0") == "1"
+
+def prewarm():
+    """Builds the corpus/BM25 index, imports the Gemini SDK and loads the /faculty payload."""
+    started = time.perf_counter()
+    steps = [("retrieval index", get_index), ("Gemini SDK", get_genai), ("faculty payload", lambda: faculty_payload.get())]
+    if HYBRID_ENABLED:
+        # With a dense index this also loads the query embedder
+        steps.append(("hybrid retriever", lambda: get_hybrid().warm()))
+    if semantic_cache is not None:
+        steps.append(("embedding model", get_embedder))
+    for label, step in steps:
+        try:
+            step()
+        except Exception as e:
+            print(f"⚠️ Pre-warm of {label} failed: {e}")
+    print(f"🔥 Pre-warm finished in {time.perf_counter() - started:.2f}s")
+
+@asynccontextmanager
+async def lifespan(app):
+    # Not awaited: startup completes (and "/" answers) while this runs
+    warmup = asyncio.create_task(asyncio.to_thread(prewarm)) if PREWARM else None
+    yield
+    if warmup is not None and not warmup.done():
+        warmup.cancel()
+
+app = FastAPI(title="DA-IICT Faculty AI", lifespan=lifespan)
+# Request latency for every route; "X-Trace: 1" returns a Server-Timing breakdown
+app.add_middleware(MetricsMiddleware)
+
+# Repeated topics ("machine learning", "VLSI") skip the Gemini round trip
+response_cache = ResponseCache()
+# Paraphrases ("who does GNN research" / "graph neural network faculty")
+semantic_cache = SemanticCache(embed_queries) if SEMANTIC_CACHE_ENABLED else None
+# Bounded, coalesced LLM calls; excess load is shed with a 503
+llm_gate = RequestGate()
+
+# mode=llm: Gemini only; mode=local: local index only (no LLM);
+# mode=auto: Gemini, falling back to the local answer on errors or overload
+RECOMMEND_MODES = ("auto", "llm", "local")
+
+# Cohort matching limits
+BATCH_MAX_QUERIES = int(os.getenv("BATCH_MAX_QUERIES", "1000"))
+BATCH_RATIONALE_CONCURRENCY = int(os.getenv("BATCH_RATIONALE_CONCURRENCY", "4"))
 
 @app.get("/")
 def home():
     return {
         "status": "Active", 
         "mode": "Lightweight JSON",
-        "endpoints": ["/faculty", "/recommend?q=..."]
+        "endpoints": ["/faculty?limit=&cursor=&fields=", "/search?q=...", "/recommend?q=...&mode=auto|llm|local", "/recommend/stream?q=...", "POST /recommend/batch", "/stats", "/metrics"]
     }
 
+class FacultyPayload:
+    """
+    The pre-serialized, pre-compressed /faculty body written at ingestion.
+    Reloaded only when a new export lands (its .etag file changes).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._signature = None
+        self._payload = None
+
+    def get(self):
+        try:
+            signature = storage.PAYLOAD_ETAG_PATH.stat().st_mtime_ns
+        except FileNotFoundError:
+            signature = None
+        if self._payload is not None and signature == self._signature:
+            return self._payload
+
+        with self._lock:
+            if self._payload is None or signature != self._signature:
+                payload = storage.load_faculty_payload()
+                if payload is None:
+                    # DB predates payload exports: build it once now
+                    storage.export_faculty_payload()
+                    payload = storage.load_faculty_payload()
+                    signature = storage.PAYLOAD_ETAG_PATH.stat().st_mtime_ns
+                self._payload, self._signature = payload, signature
+            return self._payload
+
+faculty_payload = FacultyPayload()
+
+FACULTY_PAGE_MAX = 500
+
+def etag_matches(if_none_match, etag):
+    """True if an If-None-Match header names `etag` (any encoding variant of it)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip().removeprefix("W/").strip('"')
+        if tag.split("-")[0] == etag:
+            return True
+    return False
+
+def pick_encoding(accept_encoding, payload):
+    """Best precompressed variant the client accepts (brotli > gzip > none)."""
+    accepted = {part.split(";")[0].strip() for part in (accept_encoding or "").lower().split(",")}
+    for encoding in ("br", "gzip"):
+        if encoding in accepted and encoding in payload:
+            return encoding
+    return "identity"
+
 @app.get("/faculty")
-def get_all():
-    """Return the entire dataset."""
-    return storage.get_all_faculty()
+def get_all(request: Request, limit: Optional[int] = Query(None, ge=1, le=FACULTY_PAGE_MAX),
+            cursor: int = 0, fields: Optional[str] = None):
+    """
+    Without parameters: the entire dataset, served from the precomputed
+    payload. With `limit`/`cursor`/`fields`: one keyset page, projected onto
+    the requested columns. Either way If-None-Match is answered without the DB.
+    """
+    payload = faculty_payload.get()
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    if field_list and set(field_list) - set(storage.FACULTY_COLUMNS):
+        raise HTTPException(status_code=400, detail=f"fields must be among: {', '.join(storage.FACULTY_COLUMNS)}")
+
+    full = limit is None and cursor == 0 and not field_list
+    if full:
+        etag = payload["etag"]
+    else:
+        limit = FACULTY_PAGE_MAX if limit is None else limit
+        # Pages change exactly when the dataset does, so derive their tag from it
+        view = f"{payload['etag']}|{limit}|{cursor}|{','.join(field_list or [])}"
+        etag = hashlib.sha256(view.encode("utf-8")).hexdigest()[:32]
+
+    headers = {"Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=dict(headers, ETag=f'"{etag}"'))
+
+    if full:
+        encoding = pick_encoding(request.headers.get("accept-encoding"), payload)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+            etag = f"{etag}-{encoding}"
+        return Response(content=payload[encoding], media_type="application/json",
+                        headers=dict(headers, ETag=f'"{etag}"'))
+
+    items = storage.get_faculty_page(limit, cursor, field_list)
+    next_cursor = items[-1]["id"] if len(items) == limit else None
+    return JSONResponse({"items": items, "next_cursor": next_cursor},
+                        headers=dict(headers, ETag=f'"{etag}"'))
+
+@app.get("/search")
+def search(q: str, limit: int = 20):
+    """Keyword search over the faculty DB (FTS5, bm25-ranked, with snippets)."""
+    return storage.search_faculty(q, limit=max(1, min(limit, 100)))
+
+class CacheLookup:
+    """
+    Result of checking both caches for a query; reused to store the answer.
+    Construct it with `await CacheLookup.create(q)`: reading the corpus version
+    may stat, hash or reload faculty_data.json, which must not block the loop.
+    """
+
+    @classmethod
+    async def create(cls, q):
+        return await asyncio.to_thread(cls, q)
+
+    def __init__(self, q):
+        # Keyed on the corpus version too, so re-ingesting invalidates old answers
+        self.version = CORPUS.version()
+        self.key = (normalize_query(q), self.version)
+        self.vector = None
+        self.answer = response_cache.get(self.key)
+
+    async def check_semantic(self, q):
+        if self.answer is not None or semantic_cache is None:
+            return
+        # Embedding is CPU-bound: keep it off the event loop
+        self.vector = await asyncio.to_thread(semantic_cache.embed, q)
+        self.answer = semantic_cache.get(self.vector, self.version)
+        if self.answer is not None:
+            response_cache.put(self.key, self.answer)
+
+    def store(self, response_text):
+        if not response_text or response_text.startswith(AI_ERROR_PREFIX):
+            return
+        response_cache.put(self.key, response_text)
+        if self.vector is not None:
+            semantic_cache.put(self.vector, self.version, response_text)
+
+def shed_response(e):
+    print(f"🛑 Shedding load: {e}")
+    ERRORS.inc(kind="shed")
+    return HTTPException(status_code=503, detail="Server is busy. Please retry shortly.",
+                         headers={"Retry-After": "2"})
+
+def check_mode(mode):
+    if mode not in RECOMMEND_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of: {', '.join(RECOMMEND_MODES)}")
+
+def local_response(q, fallback=False):
+    if fallback:
+        print(f"↪️ Falling back to local ranking for: {q}")
+        ERRORS.inc(kind="fallback")
+    with timed("local_rank"):
+        text = local_recommendations(q)
+    return {"ai_response": text, "mode": "local", "fallback": fallback}
+
+def respond(payload, source, endpoint="recommend"):
+    """Counts the answer by source and serializes it (timed as its own stage)."""
+    REQUESTS.inc(endpoint=endpoint, source=source)
+    with timed("serialize"):
+        return JSONResponse(payload)
 
 @app.get("/recommend")
-def recommend(q: str):
-    print(f"--- 🚀 Query Received: {q} ---")
+async def recommend(q: str, mode: str = "auto"):
+    print(f"--- 🚀 Query Received: {q} (mode={mode}) ---")
+    check_mode(mode)
+    if mode == "local":
+        return respond(local_response(q), "local")
+
     try:
-        # This now uses the JSON + Gemini logic (Low RAM)
-        response_text = chat_with_faculty(q)
-        return {"ai_response": response_text}
+        lookup = await CacheLookup.create(q)
+        await lookup.check_semantic(q)
+        if lookup.answer is not None:
+            return respond({"ai_response": lookup.answer, "mode": "llm"}, "cache")
+
+        async def ask_llm():
+            # This now uses the JSON + Gemini logic (Low RAM)
+            response_text = await chat_with_faculty_async(q)
+            lookup.store(response_text)
+            return response_text
+
+        # Identical in-flight queries share one upstream call
+        response_text = await llm_gate.run(lookup.key, ask_llm)
+        if mode == "auto" and response_text.startswith(AI_ERROR_PREFIX):
+            return respond(local_response(q, fallback=True), "fallback")
+        return respond({"ai_response": response_text, "mode": "llm"}, "llm")
+    except Overloaded as e:
+        if mode == "auto":
+            return respond(local_response(q, fallback=True), "fallback")
+        raise shed_response(e)
     except Exception as e:
         print(f"🛑 Error: {str(e)}")
-        return {"error": "System is warming up or busy. Please try again."}
+        ERRORS.inc(kind="recommend")
+        if mode == "auto":
+            return respond(local_response(q, fallback=True), "fallback")
+        return respond({"error": "System is warming up or busy. Please try again."}, "error")
+
+class BatchRequest(BaseModel):
+    queries: List[str]
+    k: int = 5
+    rationale: bool = False
+
+@app.post("/recommend/batch")
+async def recommend_batch(body: BatchRequest):
+    """
+    Matches a whole cohort at once: every research-interest statement is
+    ranked in a single vectorized pass, no LLM involved. With rationale=true,
+    an LLM explanation is added per statement, a few calls at a time.
+    """
+    if not body.queries:
+        raise HTTPException(status_code=400, detail="queries must not be empty")
+    if len(body.queries) > BATCH_MAX_QUERIES:
+        raise HTTPException(status_code=413, detail=f"at most {BATCH_MAX_QUERIES} queries per batch")
+    k = max(1, min(body.k, 50))
+
+    start = time.perf_counter()
+    # CPU-bound (one matrix multiply): keep it off the event loop
+    ranked = await asyncio.to_thread(rank_batch, body.queries, k)
+    rank_seconds = time.perf_counter() - start
+    REQUESTS.inc(len(body.queries), endpoint="batch", source="local")
+
+    # Row positions in faculty_data.json shift on every re-ingest, so clients
+    # get the profile URL as the faculty id; positions stay internal
+    results = [
+        {
+            "query": query,
+            "matches": [
+                {"id": record["profile_url"], "name": record["name"], "profile_url": record["profile_url"],
+                 "score": round(score, 4)}
+                for _, record, score in hits
+            ],
+        }
+        for query, hits in zip(body.queries, ranked)
+    ]
+
+    rationale_seconds = None
+    if body.rationale:
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(BATCH_RATIONALE_CONCURRENCY)
+        version = await asyncio.to_thread(CORPUS.version)
+
+        async def explain(result, hits):
+            if not hits:
+                result["rationale"] = None
+                return
+            records = [record for _, record, _ in hits]
+            key = ("rationale", normalize_query(result["query"]), version, tuple(d for d, _, _ in hits))
+            async with semaphore:
+                try:
+                    result["rationale"] = await llm_gate.run(
+                        key, lambda: explain_matches_async(result["query"], records)
+                    )
+                except Overloaded:
+                    result["rationale"] = None
+
+        await asyncio.gather(*(explain(result, hits) for result, hits in zip(results, ranked)))
+        rationale_seconds = time.perf_counter() - start
+
+    return {
+        "results": results,
+        "stats": {
+            "queries": len(body.queries),
+            "rank_ms": round(rank_seconds * 1000, 2),
+            "queries_per_sec": round(len(body.queries) / max(rank_seconds, 1e-9), 1),
+            "rationale_ms": round(rationale_seconds * 1000, 2) if rationale_seconds is not None else None,
+        },
+    }
+
+def sse(event, data):
+    """Formats one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.get("/recommend/stream")
+async def recommend_stream(q: str, mode: str = "auto"):
+    """
+    Server-Sent Events version of /recommend: "chunk" events carry the answer
+    text as the LLM produces it, followed by a single "done" (or "error").
+    """
+    print(f"--- 🚀 Stream Query Received: {q} (mode={mode}) ---")
+    check_mode(mode)
+    lookup = await CacheLookup.create(q)
+    overloaded = lookup.answer is None and llm_gate.waiting >= llm_gate.max_queue
+    if overloaded and mode == "llm":
+        raise shed_response(Overloaded(f"{llm_gate.waiting} requests already queued"))
+
+    def local_events(fallback):
+        REQUESTS.inc(endpoint="stream", source="fallback" if fallback else "local")
+        yield sse("chunk", {"text": local_response(q, fallback)["ai_response"]})
+        yield sse("done", {"cached": False, "mode": "local", "fallback": fallback})
+
+    async def events():
+        if mode == "local" or overloaded:
+            for event in local_events(fallback=mode != "local"):
+                yield event
+            return
+        sent = False
+        try:
+            await lookup.check_semantic(q)
+            if lookup.answer is not None:
+                REQUESTS.inc(endpoint="stream", source="cache")
+                yield sse("chunk", {"text": lookup.answer})
+                yield sse("done", {"cached": True, "mode": "llm"})
+                return
+
+            chunks = []
+            try:
+                async with llm_gate.slot():
+                    async for chunk in stream_chat_with_faculty(q):
+                        chunks.append(chunk)
+                        sent = True
+                        yield sse("chunk", {"text": chunk})
+            except LLMStreamError as e:
+                # Nothing shown yet: swap a failed LLM call for the local answer
+                if not sent and mode == "auto":
+                    for event in local_events(fallback=True):
+                        yield event
+                    return
+                # A truncated answer is reported as an error and never cached
+                yield sse("error", {"detail": str(e)})
+                return
+            lookup.store("".join(chunks))
+            REQUESTS.inc(endpoint="stream", source="llm")
+            yield sse("done", {"cached": False, "mode": "llm"})
+        except Overloaded:
+            ERRORS.inc(kind="shed")
+            if mode == "auto" and not sent:
+                for event in local_events(fallback=True):
+                    yield event
+                return
+            yield sse("error", {"detail": "Server is busy. Please retry shortly."})
+        except Exception as e:
+            print(f"🛑 Stream Error: {str(e)}")
+            ERRORS.inc(kind="stream")
+            yield sse("error", {"detail": "System is warming up or busy. Please try again."})
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/stats")
+def stats():
+    """Cache counters, to confirm the in-memory layers are being hit."""
+    return {
+        "corpus": get_corpus_stats(),
+        "response_cache": response_cache.stats(),
+        "semantic_cache": semantic_cache.stats() if semantic_cache else None,
+        "llm_gate": llm_gate.stats(),
+    }
+
+def cache_counters():
+    """Hit/miss/eviction counters of both cache layers, read at scrape time."""
+    values = {}
+    layers = {"response": response_cache, "semantic": semantic_cache}
+    for layer, cache in layers.items():
+        if cache is None:
+            continue
+        layer_stats = cache.stats()
+        for result in ("hits", "misses", "evictions", "expirations"):
+            if result in layer_stats:
+                values[(("layer", layer), ("result", result))] = layer_stats[result]
+    return values
+
+REGISTRY.add_collector("faculty_cache_events_total", "Cache lookups and evictions by layer.",
+                       "counter", cache_counters)
+REGISTRY.add_collector("faculty_llm_gate", "LLM concurrency gate: active, waiting, coalesced, shed.",
+                       "gauge", lambda: {(("state", k),): v for k, v in llm_gate.stats().items()})
+REGISTRY.add_collector("faculty_corpus_records", "Profiles in the loaded corpus.",
+                       "gauge", lambda: {(): get_corpus_stats()["records"]})
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus text exposition of stage timers, sizes, tokens, caches and errors."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
 
 if __name__ == "__main__":
     import uvicorn
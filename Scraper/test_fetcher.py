@@ -0,0 +1,53 @@
+import sys
+import tempfile
+from pathlib import Path
+
+# --- ROBUST IMPORT SETUP ---
+BASE_DIR = Path(__file__).resolve().parent
+sys.path.append(str(BASE_DIR))
+
+import fetcher
+import fixture_server
+
+
+def scrape_directory(directory):
+    """Serves `directory` locally and deep-scrapes every page in it over HTTP."""
+    server, base_url = fixture_server.serve(directory)
+    try:
+        profiles = [{"name": p.stem, "url": f"{base_url}/{p.name}"} for p in sorted(directory.glob("*.html"))]
+        return fetcher.deep_scrape_http(profiles, workers=2, limiter=fetcher.HostRateLimiter(0))
+    finally:
+        server.shutdown()
+
+
+def test_partial_match_falls_back_to_keywords():
+    results, misses, unchanged = scrape_directory(fixture_server.FIXTURE_DIR)
+    fields = {person["name"]: f for person, f, _ in results}
+    # Nothing matched: still the browser's job
+    assert [person["name"] for person in misses] == ["no-match"]
+    assert unchanged == []
+    assert fields["partial-match"] == {
+        "specialization": "Computer Vision, Medical Imaging",
+        "bio": "Dr. Partial Match received the Ph.D. degree from IIT Bombay in 2015.",
+        "research": "Deep learning for medical image segmentation and low-dose CT reconstruction.",
+        "teaching": "IT 314 Software Engineering IT 403 Image Processing",
+        "publications": ['P. Match, "Sparse CT," IEEE TMI, 2021. P. Match, "U-Nets revisited," MICCAI, 2022.'],
+    }
+
+
+def test_selector_matches_are_kept():
+    directory = Path(tempfile.mkdtemp(prefix="faculty_fixtures_"))
+    fixture_server.write_synthetic_pages(directory, 3)
+    results, misses, _ = scrape_directory(directory)
+    assert len(results) == 3 and misses == []
+    for _, fields, _ in results:
+        assert fields["teaching"] == "Course A Course B"
+        assert len(fields["publications"]) == 3
+        assert all(fields[field] for field in fetcher.FIELD_SELECTORS)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
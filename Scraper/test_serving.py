@@ -0,0 +1,54 @@
+import importlib
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# --- ROBUST IMPORT SETUP ---
+BASE_DIR = Path(__file__).resolve().parent
+sys.path.append(str(BASE_DIR))
+sys.path.append(str(BASE_DIR.parent))
+
+from fastapi.testclient import TestClient
+
+import faculty_db as storage
+import transformation
+
+# A throwaway data dir; reloading re-reads it even if another test imported faculty_db first
+os.environ["SCRAPED_DATA_DIR"] = tempfile.mkdtemp(prefix="faculty_serving_")
+importlib.reload(storage)
+from serving import FACULTY_PAGE_MAX, app
+
+client = TestClient(app)
+
+
+def setup_module():
+    storage.init_db()
+    storage.save_profiles_bulk([
+        transformation.clean_profile({"name": f"Faculty {i}", "url": f"https://example.org/faculty/{i}"})
+        for i in range(3)
+    ])
+
+
+def test_faculty_page_limit_is_validated():
+    for limit in (0, -1, FACULTY_PAGE_MAX + 1):
+        assert client.get("/faculty", params={"limit": limit}).status_code == 422
+    page = client.get("/faculty", params={"limit": 2}).json()
+    assert [item["name"] for item in page["items"]] == ["Faculty 0", "Faculty 1"]
+    rest = client.get("/faculty", params={"limit": 2, "cursor": page["next_cursor"]}).json()
+    assert [item["name"] for item in rest["items"]] == ["Faculty 2"] and rest["next_cursor"] is None
+
+
+
+def test_batch_matches_use_stable_ids():
+    body = client.post("/recommend/batch", json={"queries": ["graph algorithms", "machine learning"], "k": 3}).json()
+    matches = [m for result in body["results"] for m in result["matches"]]
+    assert matches and all(m["id"] == m["profile_url"] and m["id"].startswith("http") for m in matches)
+
+
+if __name__ == "__main__":
+    setup_module()
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
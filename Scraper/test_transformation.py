@@ -0,0 +1,115 @@
+import ast
+import random
+import re
+import sys
+from pathlib import Path
+
+# --- ROBUST IMPORT SETUP ---
+BASE_DIR = Path(__file__).resolve().parent
+ROOT_DIR = BASE_DIR.parent
+sys.path.append(str(BASE_DIR))
+
+import transformation
+
+FUZZ_PROFILES = 50_000
+FUZZ_RESPONSES = 100_000
+
+# Every whitespace str.split() knows, plus the characters the fast paths look at
+WHITESPACE = [c for c in map(chr, range(0x3001)) if c.isspace()]
+PIECES = WHITESPACE + ["​", "\xad", "[at]", "(at)", "[dot]", "(dot)", "[", "(", " ", " ", "x", "yz", "."]
+
+
+def random_text(rng):
+    return "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 12)))
+
+
+def random_profile(rng):
+    profile = {field: rng.choice([None, "", random_text(rng), random_text(rng)])
+               for field in transformation.TEXT_FIELDS + ["email", "url"]}
+    profile["publications"] = rng.choice([None, "", [], random_text(rng),
+                                          [random_text(rng), None, "", random_text(rng)]])
+    if rng.random() < 0.1:
+        del profile["bio"]
+    return profile
+
+
+def test_clean_profiles_matches_clean_profile():
+    rng = random.Random(0)
+    profiles = [random_profile(rng) for _ in range(FUZZ_PROFILES)]
+    expected = [transformation.clean_profile(p) for p in profiles]
+    batch = transformation.clean_profiles(profiles)
+    assert batch == expected
+    # Key order feeds the content hash, so it has to match too
+    assert all(list(a) == list(b) for a, b in zip(batch, expected))
+    assert transformation.clean_profiles([]) == []
+
+
+def test_split_sentences_keeps_abbreviations():
+    text = "He got his Ph.D. from IIT Bombay. Dr. A. Kumar leads the lab. B.Tech. students join. see also x."
+    assert transformation.split_sentences(text) == [
+        "He got his Ph.D. from IIT Bombay.", "Dr. A. Kumar leads the lab.", "B.Tech. students join. see also x.",
+    ]
+    assert " ".join(transformation.split_sentences(text)) == text
+    assert transformation.sentence_key("B.Tech.  Students, join!") == "b tech students join"
+
+
+def load_response_parser():
+    """parse_and_clean_response and its constants from app.py, without running the Streamlit page."""
+    tree = ast.parse((ROOT_DIR / "app.py").read_text(encoding="utf-8"))
+    wanted = {"ITEM_SPLIT_RE", "ITEM_NUMBER_RE", "STRIP_ASTERISKS", "parse_and_clean_response"}
+    nodes = [
+        node for node in tree.body
+        if (isinstance(node, ast.FunctionDef) and node.name in wanted)
+        or (isinstance(node, ast.Assign) and {t.id for t in node.targets if isinstance(t, ast.Name)} & wanted)
+    ]
+    namespace = {"re": re}
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), "app.py", "exec"), namespace)
+    return namespace["parse_and_clean_response"]
+
+
+def reference_parse(text):
+    """The parser before its regexes were precompiled (per-call re.split/re.sub)."""
+    if not text: return "", []
+    parts = re.split(r'(?=\n\d+\.)', text)
+    intro_text = parts[0].strip().replace('**', '').replace('__', '')
+    faculty_list = []
+    for part in parts[1:]:
+        clean_part = re.sub(r'^\n\d+\.\s*', '', part).strip()
+        if clean_part:
+            lines = clean_part.split('\n', 1)
+            name = lines[0].strip().replace('**', '')
+            desc = lines[1].strip() if len(lines) > 1 else ""
+            desc = desc.replace('**', '').replace('*', '')
+            faculty_list.append({"name": name, "desc": desc})
+    return intro_text, faculty_list
+
+
+def test_response_parser_matches_reference():
+    parse = load_response_parser()
+    rng = random.Random(0)
+    pieces = ["\n", "1.", "2. ", "10.", "**", "*", "_", "__", " ", "Dr. X", "abc", "\n3.", "\t"]
+    for _ in range(FUZZ_RESPONSES):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 15)))
+        assert parse(text) == reference_parse(text), repr(text)
+
+
+def test_ingestion_skips_only_the_malformed_record():
+    import ingestion
+
+    good = {"name": "A", "url": "u1", "email": "a[at]x", "bio": "b  c", "research": "r",
+            "teaching": "", "publications": ["p"], "specialization": "s"}
+    bad = dict(good, name="B", url="u2", bio=42)  # not a string
+    browser = dict(good, name="C", url="u3", research="raw\n  text")
+    merged = [(good, {"etag": None}, "h1"), (bad, {"etag": None}, "h2"),
+              (browser, {"source": ingestion.BROWSER_SOURCE}, "h3")]
+    rows = ingestion.clean_merged(merged)
+    assert [profile["url"] for profile, _, _ in rows] == ["u1", "u3"]
+    assert [profile for profile, _, _ in rows] == [transformation.clean_profile(good),
+                                                   transformation.clean_profile(browser)]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
